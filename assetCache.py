@@ -0,0 +1,102 @@
+import json
+import sqlite3
+import threading
+import time
+
+# Lokasi default cache hash aset (di direktori kerja, sama seperti file output ipFinder.py)
+DEFAULT_CACHE_PATH = ".hashlookup_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 50000
+
+
+class AssetHashCache:
+    """
+    Cache hash aset persisten berbasis SQLite, dengan kunci URL aset.
+
+    Setiap entri menyimpan ETag/Last-Modified dan hash yang sudah dihitung sehingga
+    pengambilan berikutnya dapat memakai permintaan kondisional (If-None-Match /
+    If-Modified-Since). Jumlah entri dibatasi `max_entries`; entri yang paling lama
+    tidak dipakai dihapus lebih dulu (LRU). Aman dipakai dari beberapa thread.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS asset_hashes ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " hashes TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_asset_hashes_last_used ON asset_hashes (last_used)")
+        self._conn.commit()
+
+    def get(self, url: str) -> dict | None:
+        """Mengembalikan entri cache (etag, last_modified, hashes) untuk URL, atau None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, hashes FROM asset_hashes WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE asset_hashes SET last_used = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return {"etag": row[0], "last_modified": row[1], "hashes": json.loads(row[2])}
+
+    def conditional_headers(self, entry: dict | None) -> dict:
+        """Membangun header permintaan kondisional dari entri cache."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, etag: str | None, last_modified: str | None, hashes: dict):
+        """Menyimpan hash aset beserta validatornya, lalu menegakkan batas LRU."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO asset_hashes (url, etag, last_modified, hashes, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(hashes), time.time()),
+            )
+            self.stats["stores"] += 1
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM asset_hashes").fetchone()
+            if count > self.max_entries:
+                excess = count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM asset_hashes WHERE url IN"
+                    " (SELECT url FROM asset_hashes ORDER BY last_used ASC LIMIT ?)",
+                    (excess,),
+                )
+                self.stats["evictions"] += excess
+            self._conn.commit()
+
+    def record_hit(self):
+        with self._lock:
+            self.stats["hits"] += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def summary(self) -> str:
+        total = self.stats["hits"] + self.stats["misses"]
+        hit_rate = (self.stats["hits"] / total * 100) if total else 0.0
+        return (f"hit={self.stats['hits']}, miss={self.stats['misses']} ({hit_rate:.1f}% hit), "
+                f"disimpan={self.stats['stores']}, dikeluarkan={self.stats['evictions']}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,127 @@
+"""
+Benchmark: mesin ekstraksi htmlExtract (satu lintasan, tanpa pohon DOM) dibandingkan
+dengan jalur BeautifulSoup lama (pohon html.parser + find_all per jenis tag).
+
+Penggunaan:
+    python3 benchmarks/bench_html_extract.py --size-mb 4 --repeat 3
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urljoin
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from htmlExtract import ASSET_TAG_ATTRS, etree, extract_links
+
+BASE_URL = "https://bench.example.com/index.html"
+
+
+def generate_page(size_mb: float, seed: int = 1) -> str:
+    """Membuat halaman HTML sintetis berukuran kira-kira `size_mb` MB."""
+    rng = random.Random(seed)
+    target_size = int(size_mb * 1024 * 1024)
+    parts = ["<!DOCTYPE html><html><head><title>Bench</title>",
+             '<meta http-equiv="refresh" content="30; url=https://redirect.example.net/">',
+             "<style>body { background: url('/img/bg.png'); }</style></head><body>"]
+    size = sum(len(p) for p in parts)
+    i = 0
+    while size < target_size:
+        host = f"cdn{rng.randint(0, 50)}.example{rng.randint(0, 20)}.org"
+        block = (
+            f'<div class="item" id="item{i}" style="background-image: url(/thumb/{i}.jpg)">'
+            f'<p>{"Lorem ipsum dolor sit amet " * rng.randint(1, 6)}</p>'
+            f'<img src="https://{host}/img/{i}.png" srcset="/img/{i}@2x.png 2x, /img/{i}@3x.png 3x" alt="x">'
+            f'<script src="//{host}/js/{i}.js"></script>'
+            f'<a href="/page/{i}">link {i}</a>'
+            f'<link rel="stylesheet" href="/css/{i}.css">'
+            f"</div>\n"
+        )
+        parts.append(block)
+        size += len(block)
+        i += 1
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def legacy_extract(html: str, base_url: str):
+    """Jalur lama: dua pohon BeautifulSoup (hashLookup.py dan parsing.py) + find_all per tag."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    asset_urls = set()
+    for tag_name, attr_name in ASSET_TAG_ATTRS.items():
+        for tag in soup.find_all(tag_name):
+            asset_src = tag.get(attr_name)
+            if asset_src:
+                absolute_asset_url = urljoin(base_url, asset_src.strip())
+                if absolute_asset_url.startswith(("http://", "https://")):
+                    asset_urls.add(absolute_asset_url)
+
+    soup = BeautifulSoup(html, "html.parser")
+    external_urls = set()
+    for tag in soup.find_all(["iframe", "script", "img", "link"]):
+        src = tag.get("src") or tag.get("href")
+        if src and (src.startswith("http") or src.startswith("//")):
+            external_urls.add(src)
+    for meta in soup.find_all("meta", attrs={"http-equiv": re.compile("^refresh$", re.I)}):
+        match = re.search(r'url=(.+)', meta.get("content", ""), re.IGNORECASE)
+        if match:
+            external_urls.add(match.group(1).strip())
+    return asset_urls, external_urls
+
+
+def engine_extract(html: str, base_url: str, backend: str):
+    links = extract_links(html, backend=backend)
+    return links.asset_urls(base_url), links.external_urls()
+
+
+def best_time(func, repeat: int) -> tuple[float, object]:
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=4.0, help="Ukuran halaman sintetis (MB).")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan; waktu terbaik dilaporkan.")
+    args = parser.parse_args()
+
+    html = generate_page(args.size_mb)
+    size_mb = len(html) / (1024 * 1024)
+    print(f"[*] Halaman sintetis: {size_mb:.2f} MB")
+
+    runs = [("BeautifulSoup (lama)", lambda: legacy_extract(html, BASE_URL))]
+    runs.append(("htmlExtract stdlib", lambda: engine_extract(html, BASE_URL, "stdlib")))
+    if etree is not None:
+        runs.append(("htmlExtract lxml", lambda: engine_extract(html, BASE_URL, "lxml")))
+    else:
+        print("[-] lxml tidak terpasang, backend lxml dilewati.")
+
+    baseline = None
+    legacy_assets = legacy_external = None
+    print(f"\n{'Jalur':<24}{'Waktu (s)':>12}{'MB/detik':>12}{'Speedup':>10}{'Aset':>10}{'URL eksternal':>16}")
+    for name, func in runs:
+        elapsed, (assets, external) = best_time(func, args.repeat)
+        if baseline is None:
+            baseline = elapsed
+            legacy_assets, legacy_external = assets, external
+        print(f"{name:<24}{elapsed:>12.3f}{size_mb / elapsed:>12.2f}{baseline / elapsed:>9.1f}x"
+              f"{len(assets):>10}{len(external):>16}")
+        if legacy_assets is not None and not (legacy_assets <= assets and legacy_external <= external):
+            print(f"[!] {name}: hasil tidak mencakup semua URL dari jalur lama!")
+
+    print("\n[*] Catatan: mesin baru juga mengumpulkan srcset dan url() CSS, sehingga jumlah URL-nya lebih besar.")
+
+
+if __name__ == "__main__":
+    main()
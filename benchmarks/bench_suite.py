@@ -0,0 +1,256 @@
+"""
+Benchmark lokal untuk hashLookup, parsing, dan pipeline ipFinder.
+
+Server pengganti (situs HTML sintetis, CDX Wayback, DNS) dan `subfinder`/`httpx`
+palsu dijalankan di mesin lokal (lihat benchmarks/standins.py), lalu setiap
+skenario melaporkan throughput, latensi p50/p99, dan puncak memori (tracemalloc).
+Hasil disimpan sebagai JSON di benchmarks/results/ dan dibandingkan dengan hasil
+sebelumnya untuk mendeteksi regresi.
+
+Penggunaan:
+    python3 benchmarks/bench_suite.py --assets 200 --asset-size 65536 --latency-ms 5
+    python3 benchmarks/bench_suite.py --only hashlookup --compare benchmarks/results/bench-20250101-120000.json
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from standins import StubCDX, StubDNS, SyntheticSite, install_fake_tools
+
+from cdnIndex import load_cdn_index
+from dnsResolver import DNSResolver
+from hashLookup import DEFAULT_PER_HOST_LIMIT, extract_assets_from_url
+from httpClient import PooledSession
+from ipFinder import run_domains
+from parsing import extract_external_domains
+from waybackScanner import WaybackScanner
+
+DEFAULT_RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+SCENARIOS = ("hashlookup", "parsing", "ipfinder")
+# Selisih (persen) yang dianggap regresi: throughput turun atau p99/memori naik
+DEFAULT_REGRESSION_THRESHOLD = 15.0
+
+
+class TimingSession(PooledSession):
+    """PooledSession yang mencatat latensi setiap permintaan (termasuk percobaan ulang)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    def request(self, method, url, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(func, track_memory: bool):
+    """Menjalankan `func` dengan stdout dibungkam; mengembalikan (hasil, detik, puncak memori MB)."""
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if track_memory else None
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def summarize(items: int, unit: str, elapsed: float, latencies: list[float], peak_mb, **extra) -> dict:
+    return {
+        "items": items,
+        "unit": unit,
+        "elapsed_s": round(elapsed, 4),
+        "throughput": round(items / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "peak_mem_mb": round(peak_mb, 2) if peak_mb is not None else None,
+        **extra,
+    }
+
+
+def bench_hashlookup(args) -> dict:
+    # Tanpa referensi eksternal: domain .example tidak bisa di-resolve dan hanya akan mengukur percobaan ulang
+    # Aset tersebar di beberapa host dengan batas per host di bawah jumlah worker, seperti situs
+    # nyata (CDN + origin), sehingga penjadwalan per host ikut terukur
+    with SyntheticSite(args.assets, args.asset_size, 0, args.latency_ms / 1000, args.asset_hosts) as site:
+        with TimingSession(pool_maxsize=args.workers) as session:
+            assets, elapsed, peak = measure(
+                lambda: extract_assets_from_url(site.base_url + "/", session, max_workers=args.workers,
+                                                per_host_limit=args.per_host),
+                not args.no_memory)
+    megabytes = sum(asset.get("bytes_read", 0) for asset in assets) / (1024 * 1024)
+    return summarize(len(assets), "aset", elapsed, session.latencies, peak,
+                     mb_per_s=round(megabytes / elapsed, 2) if elapsed else 0.0)
+
+
+def bench_parsing(args) -> dict:
+    with SyntheticSite(args.assets, args.asset_size, args.external, args.latency_ms / 1000) as site:
+        with TimingSession() as session:
+            def run():
+                return [extract_external_domains(site.base_url + "/", session)
+                        for _ in range(args.parse_repeat)]
+
+            results, elapsed, peak = measure(run, not args.no_memory)
+    failures = sum(1 for result in results if "error" in result)
+    return summarize(len(results), "halaman", elapsed, session.latencies, peak, failures=failures)
+
+
+def bench_ipfinder(args) -> dict:
+    domains = [f"bench{i}.test" for i in range(args.domains)]
+    domain_latencies = []
+    old_cwd, old_path = os.getcwd(), os.environ.get("PATH", "")
+    with StubCDX(args.cdx_rows, latency=args.latency_ms / 1000) as cdx, StubDNS() as dns, \
+            tempfile.TemporaryDirectory() as work_dir:
+        os.environ["PATH"] = install_fake_tools(os.path.join(work_dir, "bin"), args.subdomains)
+        os.chdir(work_dir)
+        try:
+            resolver = DNSResolver([dns.address])
+            wayback = WaybackScanner(cdx.base_url + "/cdx", cache_dir=None)
+            cdn_index = load_cdn_index()
+            start = time.perf_counter()
+
+            def record(line):
+                # Blok output satu domain dicetak saat semua tahapnya selesai
+                if line.startswith("\n========== "):
+                    domain_latencies.append(time.perf_counter() - start)
+
+            stats, elapsed, peak = measure(
+                lambda: run_domains(domains, resolver=resolver, wayback=wayback, cdn_index=cdn_index, log=record),
+                not args.no_memory)
+        finally:
+            os.chdir(old_cwd)
+            os.environ["PATH"] = old_path
+    return summarize(len(domains), "domain", elapsed, domain_latencies, peak,
+                     stage_failures=stats["stage_failures"], dns_queries=stats["dns"]["queries"],
+                     cdx_requests=stats["wayback"]["requests"])
+
+
+BENCHMARKS = {"hashlookup": bench_hashlookup, "parsing": bench_parsing, "ipfinder": bench_ipfinder}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def latest_result(results_dir: str) -> str | None:
+    paths = sorted(glob.glob(os.path.join(results_dir, "bench-*.json")))
+    return paths[-1] if paths else None
+
+
+def compare_results(current: dict, previous: dict, threshold: float) -> list[str]:
+    """Mencetak perubahan setiap metrik dan mengembalikan daftar pesan regresi."""
+    regressions = []
+    if current["params"] != previous.get("params"):
+        print("[-] Parameter berbeda dari hasil pembanding; perbandingan mungkin tidak adil.")
+    for name, result in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        checks = [("throughput", -1), ("p99_ms", 1), ("peak_mem_mb", 1)]
+        for metric, direction in checks:
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            print(f"  {name:<12}{metric:<14}{old:>12}{new:>12}{change:>+9.1f}%")
+            if change * direction > threshold:
+                regressions.append(f"{name}: {metric} {old} -> {new} ({change:+.1f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", choices=SCENARIOS, help="Jalankan skenario tertentu saja (bisa diulang).")
+    parser.add_argument("--assets", type=int, default=200, help="Jumlah aset di halaman sintetis.")
+    parser.add_argument("--asset-size", type=int, default=32 * 1024, help="Ukuran setiap aset (byte).")
+    parser.add_argument("--external", type=int, default=50, help="Jumlah referensi domain eksternal di halaman.")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Latensi buatan per respons server (ms).")
+    parser.add_argument("--workers", type=int, default=16, help="Worker hashLookup.")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT,
+                        help=f"Batas koneksi per host hashLookup (default: {DEFAULT_PER_HOST_LIMIT}).")
+    parser.add_argument("--asset-hosts", type=int, default=4, help="Jumlah host yang melayani aset halaman sintetis.")
+    parser.add_argument("--parse-repeat", type=int, default=100, help="Jumlah panggilan extract_external_domains.")
+    parser.add_argument("--domains", type=int, default=20, help="Jumlah domain untuk pipeline ipFinder.")
+    parser.add_argument("--subdomains", type=int, default=20, help="Subdomain per domain dari subfinder palsu.")
+    parser.add_argument("--cdx-rows", type=int, default=200, help="Baris CDX untuk setiap path yang 'bocor'.")
+    parser.add_argument("--no-memory", action="store_true", help="Jangan ukur memori (tracemalloc menambah overhead).")
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--compare", help="File hasil pembanding (default: hasil terbaru di --results-dir).")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help=f"Ambang regresi dalam persen (default: {DEFAULT_REGRESSION_THRESHOLD}).")
+    parser.add_argument("--no-save", action="store_true", help="Jangan simpan hasil.")
+    args = parser.parse_args()
+
+    params = {name: value for name, value in vars(args).items()
+              if name not in ("only", "no_memory", "results_dir", "compare", "threshold", "no_save")}
+    current = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "params": params,
+        "scenarios": {},
+    }
+
+    print(f"\n{'Skenario':<12}{'Item':>8}{'Waktu (s)':>11}{'Throughput':>18}{'p50 (ms)':>10}{'p99 (ms)':>10}{'Memori (MB)':>13}")
+    for name in args.only or SCENARIOS:
+        result = BENCHMARKS[name](args)
+        current["scenarios"][name] = result
+        memory = f"{result['peak_mem_mb']:.1f}" if result["peak_mem_mb"] is not None else "-"
+        print(f"{name:<12}{result['items']:>8}{result['elapsed_s']:>11.2f}"
+              f"{result['throughput']:>11.1f} {result['unit'] + '/s':<6}{result['p50_ms']:>10.1f}"
+              f"{result['p99_ms']:>10.1f}{memory:>13}")
+
+    compare_path = args.compare or latest_result(args.results_dir)
+    regressions = []
+    if compare_path:
+        with open(compare_path, "r") as f:
+            previous = json.load(f)
+        print(f"\n[*] Dibandingkan dengan {compare_path} (commit {previous.get('git_commit')}):")
+        regressions = compare_results(current, previous, args.threshold)
+
+    if not args.no_save:
+        os.makedirs(args.results_dir, exist_ok=True)
+        output_path = os.path.join(args.results_dir, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(output_path, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"\n[*] Hasil disimpan ke {output_path}")
+
+    if regressions:
+        print(f"\n[!] Regresi melebihi {args.threshold}%:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Server pengganti lokal untuk benchmark: situs HTML sintetis, CDX API Wayback, dan
+DNS (UDP), plus skrip palsu `subfinder`/`httpx`. Semua server berjalan di thread
+latar belakang pada port acak di 127.0.0.1 sehingga benchmark tidak menyentuh
+internet.
+"""
+import hashlib
+import os
+import socket
+import stat
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive agar pool koneksi klien ikut diukur
+    wbufsize = 64 * 1024  # Header dan body dikirim bersama (menghindari jeda Nagle/delayed ACK)
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str, extra_headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _BackgroundServer:
+    """Menjalankan ThreadingHTTPServer di thread daemon; dipakai sebagai context manager."""
+
+    def __init__(self, handler_class):
+        ThreadingHTTPServer.request_queue_size = 512
+        ThreadingHTTPServer.daemon_threads = True
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        self.server.owner = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _SiteHandler(_QuietHandler):
+    def do_GET(self):
+        site = self.server.owner
+        if site.latency:
+            time.sleep(site.latency)
+        path = urlparse(self.path).path
+        if path in ("/", "/index.html"):
+            self.send_body(200, site.page, "text/html; charset=utf-8")
+        elif path.startswith("/assets/"):
+            self.send_body(200, site.asset_body(path), "application/octet-stream",
+                           {"ETag": f'"{hashlib.sha1(path.encode()).hexdigest()}"'})
+        else:
+            self.send_body(404, b"not found", "text/plain")
+
+
+class SyntheticSite(_BackgroundServer):
+    """
+    Situs sintetis: `/` berisi `n_assets` referensi aset lokal (`/assets/<i>.bin`,
+    masing-masing `asset_size` byte) dan `n_external` domain eksternal. Setiap
+    respons ditunda `latency` detik untuk meniru RTT jaringan. Dengan `asset_hosts`
+    > 1, aset dibagi rata ke server cermin di port lain (host berbeda bagi klien).
+    """
+
+    def __init__(self, n_assets: int = 100, asset_size: int = 32 * 1024, n_external: int = 50,
+                 latency: float = 0.0, asset_hosts: int = 1):
+        super().__init__(_SiteHandler)
+        self.asset_size = asset_size
+        self.latency = latency
+        self.mirrors = [_BackgroundServer(_SiteHandler) for _ in range(asset_hosts - 1)]
+        for mirror in self.mirrors:
+            mirror.server.owner = self
+        asset_bases = [""] + [mirror.base_url for mirror in self.mirrors]
+        blocks = ["<!DOCTYPE html><html><head><title>Bench</title></head><body>"]
+        for i in range(n_assets):
+            blocks.append(f'<img src="{asset_bases[i % len(asset_bases)]}/assets/{i}.bin" alt="a{i}">')
+        for i in range(n_external):
+            blocks.append(f'<script src="https://cdn{i}.external{i % 7}.example/lib{i}.js"></script>')
+        blocks.append("</body></html>")
+        self.page = "\n".join(blocks).encode()
+        self._seed_block = hashlib.sha256(b"bench").digest() * 2048  # 64 KiB
+
+    def __enter__(self):
+        for mirror in self.mirrors:
+            mirror.__enter__()
+        return super().__enter__()
+
+    def __exit__(self, *exc):
+        for mirror in self.mirrors:
+            mirror.__exit__(*exc)
+        super().__exit__(*exc)
+
+    def asset_body(self, path: str) -> bytes:
+        # Isi deterministik tetapi unik per aset (awalan path), tanpa menyimpan semuanya di memori
+        prefix = path.encode()
+        repeats = self.asset_size // len(self._seed_block) + 1
+        return (prefix + self._seed_block * repeats)[:self.asset_size]
+
+
+class _CDXHandler(_QuietHandler):
+    def do_GET(self):
+        cdx = self.server.owner
+        if cdx.latency:
+            time.sleep(cdx.latency)
+        query = parse_qs(urlparse(self.path).query)
+        url = query.get("url", [""])[0]
+        limit = int(query.get("limit", ["5000"])[0])
+        start = int(query.get("resumeKey", ["0"])[0])
+        total = cdx.rows_per_path if url.endswith(cdx.hit_suffixes) else 0
+        end = min(total, start + limit)
+        lines = [f"20200101{i % 1000000:06d} http://{url}.{i} text/plain 200 DIGEST{i} {100 + i}"
+                 for i in range(start, end)]
+        body = "\n".join(lines) + "\n"
+        if end < total:
+            body += f"\n{end}\n"
+        self.send_body(200, body.encode(), "text/plain")
+
+
+class StubCDX(_BackgroundServer):
+    """CDX API palsu: path yang berakhiran `hit_suffixes` mengembalikan `rows_per_path` baris, dipaginasi dengan resumeKey."""
+
+    def __init__(self, rows_per_path: int = 100, hit_suffixes=(".env", ".git/config"), latency: float = 0.0):
+        super().__init__(_CDXHandler)
+        self.rows_per_path = rows_per_path
+        self.hit_suffixes = tuple(hit_suffixes)
+        self.latency = latency
+
+
+def _encode_name(name: str) -> bytes:
+    return b"".join(bytes([len(label)]) + label.encode() for label in name.split(".") if label) + b"\0"
+
+
+class StubDNS:
+    """
+    Server DNS UDP palsu: setiap nama menjawab A dengan IP deterministik dari
+    198.18.0.0/15 (rentang benchmark), dan nama apeks menjawab MX `mail.<domain>`.
+    """
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self._running = True
+
+    @property
+    def address(self) -> str:
+        return f"127.0.0.1:{self.sock.getsockname()[1]}"
+
+    def _answer(self, query: bytes) -> bytes:
+        query_id, = struct.unpack("!H", query[:2])
+        labels, offset = [], 12
+        while query[offset]:
+            length = query[offset]
+            labels.append(query[offset + 1:offset + 1 + length].decode())
+            offset += 1 + length
+        name = ".".join(labels).lower()
+        qtype, = struct.unpack("!H", query[offset + 1:offset + 3])
+        question = query[12:offset + 5]
+        answers = []
+        if qtype == 1:
+            digest = hashlib.md5(name.encode()).digest()
+            rdata = bytes([198, 18 + digest[0] % 2, digest[1], digest[2] or 1])
+            answers.append(struct.pack("!HHHIH", 0xC00C, 1, 1, 300, len(rdata)) + rdata)
+        elif qtype == 15 and name.count(".") == 1:
+            rdata = struct.pack("!H", 10) + _encode_name(f"mail.{name}")
+            answers.append(struct.pack("!HHHIH", 0xC00C, 15, 1, 300, len(rdata)) + rdata)
+        header = struct.pack("!HHHHHH", query_id, 0x8180, 1, len(answers), 0, 0)
+        return header + question + b"".join(answers)
+
+    def _serve(self):
+        while self._running:
+            try:
+                data, addr = self.sock.recvfrom(4096)
+                self.sock.sendto(self._answer(data), addr)
+            except OSError:
+                return
+            except (IndexError, struct.error, UnicodeDecodeError):
+                continue
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._running = False
+        self.sock.close()
+
+
+# Skrip shell (bukan Python) agar biaya start proses tidak mendominasi hasil ipFinder
+FAKE_SUBFINDER = """#!/bin/sh
+while [ "$1" != "-d" ] && [ $# -gt 0 ]; do shift; done
+i=0
+while [ $i -lt {count} ]; do
+    echo "sub$i.$2"
+    i=$((i + 1))
+done
+"""
+
+FAKE_HTTPX = """#!/bin/sh
+i=0
+while read -r host; do
+    [ -z "$host" ] && continue
+    i=$((i + 1))
+    echo "{{\\"url\\":\\"https://$host\\",\\"input\\":\\"$host\\",\\"a\\":[\\"198.18.$((i / 250)).$((i % 250 + 1))\\"],\\"status_code\\":200,\\"title\\":\\"bench\\"}}"
+done
+"""
+
+
+def install_fake_tools(bin_dir: str, subdomains_per_domain: int = 20) -> str:
+    """
+    Menulis skrip `subfinder` dan `httpx` palsu (/bin/sh) ke `bin_dir` dan
+    mengembalikan nilai PATH baru yang mendahulukan direktori tersebut.
+    """
+    os.makedirs(bin_dir, exist_ok=True)
+    for name, source in (("subfinder", FAKE_SUBFINDER.format(count=subdomains_per_domain)),
+                         ("httpx", FAKE_HTTPX.format())):
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write(source)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return bin_dir + os.pathsep + os.environ.get("PATH", "")
@@ -0,0 +1,159 @@
+import bisect
+import ipaddress
+import json
+import os
+import socket
+
+# Indeks rentang IP CDN/cloud untuk klasifikasi kandidat origin IP. Prefix dari
+# beberapa provider diratakan menjadi interval yang tidak saling tumpang tindih dan
+# disimpan sebagai array terurut per versi IP, sehingga setiap lookup adalah satu
+# pencarian biner (O(log n)).
+
+DEFAULT_RANGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cdn_ranges")
+AWS_RANGES_FILE = "ip-ranges.json"
+
+
+class CDNIndex:
+    """
+    Indeks interval terurut (start, end, provider) untuk IPv4 dan IPv6.
+
+    Tambahkan prefix dengan `add`, lalu panggil `build` sebelum `lookup`. Jika rentang
+    dua provider tumpang tindih, bagian yang tumpang tindih menjadi milik rentang yang
+    dimulai lebih awal (atau yang ditambahkan lebih dulu jika awalnya sama).
+    """
+
+    def __init__(self):
+        self._pending = {4: [], 6: []}
+        self._starts = {4: [], 6: []}
+        self._ends = {4: [], 6: []}
+        self._providers = {4: [], 6: []}
+        self.provider_counts = {}
+
+    def add(self, cidr: str, provider: str):
+        network = ipaddress.ip_network(cidr.strip(), strict=False)
+        order = sum(len(items) for items in self._pending.values())
+        self._pending[network.version].append(
+            (int(network.network_address), int(network.broadcast_address), order, provider))
+        self.provider_counts[provider] = self.provider_counts.get(provider, 0) + 1
+
+    def build(self):
+        for version, ranges in self._pending.items():
+            ranges.sort(key=lambda item: (item[0], item[2]))
+            starts, ends, providers = [], [], []
+            for start, end, _, provider in ranges:
+                if ends and start <= ends[-1]:
+                    if end <= ends[-1]:
+                        continue  # Sepenuhnya tercakup oleh interval sebelumnya
+                    if providers[-1] == provider:
+                        ends[-1] = end  # Gabungkan interval provider yang sama
+                        continue
+                    start = ends[-1] + 1
+                if ends and providers[-1] == provider and start == ends[-1] + 1:
+                    ends[-1] = end
+                    continue
+                starts.append(start)
+                ends.append(end)
+                providers.append(provider)
+            self._starts[version] = starts
+            self._ends[version] = ends
+            self._providers[version] = providers
+        return self
+
+    def __len__(self):
+        return sum(len(starts) for starts in self._starts.values())
+
+    def lookup(self, ip: str) -> str | None:
+        """Mengembalikan nama provider CDN untuk IP, atau None jika bukan IP CDN yang dikenal."""
+        # inet_pton jauh lebih cepat daripada ipaddress.ip_address untuk jutaan lookup
+        ip = ip.strip()
+        try:
+            value = int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+            version = 4
+        except OSError:
+            try:
+                value = int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big")
+                version = 6
+            except (OSError, ValueError):
+                return None
+        position = bisect.bisect_right(self._starts[version], value) - 1
+        if position >= 0 and value <= self._ends[version][position]:
+            return self._providers[version][position]
+        return None
+
+    def load_prefix_file(self, path: str, provider: str):
+        with open(path, "r") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    self.add(line, provider)
+
+    def load_aws_ranges(self, path: str, service: str = "CLOUDFRONT", provider: str = "cloudfront"):
+        with open(path, "r") as f:
+            data = json.load(f)
+        for entry in data.get("prefixes", []):
+            if entry.get("service") == service:
+                self.add(entry["ip_prefix"], provider)
+        for entry in data.get("ipv6_prefixes", []):
+            if entry.get("service") == service:
+                self.add(entry["ipv6_prefix"], provider)
+
+
+def load_cdn_index(ranges_dir: str = DEFAULT_RANGES_DIR) -> CDNIndex:
+    """
+    Memuat semua daftar prefix dari `ranges_dir`: setiap `<provider>.txt` (satu CIDR
+    per baris) dan `ip-ranges.json` milik AWS (prefix CloudFront).
+    """
+    index = CDNIndex()
+    if os.path.isdir(ranges_dir):
+        for name in sorted(os.listdir(ranges_dir)):
+            path = os.path.join(ranges_dir, name)
+            if name.endswith(".txt"):
+                index.load_prefix_file(path, name[:-len(".txt")])
+            elif name == AWS_RANGES_FILE:
+                index.load_aws_ranges(path)
+    return index.build()
+
+
+def is_public_ip(ip: str) -> bool:
+    try:
+        return ipaddress.ip_address(ip).is_global
+    except ValueError:
+        return False
+
+
+def rank_origin_candidates(host_ips: dict[str, list[str]], mx_ips: dict[str, list[str]],
+                           index: CDNIndex, httpx_cdn: dict[str, str] | None = None) -> dict:
+    """
+    Mengklasifikasikan semua IP subdomain dan MX sebagai CDN atau non-CDN.
+
+    Mengembalikan dict dengan:
+    - `candidates`: daftar kandidat origin (IP publik non-CDN), diurutkan berdasarkan
+      skor menurun. Setiap kandidat berisi ip, score, subdomains, dan mx_hosts.
+      Skor: 2 poin per subdomain web, 1 poin per host MX.
+    - `cdn`: {ip: provider} untuk IP yang berada di rentang CDN (atau ditandai httpx)
+    - `non_public`: IP privat/reserved yang diabaikan
+    """
+    httpx_cdn = httpx_cdn or {}
+    groups = {}
+    for source, mapping in (("subdomains", host_ips), ("mx_hosts", mx_ips)):
+        for host, ips in mapping.items():
+            for ip in ips:
+                group = groups.setdefault(ip, {"ip": ip, "subdomains": set(), "mx_hosts": set()})
+                group[source].add(host)
+
+    candidates, cdn, non_public = [], {}, []
+    for ip, group in groups.items():
+        provider = index.lookup(ip) or httpx_cdn.get(ip)
+        if provider:
+            cdn[ip] = provider
+        elif not is_public_ip(ip):
+            non_public.append(ip)
+        else:
+            candidates.append({
+                "ip": ip,
+                "score": 2 * len(group["subdomains"]) + len(group["mx_hosts"]),
+                "subdomains": sorted(group["subdomains"]),
+                "mx_hosts": sorted(group["mx_hosts"]),
+            })
+    candidates.sort(key=lambda item: (-item["score"], item["ip"]))
+    return {"candidates": candidates, "cdn": cdn, "non_public": sorted(non_public)}
@@ -0,0 +1,331 @@
+import asyncio
+import ipaddress
+import random
+import struct
+import threading
+import time
+
+# Minimal in-process DNS stub resolver (RFC 1035 wire format) used instead of
+# spawning one `dig` process per lookup. Queries go over UDP and fall back to TCP
+# when the response is truncated; answers are cached according to their TTL.
+
+QTYPES = {"A": 1, "NS": 2, "CNAME": 5, "SOA": 6, "MX": 15, "TXT": 16, "AAAA": 28}
+QTYPE_NAMES = {value: name for name, value in QTYPES.items()}
+CLASS_IN = 1
+OPT_RR_TYPE = 41
+
+RCODE_NOERROR = 0
+RCODE_NXDOMAIN = 3
+
+DEFAULT_NAMESERVERS = ["1.1.1.1", "8.8.8.8"]
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_RETRIES = 2
+DEFAULT_MAX_CONCURRENCY = 200
+# TTL used for negative answers when the response carries no SOA record.
+DEFAULT_NEGATIVE_TTL = 60
+EDNS_UDP_PAYLOAD = 1232
+
+
+class DNSError(Exception):
+    """Raised when a query cannot be answered (timeout, SERVFAIL, malformed response)."""
+
+
+def parse_nameserver(value: str, default_port: int = 53) -> tuple[str, int]:
+    """Parses 'ip', 'ip:port' or '[ipv6]:port' into an (ip, port) tuple."""
+    value = value.strip()
+    if value.startswith("["):
+        host, _, port = value[1:].partition("]")
+        return host, int(port.lstrip(":") or default_port)
+    if value.count(":") == 1:
+        host, port = value.split(":")
+        return host, int(port)
+    return value, default_port
+
+
+def system_nameservers(resolv_conf: str = "/etc/resolv.conf") -> list[str]:
+    """Reads nameservers from resolv.conf, falling back to public resolvers."""
+    nameservers = []
+    try:
+        with open(resolv_conf, "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    nameservers.append(parts[1])
+    except OSError:
+        pass
+    return nameservers or list(DEFAULT_NAMESERVERS)
+
+
+def encode_name(name: str) -> bytes:
+    """
+    Encodes a domain name as DNS wire-format labels. Raises DNSError for names
+    that cannot be queried (empty or over-long labels, invalid IDNA, more than
+    255 bytes) instead of sending a malformed query.
+    """
+    qname = b""
+    for label in name.rstrip(".").split("."):
+        if not label:
+            raise DNSError(f"Label kosong di nama {name!r}")
+        try:
+            encoded = label.encode("idna")
+        except UnicodeError as e:
+            raise DNSError(f"Label tidak valid di nama {name!r}: {e}") from None
+        if len(encoded) > 63:
+            raise DNSError(f"Label terlalu panjang di nama {name!r}")
+        qname += bytes([len(encoded)]) + encoded
+    qname += b"\x00"
+    if len(qname) > 255:
+        raise DNSError(f"Nama terlalu panjang: {name!r}")
+    return qname
+
+
+def build_query(name: str, qtype: int, query_id: int) -> bytes:
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 1)  # RD=1, one OPT record
+    opt = b"\x00" + struct.pack("!HHIH", OPT_RR_TYPE, EDNS_UDP_PAYLOAD, 0, 0)
+    return header + encode_name(name) + struct.pack("!HH", qtype, CLASS_IN) + opt
+
+
+def _read_name(data: bytes, offset: int) -> tuple[str, int]:
+    labels = []
+    end_offset = None
+    jumps = 0
+    while True:
+        if offset >= len(data):
+            raise DNSError("Nama terpotong di respons DNS")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data):
+                raise DNSError("Pointer nama terpotong di respons DNS")
+            if end_offset is None:
+                end_offset = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            jumps += 1
+            if jumps > 64:
+                raise DNSError("Loop pointer nama di respons DNS")
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset:offset + length].decode("ascii", errors="replace"))
+        offset += length
+    return ".".join(labels), (end_offset if end_offset is not None else offset)
+
+
+def _decode_rdata(data: bytes, rtype: int, offset: int, rdlength: int):
+    rdata = data[offset:offset + rdlength]
+    if rtype == QTYPES["A"] and rdlength == 4:
+        return str(ipaddress.IPv4Address(rdata))
+    if rtype == QTYPES["AAAA"] and rdlength == 16:
+        return str(ipaddress.IPv6Address(rdata))
+    if rtype in (QTYPES["CNAME"], QTYPES["NS"]):
+        return _read_name(data, offset)[0]
+    if rtype == QTYPES["MX"]:
+        preference = struct.unpack("!H", rdata[:2])[0]
+        return f"{preference} {_read_name(data, offset + 2)[0]}"
+    if rtype == QTYPES["TXT"]:
+        strings = []
+        position = 0
+        while position < len(rdata):
+            length = rdata[position]
+            strings.append(rdata[position + 1:position + 1 + length].decode("utf-8", errors="replace"))
+            position += 1 + length
+        return "".join(strings)
+    if rtype == QTYPES["SOA"]:
+        _, next_offset = _read_name(data, offset)
+        _, next_offset = _read_name(data, next_offset)
+        return struct.unpack("!IIIII", data[next_offset:next_offset + 20])
+    return rdata.hex()
+
+
+def parse_response(data: bytes) -> dict:
+    """
+    Parses a DNS response into a dict with keys: id, rcode, truncated, answers and
+    authority (lists of (name, type, ttl, value) tuples).
+    """
+    if len(data) < 12:
+        raise DNSError("Respons DNS terlalu pendek")
+    query_id, flags, qdcount, ancount, nscount, _ = struct.unpack("!HHHHHH", data[:12])
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = _read_name(data, offset)
+        offset += 4
+
+    sections = {"answers": [], "authority": []}
+    for section, count in (("answers", ancount), ("authority", nscount)):
+        for _ in range(count):
+            name, offset = _read_name(data, offset)
+            if offset + 10 > len(data):
+                raise DNSError("Record terpotong di respons DNS")
+            rtype, _, ttl, rdlength = struct.unpack("!HHIH", data[offset:offset + 10])
+            offset += 10
+            try:
+                value = _decode_rdata(data, rtype, offset, rdlength)
+            except (struct.error, IndexError) as e:
+                raise DNSError(f"RDATA rusak di respons DNS: {e}") from None
+            offset += rdlength
+            sections[section].append((name.lower(), rtype, ttl, value))
+
+    return {
+        "id": query_id,
+        "rcode": flags & 0x000F,
+        "truncated": bool(flags & 0x0200),
+        **sections,
+    }
+
+
+class _UDPQueryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, query_id: int, future: asyncio.Future):
+        self.query_id = query_id
+        self.future = future
+
+    def datagram_received(self, data, addr):
+        # Abaikan paket yang tidak cocok dengan ID kueri (mis. respons basi/spoof)
+        if len(data) >= 2 and struct.unpack("!H", data[:2])[0] == self.query_id and not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+class DNSResolver:
+    """
+    Asynchronous DNS stub resolver with a TTL-respecting cache.
+
+    The cache is protected by a lock so one resolver can be shared across domains
+    and threads (each thread may drive its own event loop via `resolve_many_sync`).
+    `stats` counts sent queries, cache hits and failures.
+    """
+
+    def __init__(self, nameservers: list[str] | None = None, timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 use_tcp: bool = False):
+        self.nameservers = [parse_nameserver(ns) for ns in (nameservers or system_nameservers())]
+        self.timeout = timeout
+        self.retries = retries
+        self.max_concurrency = max_concurrency
+        self.use_tcp = use_tcp
+        self.stats = {"queries": 0, "cache_hits": 0, "failures": 0}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _cache_get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, records = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return None
+            self.stats["cache_hits"] += 1
+            return records
+
+    def _cache_put(self, key, records, ttl):
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, records)
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    async def _send_udp(self, payload: bytes, query_id: int, server: tuple[str, int]) -> bytes:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _UDPQueryProtocol(query_id, future), remote_addr=server)
+        try:
+            transport.sendto(payload)
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            transport.close()
+
+    async def _send_tcp(self, payload: bytes, server: tuple[str, int]) -> bytes:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(*server), self.timeout)
+        try:
+            writer.write(struct.pack("!H", len(payload)) + payload)
+            await writer.drain()
+            length = struct.unpack("!H", await asyncio.wait_for(reader.readexactly(2), self.timeout))[0]
+            return await asyncio.wait_for(reader.readexactly(length), self.timeout)
+        finally:
+            writer.close()
+
+    async def _exchange(self, name: str, qtype: int) -> dict:
+        encode_name(name)  # Nama yang tidak valid gagal sekali, tanpa dicoba ulang
+        last_error = None
+        for attempt in range(self.retries + 1):
+            server = self.nameservers[attempt % len(self.nameservers)]
+            query_id = random.randint(0, 0xFFFF)
+            payload = build_query(name, qtype, query_id)
+            self._count("queries")
+            try:
+                if self.use_tcp:
+                    response = parse_response(await self._send_tcp(payload, server))
+                else:
+                    response = parse_response(await self._send_udp(payload, query_id, server))
+                    if response["truncated"]:
+                        response = parse_response(await self._send_tcp(payload, server))
+                if response["rcode"] not in (RCODE_NOERROR, RCODE_NXDOMAIN):
+                    last_error = DNSError(f"{name} {QTYPE_NAMES.get(qtype, qtype)}: rcode {response['rcode']} dari {server[0]}")
+                    continue
+                return response
+            except (asyncio.TimeoutError, OSError, asyncio.IncompleteReadError, DNSError) as e:
+                last_error = e if isinstance(e, DNSError) else DNSError(
+                    f"{name} {QTYPE_NAMES.get(qtype, qtype)}: {type(e).__name__} dari {server[0]}")
+        raise last_error
+
+    async def query(self, name: str, qtype: str = "A") -> list[str]:
+        """
+        Resolves `name` and returns the values of records matching `qtype`
+        (CNAME chains in the answer are followed implicitly). Raises DNSError
+        when no nameserver gives a usable answer.
+        """
+        name = name.strip().rstrip(".").lower()
+        key = (name, qtype)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self._exchange(name, QTYPES[qtype])
+        except DNSError:
+            self._count("failures")
+            raise
+
+        wanted = QTYPES[qtype]
+        records = [value for _, rtype, _, value in response["answers"] if rtype == wanted]
+        if records:
+            ttl = min(ttl for _, rtype, ttl, _ in response["answers"] if rtype == wanted)
+        else:
+            soa = [value for _, rtype, _, value in response["authority"] if rtype == QTYPES["SOA"]]
+            ttl = soa[0][4] if soa else DEFAULT_NEGATIVE_TTL
+        self._cache_put(key, records, ttl)
+        return records
+
+    async def resolve_many(self, queries) -> dict:
+        """
+        Resolves an iterable of (name, qtype) pairs concurrently, bounded by
+        `max_concurrency`. Returns {(name, qtype): list of values or DNSError};
+        an unexpected error for one name only replaces that name's result.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        queries = list(dict.fromkeys(queries))
+
+        async def bounded(name, qtype):
+            async with semaphore:
+                try:
+                    return await self.query(name, qtype)
+                except DNSError as e:
+                    return e
+                except Exception as e:
+                    self._count("failures")
+                    return DNSError(f"{name} {qtype}: {type(e).__name__}: {e}")
+
+        results = await asyncio.gather(*(bounded(name, qtype) for name, qtype in queries))
+        return dict(zip(queries, results))
+
+    def resolve_many_sync(self, queries) -> dict:
+        return asyncio.run(self.resolve_many(queries))
+
+    def resolve(self, name: str, qtype: str = "A") -> list[str]:
+        return asyncio.run(self.query(name, qtype))
@@ -0,0 +1,272 @@
+import argparse
+import sqlite3
+import threading
+import time
+
+# Penyimpanan temuan lintas pemindaian (SQLite terindeks): subdomain, IP, host MX,
+# hash aset, domain eksternal, dan hit Wayback per target, masing-masing dengan
+# waktu pertama dan terakhir terlihat. Dipakai untuk pemindaian ulang inkremental
+# dan kueri lintas target ("target mana yang berbagi SHA1/IP ini").
+
+DEFAULT_STORE_PATH = ".findings.sqlite3"
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS subdomains ("
+    " target TEXT NOT NULL, subdomain TEXT NOT NULL, first_seen REAL NOT NULL, last_seen REAL NOT NULL,"
+    " PRIMARY KEY (target, subdomain))",
+    "CREATE TABLE IF NOT EXISTS host_ips ("
+    " target TEXT NOT NULL, host TEXT NOT NULL, ip TEXT NOT NULL, source TEXT NOT NULL,"
+    " first_seen REAL NOT NULL, last_seen REAL NOT NULL,"
+    " PRIMARY KEY (target, host, ip, source))",
+    "CREATE INDEX IF NOT EXISTS idx_host_ips_ip ON host_ips (ip)",
+    "CREATE TABLE IF NOT EXISTS mx_hosts ("
+    " target TEXT NOT NULL, mx_host TEXT NOT NULL, first_seen REAL NOT NULL, last_seen REAL NOT NULL,"
+    " PRIMARY KEY (target, mx_host))",
+    "CREATE TABLE IF NOT EXISTS assets ("
+    " target TEXT NOT NULL, url TEXT NOT NULL, sha1 TEXT, md5 TEXT, sha256 TEXT, favicon_mmh3 TEXT,"
+    " hash_status TEXT, first_seen REAL NOT NULL, last_seen REAL NOT NULL, last_changed REAL NOT NULL,"
+    " PRIMARY KEY (target, url))",
+    "CREATE INDEX IF NOT EXISTS idx_assets_sha1 ON assets (sha1)",
+    "CREATE INDEX IF NOT EXISTS idx_assets_md5 ON assets (md5)",
+    "CREATE INDEX IF NOT EXISTS idx_assets_sha256 ON assets (sha256)",
+    "CREATE INDEX IF NOT EXISTS idx_assets_favicon ON assets (favicon_mmh3)",
+    "CREATE TABLE IF NOT EXISTS external_domains ("
+    " target TEXT NOT NULL, domain TEXT NOT NULL, first_page TEXT, page_count INTEGER NOT NULL,"
+    " first_seen REAL NOT NULL, last_seen REAL NOT NULL,"
+    " PRIMARY KEY (target, domain))",
+    "CREATE INDEX IF NOT EXISTS idx_external_domains_domain ON external_domains (domain)",
+    "CREATE TABLE IF NOT EXISTS wayback_hits ("
+    " target TEXT NOT NULL, path TEXT NOT NULL, original TEXT NOT NULL, timestamp TEXT NOT NULL,"
+    " statuscode TEXT, digest TEXT, first_seen REAL NOT NULL, last_seen REAL NOT NULL,"
+    " PRIMARY KEY (target, original, timestamp))",
+]
+
+# Upsert generik: baris baru mendapat first_seen, baris lama hanya memperbarui last_seen
+_UPSERT_SUFFIX = " ON CONFLICT ({keys}) DO UPDATE SET last_seen = excluded.last_seen{extra}"
+
+
+class FindingsStore:
+    """
+    Penyimpanan temuan berbasis SQLite, aman dipakai dari beberapa thread.
+
+    Semua tabel memakai kunci (target, ...) sehingga pemindaian ulang hanya
+    memperbarui `last_seen`; `first_seen` mencatat kapan temuan pertama kali muncul.
+    Kolom yang dipakai untuk kueri lintas target (IP, hash aset, domain eksternal)
+    diindeks.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def _upsert(self, table: str, columns: tuple, keys: tuple, rows: list, extra_updates: str = ""):
+        if not rows:
+            return
+        placeholders = ", ".join("?" for _ in columns)
+        sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+               + _UPSERT_SUFFIX.format(keys=", ".join(keys), extra=extra_updates))
+        self._conn.executemany(sql, rows)
+
+    def _column_set(self, sql: str, params: tuple) -> set:
+        return {row[0] for row in self._conn.execute(sql, params)}
+
+    # --- ipFinder ---
+
+    def known_subdomains(self, target: str) -> set[str]:
+        with self._lock:
+            return self._column_set("SELECT subdomain FROM subdomains WHERE target = ?", (target,))
+
+    def record_subdomains(self, target: str, subdomains) -> set[str]:
+        """Menyimpan subdomain dan mengembalikan yang belum pernah terlihat untuk target ini."""
+        now = time.time()
+        subdomains = set(subdomains)
+        with self._lock:
+            known = self._column_set("SELECT subdomain FROM subdomains WHERE target = ?", (target,))
+            self._upsert("subdomains", ("target", "subdomain", "first_seen", "last_seen"), ("target", "subdomain"),
+                         [(target, subdomain, now, now) for subdomain in subdomains])
+            self._conn.commit()
+        return subdomains - known
+
+    def record_host_ips(self, target: str, host_ips: dict, source: str):
+        """Menyimpan {host: [ip]} dengan sumber temuan ("httpx", "dns", atau "mx")."""
+        now = time.time()
+        rows = [(target, host, ip, source, now, now) for host, ips in host_ips.items() for ip in ips]
+        with self._lock:
+            self._upsert("host_ips", ("target", "host", "ip", "source", "first_seen", "last_seen"),
+                         ("target", "host", "ip", "source"), rows)
+            self._conn.commit()
+
+    def host_ips(self, target: str, sources=("httpx", "dns")) -> dict[str, set[str]]:
+        """IP yang pernah tercatat per host untuk target (dipakai mode inkremental)."""
+        placeholders = ", ".join("?" for _ in sources)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT host, ip FROM host_ips WHERE target = ? AND source IN ({placeholders})",
+                (target, *sources)).fetchall()
+        result = {}
+        for host, ip in rows:
+            result.setdefault(host, set()).add(ip)
+        return result
+
+    def record_mx_hosts(self, target: str, mx_ips: dict):
+        now = time.time()
+        with self._lock:
+            self._upsert("mx_hosts", ("target", "mx_host", "first_seen", "last_seen"), ("target", "mx_host"),
+                         [(target, mx_host, now, now) for mx_host in mx_ips])
+            self._conn.commit()
+        self.record_host_ips(target, mx_ips, "mx")
+
+    def record_wayback_hits(self, target: str, results: dict) -> int:
+        """Menyimpan entri CDX {path: [entri]} (hasil error diabaikan); mengembalikan jumlah entri baru."""
+        now = time.time()
+        rows = [(target, path, entry["original"], entry["timestamp"], entry.get("statuscode"), entry.get("digest"),
+                 now, now)
+                for path, entries in results.items() if isinstance(entries, list) for entry in entries]
+        with self._lock:
+            before = self._conn.execute("SELECT COUNT(*) FROM wayback_hits WHERE target = ?", (target,)).fetchone()[0]
+            self._upsert("wayback_hits", ("target", "path", "original", "timestamp", "statuscode", "digest",
+                                          "first_seen", "last_seen"), ("target", "original", "timestamp"), rows)
+            self._conn.commit()
+            after = self._conn.execute("SELECT COUNT(*) FROM wayback_hits WHERE target = ?", (target,)).fetchone()[0]
+        return after - before
+
+    # --- hashLookup ---
+
+    def record_assets(self, target: str, assets: list[dict]) -> dict:
+        """
+        Menyimpan hash aset dan mengembalikan {"new", "changed", "unchanged"}: aset yang
+        SHA1-nya berbeda dari pemindaian sebelumnya dihitung "changed" dan `last_changed`
+        diperbarui. Aset yang dilewati karena ukuran tidak disimpan.
+        """
+        now = time.time()
+        counts = {"new": 0, "changed": 0, "unchanged": 0}
+        with self._lock:
+            previous = dict(self._conn.execute("SELECT url, sha1 FROM assets WHERE target = ?", (target,)).fetchall())
+            rows = []
+            for asset in assets:
+                if asset.get("hash_status") == "skipped" or not asset.get("sha1"):
+                    continue
+                url = asset["asset_url"]
+                if url not in previous:
+                    counts["new"] += 1
+                elif previous[url] != asset["sha1"]:
+                    counts["changed"] += 1
+                else:
+                    counts["unchanged"] += 1
+                favicon = asset.get("favicon_mmh3")
+                rows.append((target, url, asset["sha1"], asset.get("md5"), asset.get("sha256"),
+                             str(favicon) if favicon is not None else None, asset.get("hash_status"), now, now, now))
+            self._upsert("assets", ("target", "url", "sha1", "md5", "sha256", "favicon_mmh3", "hash_status",
+                                    "first_seen", "last_seen", "last_changed"), ("target", "url"), rows,
+                         ", last_changed = CASE WHEN assets.sha1 IS excluded.sha1 THEN assets.last_changed"
+                         " ELSE excluded.last_changed END, sha1 = excluded.sha1, md5 = excluded.md5,"
+                         " sha256 = excluded.sha256, favicon_mmh3 = excluded.favicon_mmh3,"
+                         " hash_status = excluded.hash_status")
+            self._conn.commit()
+        return counts
+
+    # --- parsing ---
+
+    def record_external_domains(self, target: str, domains, domain_details: dict | None = None):
+        """Menyimpan domain eksternal; `domain_details` (mode crawl) memberi halaman pertama dan jumlah halaman."""
+        now = time.time()
+        domain_details = domain_details or {}
+        rows = [(target, domain, domain_details.get(domain, {}).get("first_seen"),
+                 domain_details.get(domain, {}).get("count", 1), now, now) for domain in domains]
+        with self._lock:
+            self._upsert("external_domains", ("target", "domain", "first_page", "page_count", "first_seen",
+                                              "last_seen"), ("target", "domain"), rows,
+                         ", page_count = excluded.page_count")
+            self._conn.commit()
+
+    # --- Kueri lintas target ---
+
+    def targets_for_hash(self, value: str) -> list[dict]:
+        """Target dan URL aset yang memiliki hash ini (SHA1, MD5, SHA256, atau mmh3 favicon)."""
+        value = value.strip().lower()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT target, url, first_seen, last_seen FROM assets WHERE sha1 = ?"
+                " UNION SELECT target, url, first_seen, last_seen FROM assets WHERE md5 = ?"
+                " UNION SELECT target, url, first_seen, last_seen FROM assets WHERE sha256 = ?"
+                " UNION SELECT target, url, first_seen, last_seen FROM assets WHERE favicon_mmh3 = ?"
+                " ORDER BY target, url", (value, value, value, value)).fetchall()
+        return [dict(zip(("target", "url", "first_seen", "last_seen"), row)) for row in rows]
+
+    def targets_for_ip(self, ip: str) -> list[dict]:
+        """Target dan host (subdomain/MX) yang pernah mengarah ke IP ini."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT target, host, source, first_seen, last_seen FROM host_ips WHERE ip = ?"
+                " ORDER BY target, host", (ip.strip(),)).fetchall()
+        return [dict(zip(("target", "host", "source", "first_seen", "last_seen"), row)) for row in rows]
+
+    def targets_for_external_domain(self, domain: str) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT target, page_count, first_seen, last_seen FROM external_domains WHERE domain = ?"
+                " ORDER BY target", (domain.strip().lower(),)).fetchall()
+        return [dict(zip(("target", "page_count", "first_seen", "last_seen"), row)) for row in rows]
+
+    def target_summary(self, target: str) -> dict:
+        tables = ("subdomains", "host_ips", "mx_hosts", "assets", "external_domains", "wayback_hits")
+        with self._lock:
+            return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table} WHERE target = ?", (target,)).fetchone()[0]
+                    for table in tables}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _format_time(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kueri lintas target pada penyimpanan temuan.")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"File SQLite (default: {DEFAULT_STORE_PATH}).")
+    parser.add_argument("--hash", help="Cari target yang memiliki aset dengan hash ini (SHA1/MD5/SHA256/mmh3).")
+    parser.add_argument("--ip", help="Cari target yang host-nya pernah mengarah ke IP ini.")
+    parser.add_argument("--external-domain", help="Cari target yang mereferensikan domain eksternal ini.")
+    parser.add_argument("--target", help="Tampilkan ringkasan jumlah temuan untuk target.")
+    args = parser.parse_args(argv)
+
+    with FindingsStore(args.store) as store:
+        if args.hash:
+            rows = store.targets_for_hash(args.hash)
+            print(f"[*] {len(rows)} aset dengan hash {args.hash}:")
+            for row in rows:
+                print(f"  - {row['target']}: {row['url']} (pertama {_format_time(row['first_seen'])}, "
+                      f"terakhir {_format_time(row['last_seen'])})")
+        if args.ip:
+            rows = store.targets_for_ip(args.ip)
+            print(f"[*] {len(rows)} host yang mengarah ke {args.ip}:")
+            for row in rows:
+                print(f"  - {row['target']}: {row['host']} [{row['source']}] (pertama {_format_time(row['first_seen'])}, "
+                      f"terakhir {_format_time(row['last_seen'])})")
+        if args.external_domain:
+            rows = store.targets_for_external_domain(args.external_domain)
+            print(f"[*] {len(rows)} target mereferensikan {args.external_domain}:")
+            for row in rows:
+                print(f"  - {row['target']} ({row['page_count']} halaman, terakhir {_format_time(row['last_seen'])})")
+        if args.target:
+            print(f"[*] Ringkasan temuan untuk {args.target}: {store.target_summary(args.target)}")
+        if not (args.hash or args.ip or args.external_domain or args.target):
+            parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,35 @@
 import requests
+import argparse
+import base64
 import hashlib
-from bs4 import BeautifulSoup
 import re
-from urllib.parse import urljoin
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from assetCache import AssetHashCache
+from findingsStore import DEFAULT_STORE_PATH, FindingsStore
+from htmlExtract import extract_links
+from httpClient import PooledSession
+from knownLibs import KnownLibraryFilter, load_known_libs
+from tracing import enable_tracing, print_trace_summary, span
+
+# Batas konkurensi pengambilan aset: total worker dan maksimum koneksi bersamaan per host.
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_PER_HOST_LIMIT = 4
+
+# Batas ukuran aset yang di-hash. Aset yang lebih besar dilewati ("skip") atau
+# hanya di-hash sebagian dari awal ("partial"), sesuai kebijakan yang dipilih.
+DEFAULT_MAX_ASSET_BYTES = 10 * 1024 * 1024
+DEFAULT_OVERSIZE_POLICY = "partial"
+OVERSIZE_POLICIES = ("skip", "partial")
+HASH_CHUNK_SIZE = 64 * 1024
+
+try:
+    import mmh3  # Opsional, untuk hash favicon gaya Shodan (http.favicon.hash)
+except ImportError:
+    mmh3 = None
 
 # Fungsi prepare_url_for_requests dapat diimpor dari parsing.py jika berada dalam satu paket
 # atau disalin/disederhanakan di sini. Untuk kemudahan, versi sederhana disertakan.
@@ -21,117 +48,348 @@ def generate_lookup_links(asset_hashes):
     for asset in asset_hashes:
         sha1 = asset.get("sha1")
         md5 = asset.get("md5")
+        sha256 = asset.get("sha256")
+        favicon_mmh3 = asset.get("favicon_mmh3")
         asset_url = asset.get("asset_url")
+        hash_status = asset.get("hash_status", "full")
         
         current_links = {} 
         
-        if sha1: 
-            current_links["Google (SHA1)"] = f'https://www.google.com/search?q=SHA1%3A{sha1}'
-            current_links["Censys (SHA1)"] = f'https://search.censys.io/certificates?q={sha1}'
-            current_links["Shodan (raw file)"] = f'https://www.shodan.io/search?query=hash%3A{sha1}'
-        
-        if md5: 
-            current_links["Google (MD5)"] = f'https://www.google.com/search?q=MD5%3A{md5}'
+        # Hash parsial hanya mencakup awal file, sehingga tidak berguna untuk pencarian
+        if hash_status == "full":
+            if sha1: 
+                current_links["Google (SHA1)"] = f'https://www.google.com/search?q=SHA1%3A{sha1}'
+                current_links["Censys (SHA1)"] = f'https://search.censys.io/certificates?q={sha1}'
+                current_links["Shodan (raw file)"] = f'https://www.shodan.io/search?query=hash%3A{sha1}'
+            
+            if md5: 
+                current_links["Google (MD5)"] = f'https://www.google.com/search?q=MD5%3A{md5}'
+
+            if sha256:
+                current_links["Censys (SHA256)"] = f'https://search.censys.io/search?resource=hosts&q={sha256}'
+
+            if favicon_mmh3 is not None:
+                current_links["Shodan (favicon)"] = f'https://www.shodan.io/search?query=http.favicon.hash%3A{favicon_mmh3}'
             
         result = {
             "asset_url": asset_url,
             "sha1": sha1,
             "md5": md5,
+            "sha256": sha256,
+            "favicon_mmh3": favicon_mmh3,
+            "hash_status": hash_status,
             "lookup_links": current_links
         }
         lookup_results.append(result)
     
     return lookup_results
 
-def fetch_and_hash_asset(asset_url: str, session: requests.Session):
-    """Mengambil konten dari URL aset dan mengembalikan hash SHA1 dan MD5."""
+def is_favicon_candidate(asset_url: str, content_type: str = "") -> bool:
+    """Menentukan apakah aset kemungkinan adalah favicon (untuk hash mmh3 gaya Shodan)."""
+    path = urlparse(asset_url).path.lower()
+    content_type = content_type.split(";")[0].strip().lower()
+    return (path.endswith(".ico") or "favicon" in path
+            or content_type in ("image/x-icon", "image/vnd.microsoft.icon"))
+
+def fetch_and_hash_asset(asset_url: str, session: PooledSession,
+                         max_bytes: int = DEFAULT_MAX_ASSET_BYTES,
+                         oversize_policy: str = DEFAULT_OVERSIZE_POLICY,
+                         cache: AssetHashCache | None = None):
+    """
+    Mengambil konten dari URL aset secara streaming dan menghitung SHA1, MD5, SHA256
+    (dan hash mmh3 untuk favicon jika pustaka mmh3 tersedia) dalam satu kali baca.
+
+    Aset yang melebihi `max_bytes` (dicek dulu dari header Content-Length, lalu saat
+    streaming) dilewati jika `oversize_policy` adalah "skip", atau hanya di-hash
+    sebagian jika "partial". Status tercatat di kunci `hash_status`:
+    "full", "partial", atau "skipped". Mengembalikan None jika pengambilan gagal.
+
+    Jika `cache` diberikan, permintaan dikirim secara kondisional dan respons 304
+    memakai ulang hash yang tersimpan tanpa mengunduh ulang aset.
+    """
+    with span("asset", asset_url) as asset_span:
+        result = _fetch_and_hash_asset(asset_url, session, max_bytes, oversize_policy, cache, asset_span)
+        if result is not None:
+            # Hit 304 tidak mengunduh body; bytes_read di entri cache milik unduhan lama
+            from_cache = result.get("from_cache", False)
+            asset_span.set(bytes=0 if from_cache else result.get("bytes_read", 0),
+                           hash_status=result.get("hash_status"), from_cache=from_cache)
+        return result
+
+def _fetch_and_hash_asset(asset_url: str, session: PooledSession, max_bytes: int, oversize_policy: str,
+                          cache: AssetHashCache | None, asset_span):
     try:
         print(f"    [*] Mencoba mengambil aset: {asset_url}")
-        # Timeout bisa disesuaikan
-        response = session.get(asset_url, timeout=15, headers={'User-Agent': 'Mozilla/5.0 (compatible; PythonAssetHasher/1.0)'})
-        response.raise_for_status() # Akan raise HTTPError untuk status 4xx/5xx
-        content = response.content # Konten biner untuk hashing
-        
-        sha1_hash = hashlib.sha1(content).hexdigest()
-        md5_hash = hashlib.md5(content).hexdigest()
-        print(f"    [+] Berhasil di-hash: {asset_url} (SHA1: {sha1_hash[:8]}..., MD5: {md5_hash[:8]}...)")
-        return sha1_hash, md5_hash
+        request_headers = {}
+        cached_entry = cache.get(asset_url) if cache is not None else None
+        if cached_entry:
+            request_headers.update(cache.conditional_headers(cached_entry))
+        # Timeout, User-Agent, dan percobaan ulang diatur oleh PooledSession
+        with session.get(asset_url, stream=True, headers=request_headers) as response:
+            asset_span.set(status=response.status_code)
+            if response.status_code == 304 and cached_entry:
+                cache.record_hit()
+                print(f"    [+] Tidak berubah (304), memakai hash dari cache: {asset_url}")
+                return {**cached_entry["hashes"], "from_cache": True}
+            response.raise_for_status() # Akan raise HTTPError untuk status 4xx/5xx
+            if cache is not None:
+                cache.record_miss()
+
+            content_length = response.headers.get("Content-Length", "")
+            declared_size = int(content_length) if content_length.isdigit() else None
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if declared_size is not None and declared_size > max_bytes and oversize_policy == "skip":
+                print(f"    [-] Aset dilewati: {asset_url} (Content-Length {declared_size} > batas {max_bytes} byte)")
+                return {"hash_status": "skipped", "bytes_read": 0, "declared_size": declared_size,
+                        "sha1": None, "md5": None, "sha256": None, "favicon_mmh3": None}
+
+            sha1 = hashlib.sha1()
+            md5 = hashlib.md5()
+            sha256 = hashlib.sha256()
+            # Favicon berukuran kecil, jadi kontennya disimpan untuk hash mmh3 (butuh base64 utuh)
+            favicon_buffer = bytearray() if mmh3 is not None and is_favicon_candidate(
+                asset_url, response.headers.get("Content-Type", "")) else None
+            bytes_read = 0
+            hash_status = "full"
+
+            for chunk in response.iter_content(chunk_size=HASH_CHUNK_SIZE):
+                if not chunk:
+                    continue
+                if bytes_read + len(chunk) > max_bytes:
+                    if oversize_policy == "skip":
+                        print(f"    [-] Aset dilewati: {asset_url} (melebihi batas {max_bytes} byte saat streaming)")
+                        return {"hash_status": "skipped", "bytes_read": bytes_read, "declared_size": declared_size,
+                                "sha1": None, "md5": None, "sha256": None, "favicon_mmh3": None}
+                    chunk = chunk[:max_bytes - bytes_read]
+                    hash_status = "partial"
+                sha1.update(chunk)
+                md5.update(chunk)
+                sha256.update(chunk)
+                if favicon_buffer is not None:
+                    favicon_buffer.extend(chunk)
+                bytes_read += len(chunk)
+                if hash_status == "partial":
+                    break
+
+        favicon_hash = None
+        if favicon_buffer is not None and hash_status == "full":
+            favicon_hash = mmh3.hash(base64.encodebytes(bytes(favicon_buffer)))
+
+        result = {
+            "hash_status": hash_status,
+            "bytes_read": bytes_read,
+            "declared_size": declared_size,
+            "sha1": sha1.hexdigest(),
+            "md5": md5.hexdigest(),
+            "sha256": sha256.hexdigest(),
+            "favicon_mmh3": favicon_hash,
+        }
+        if cache is not None and hash_status == "full" and (etag or last_modified):
+            cache.put(asset_url, etag, last_modified, result)
+        status_note = "" if hash_status == "full" else f", parsial {bytes_read} byte pertama"
+        print(f"    [+] Berhasil di-hash: {asset_url} (SHA1: {result['sha1'][:8]}..., MD5: {result['md5'][:8]}...{status_note})")
+        return result
     except requests.exceptions.HTTPError as e:
+        asset_span.set(error=type(e).__name__)
         print(f"    [!] Gagal mengambil aset {asset_url}: Kesalahan HTTP {e.response.status_code}")
     except requests.exceptions.RequestException as e:
+        asset_span.set(error=type(e).__name__)
         print(f"    [!] Gagal mengambil aset {asset_url}: {e}")
     except Exception as e:
+        asset_span.set(error=type(e).__name__)
         print(f"    [!] Kesalahan tak terduga saat memproses aset {asset_url}: {e}")
-    return None, None
+    return None
 
-def extract_assets_from_url(target_url: str, session: requests.Session):
+def map_with_host_limit(executor, func, urls: list[str], max_in_flight: int, per_host_limit: int):
+    """
+    Seperti executor.map (hasil berurutan sesuai input), tetapi URL hanya dikirim ke
+    pool jika host-nya masih punya slot. Antrean per host dilayani bergiliran, sehingga
+    worker tidak pernah menganggur menunggu satu host yang penuh selagi host lain
+    masih punya URL.
+    """
+    queues = {}
+    for index, url in enumerate(urls):
+        queues.setdefault(urlparse(url).netloc.lower(), deque()).append(index)
+    in_flight = dict.fromkeys(queues, 0)
+    ready_hosts = deque(queues)  # Host dengan URL tersisa dan slot kosong
+    running = {}
+    finished = {}
+    next_index = 0
+    while next_index < len(urls):
+        while ready_hosts and len(running) < max_in_flight:
+            host = ready_hosts.popleft()
+            index = queues[host].popleft()
+            in_flight[host] += 1
+            running[executor.submit(func, urls[index])] = (index, host)
+            if queues[host] and in_flight[host] < per_host_limit:
+                ready_hosts.append(host)
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, host = running.pop(future)
+            finished[index] = future.result()
+            in_flight[host] -= 1
+            # Host yang tadinya penuh kembali ke giliran begitu satu slotnya bebas
+            if queues[host] and in_flight[host] == per_host_limit - 1:
+                ready_hosts.append(host)
+        while next_index in finished:
+            yield finished.pop(next_index)
+            next_index += 1
+
+def extract_assets_from_url(target_url: str, session: PooledSession,
+                            max_workers: int = DEFAULT_MAX_WORKERS,
+                            per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                            stats: dict | None = None,
+                            max_bytes: int = DEFAULT_MAX_ASSET_BYTES,
+                            oversize_policy: str = DEFAULT_OVERSIZE_POLICY,
+                            cache: AssetHashCache | None = None,
+                            known_libs: KnownLibraryFilter | None = None,
+                            on_asset=None):
     """
     Mengekstrak URL aset (gambar, skrip, stylesheet) dari URL target,
-    mengambilnya, dan menghitung hashnya.
+    mengambilnya secara konkuren, dan menghitung hashnya.
+
+    Pengambilan aset dibatasi oleh `max_workers` secara global dan `per_host_limit`
+    per host; URL dijadwalkan per host (`map_with_host_limit`) sehingga host yang
+    penuh tidak menahan worker. Jika `stats` diberikan, jumlah halaman, aset, dan waktu yang dihabiskan
+    diakumulasikan ke dalamnya agar throughput beberapa target dapat dihitung; halaman
+    utama yang gagal diambil dihitung di `page_failures` (daftar kosong saja tidak
+    membedakannya dari halaman tanpa aset).
+    Batas ukuran aset dan `cache` diteruskan ke `fetch_and_hash_asset`.
+
+    Jika `known_libs` diberikan, URL pustaka umum (jQuery, Bootstrap, font, analitik)
+    dilewati sebelum diunduh dan aset yang hash-nya dikenal dibuang dari hasil;
+    jumlahnya tercatat di `known_libs.stats`. `on_asset` (jika diberikan) dipanggil
+    untuk setiap aset segera setelah di-hash, dalam urutan yang sama dengan hasil.
     """
     print(f"\n[*] Memulai ekstraksi aset dari: {target_url}")
+    page_start = time.perf_counter()
     asset_details_list = []
-    
+    html_content = None
+
     try:
         print(f"[*] Mencoba mengambil konten utama dari: {target_url}")
-        response = session.get(target_url, timeout=20, headers={'User-Agent': 'Mozilla/5.0 (compatible; PythonAssetHasher/1.0)'})
+        with span("page", target_url) as page_span:
+            response = session.get(target_url)
+            page_span.set(status=response.status_code, bytes=len(response.content))
         response.raise_for_status()
         html_content = response.text
         print(f"[+] Konten utama berhasil diambil dari {target_url} (Status: {response.status_code})")
     except requests.exceptions.HTTPError as e:
         print(f"[!] Gagal mengambil URL utama {target_url}: Kesalahan HTTP {e.response.status_code}")
-        return []
     except requests.exceptions.RequestException as e:
         print(f"[!] Gagal mengambil URL utama {target_url}: {e}")
-        return []
     except Exception as e:
         print(f"[!] Kesalahan tak terduga saat mengambil URL utama {target_url}: {e}")
+    if html_content is None:
+        if stats is not None:
+            stats["page_failures"] = stats.get("page_failures", 0) + 1
         return []
 
     print("[*] Mem-parsing konten HTML untuk mencari aset...")
-    soup = BeautifulSoup(html_content, "html.parser")
-    found_asset_urls = set()
-
-    asset_tags_attrs = {
-        "img": "src",
-        "script": "src",
-        "link": "href",      # Biasanya untuk CSS, bisa juga ikon
-        "iframe": "src",
-        "source": "src",     # Untuk tag <audio> dan <video>
-        "object": "data",
-        "embed": "src",
-    }
-
-    for tag_name, attr_name in asset_tags_attrs.items():
-        for tag in soup.find_all(tag_name):
-            asset_src = tag.get(attr_name)
-            if asset_src:
-                absolute_asset_url = urljoin(target_url, asset_src.strip())
-                if absolute_asset_url.startswith(("http://", "https://")):
-                    found_asset_urls.add(absolute_asset_url)
+    # Satu lintasan tokenizer: tag aset, srcset, dan url() di CSS inline
+    found_asset_urls = extract_links(html_content).asset_urls(target_url)
     
     if not found_asset_urls:
-        print("[-] Tidak ada URL aset potensial yang ditemukan di dalam tag HTML.")
+        print("[-] Tidak ada URL aset potensial yang ditemukan di dalam HTML.")
         return []
     
     print(f"[+] Ditemukan {len(found_asset_urls)} URL aset unik potensial. Memproses masing-masing...")
 
-    for asset_url in sorted(list(found_asset_urls)): # Urutkan untuk output yang konsisten
-        sha1, md5 = fetch_and_hash_asset(asset_url, session)
-        # Hanya tambahkan aset ke daftar jika kedua hash berhasil dihitung (artinya aset valid dan dapat diakses)
-        if sha1 is not None and md5 is not None:
-            asset_details_list.append({
-                "asset_url": asset_url,
-                "sha1": sha1,
-                "md5": md5
-            })
-        # Jika fetch_and_hash_asset gagal, ia sudah mencetak pesan kesalahan.
-        # Kita tidak menambahkan aset ini ke daftar untuk diproses lebih lanjut.
+    sorted_asset_urls = sorted(found_asset_urls) # Urutkan untuk output yang konsisten
+    if known_libs is not None:
+        sorted_asset_urls = [asset_url for asset_url in sorted_asset_urls if known_libs.match_url(asset_url) is None]
+        skipped = len(found_asset_urls) - len(sorted_asset_urls)
+        if skipped:
+            print(f"[-] {skipped} URL pustaka umum dilewati tanpa diunduh.")
+    def fetch(asset_url):
+        return fetch_and_hash_asset(asset_url, session, max_bytes, oversize_policy, cache)
+
+    # Pastikan pool koneksi session cukup besar untuk semua worker agar koneksi dipakai ulang
+    session.ensure_pool_size(max_workers)
+
+    fetch_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Hasil dikembalikan sesuai urutan input, sehingga output tetap deterministik
+        hash_results = map_with_host_limit(executor, fetch, sorted_asset_urls, max_workers, per_host_limit)
+        dropped = 0
+        for asset_url, hash_result in zip(sorted_asset_urls, hash_results):
+            # Hanya tambahkan aset yang berhasil diambil (termasuk yang dilewati/parsial karena ukuran,
+            # agar tercatat statusnya)
+            if hash_result is None:
+                # Jika fetch_and_hash_asset gagal, ia sudah mencetak pesan kesalahan.
+                # Kita tidak menambahkan aset ini ke daftar untuk diproses lebih lanjut.
+                continue
+            asset = {"asset_url": asset_url, **hash_result}
+            if known_libs is not None and known_libs.match_hashes(asset):
+                dropped += 1
+                continue
+            asset_details_list.append(asset)
+            if on_asset is not None:
+                on_asset(asset)
+    fetch_elapsed = time.perf_counter() - fetch_start
+    total_elapsed = time.perf_counter() - page_start
+
+    if dropped:
+        print(f"[-] {dropped} aset dibuang karena hash-nya dikenal sebagai pustaka umum.")
+
+    if stats is not None:
+        stats["pages"] = stats.get("pages", 0) + 1
+        stats["assets"] = stats.get("assets", 0) + len(sorted_asset_urls)
+        stats["elapsed"] = stats.get("elapsed", 0.0) + total_elapsed
+
+    print(f"[*] Throughput: {1 / total_elapsed if total_elapsed else 0:.2f} halaman/detik, "
+          f"{len(sorted_asset_urls) / fetch_elapsed if fetch_elapsed else 0:.2f} aset/detik "
+          f"({len(sorted_asset_urls)} aset dalam {fetch_elapsed:.2f} detik, "
+          f"workers={max_workers}, per host={per_host_limit})")
     return asset_details_list
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ekstraksi dan hashing aset dari URL target, plus tautan pencarian hash.")
+    parser.add_argument("url", nargs="?", help="URL target. Jika kosong, akan diminta secara interaktif.")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Aktifkan tracing per permintaan: span ditulis ke FILE (JSONL) dan ringkasan "
+                             "tahap/host terlambat dicetak setelah pengambilan aset.")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH,
+                        help=f"Database SQLite untuk menyimpan hash aset antar pemindaian (default: {DEFAULT_STORE_PATH}).")
+    parser.add_argument("--no-store", action="store_true", help="Jangan simpan hash aset ke database.")
+    parser.add_argument("--max-asset-bytes", type=int, default=DEFAULT_MAX_ASSET_BYTES,
+                        help=f"Batas ukuran aset yang di-hash, dalam byte (default: {DEFAULT_MAX_ASSET_BYTES}).")
+    parser.add_argument("--oversize", choices=OVERSIZE_POLICIES, default=DEFAULT_OVERSIZE_POLICY,
+                        help="Perlakuan aset yang melebihi --max-asset-bytes: 'skip' melewatinya, 'partial' "
+                             f"hanya meng-hash bagian awalnya (default: {DEFAULT_OVERSIZE_POLICY}).")
+    parser.add_argument("--known-libs", action="append", metavar="DIR",
+                        help="Direktori daftar pustaka umum tambahan (hosts.txt, paths.txt, hashes.txt), "
+                             "dimuat setelah daftar bawaan known_libs/. Bisa diulang. hashes.txt bawaan kosong: "
+                             "tanpa digest tambahan hanya filter host/path yang aktif.")
+    parser.add_argument("--no-known-libs", action="store_true",
+                        help="Jangan lewati pustaka umum (jQuery, Bootstrap, font, analitik).")
+    parser.add_argument("--offline", action="append", metavar="PATH",
+                        help="Hash aset dari arsip WARC (.warc/.warc.gz), HAR, atau direktori halaman tersimpan, "
+                             "bukan dari URL live. Bisa diulang. Hasil ditulis sebagai JSONL.")
+    parser.add_argument("-o", "--output", help="File JSONL hasil mode --offline (default: stdout).")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Jumlah proses worker mode --offline (default: jumlah CPU, 0 = tanpa pool).")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.offline:
+        # Diimpor di sini: offlineExtract memakai fungsi dari modul ini
+        from offlineExtract import run_offline
+
+        def add_lookup_links(result):
+            if result["type"] == "asset":
+                result["lookup_links"] = generate_lookup_links([result])[0]["lookup_links"]
+            return result
+
+        known_libs = None if args.no_known_libs else load_known_libs(args.known_libs)
+        run_offline(args.offline, "assets", args.output, args.processes, known_libs, transform=add_lookup_links)
+        return
+    if args.trace:
+        enable_tracing(args.trace)
     print("[*] Selamat datang di skrip Pencarian Hash Aset Otomatis.")
-    raw_url_input = input("Masukkan URL target untuk dianalisis (contoh: http://example.com): ").strip()
+    raw_url_input = args.url or input("Masukkan URL target untuk dianalisis (contoh: http://example.com): ").strip()
     
     target_url = prepare_url_for_requests(raw_url_input)
 
@@ -139,14 +397,33 @@ def main():
         print("[!] URL input tidak valid atau kosong. Keluar.")
         return
 
-    # Gunakan session untuk efisiensi koneksi dan potensi penggunaan kembali cookie/header
-    with requests.Session() as session:
-        asset_hashes_input = extract_assets_from_url(target_url, session)
+    # Gunakan session bersama untuk efisiensi koneksi (keep-alive per host, retry, batas laju adaptif)
+    # Cache hash persisten: aset yang tidak berubah (304) tidak diunduh ulang pada pemindaian berikutnya
+    # Pustaka umum dilewati sebelum diunduh: hash-nya sama di banyak situs dan tidak membantu mencari origin
+    known_libs = None if args.no_known_libs else load_known_libs(args.known_libs)
+    with PooledSession(pool_maxsize=DEFAULT_MAX_WORKERS) as session, AssetHashCache() as cache:
+        asset_hashes_input = extract_assets_from_url(target_url, session, max_bytes=max(1, args.max_asset_bytes),
+                                                     oversize_policy=args.oversize, cache=cache,
+                                                     known_libs=known_libs)
+        print(f"[*] Statistik cache aset ({cache.path}): {cache.summary()}")
+        if known_libs is not None:
+            print(f"[*] Filter pustaka umum: {known_libs.summary()}")
+        print("[*] Statistik per host:")
+        for line in session.format_host_stats():
+            print(f"  - {line}")
+    print_trace_summary()
 
     if not asset_hashes_input:
         print("\n[!] Tidak ada aset yang berhasil diekstrak atau di-hash dari URL tersebut. Keluar.")
         return
 
+    if not args.no_store:
+        # Target dicatat per hostname agar bisa dikueri bersama temuan ipFinder/parsing
+        with FindingsStore(args.store) as store:
+            changes = store.record_assets(urlparse(target_url).hostname, asset_hashes_input)
+        print(f"[*] Hash aset disimpan ke {args.store}: {changes['new']} baru, {changes['changed']} berubah, "
+              f"{changes['unchanged']} tidak berubah sejak pemindaian sebelumnya.")
+
     print(f"\n[*] Menghasilkan link pencarian untuk {len(asset_hashes_input)} aset yang ditemukan/diproses...")
     results = generate_lookup_links(asset_hashes_input)
 
@@ -157,6 +434,12 @@ def main():
         
         provided_sha1 = item.get('sha1')
         provided_md5 = item.get('md5')
+        provided_sha256 = item.get('sha256')
+
+        if item.get('hash_status') == "skipped":
+            print("  Status: Dilewati karena melebihi batas ukuran")
+        elif item.get('hash_status') == "partial":
+            print("  Status: Hash parsial (hanya awal file, melebihi batas ukuran)")
 
         if provided_sha1:
             print(f"  SHA1: {provided_sha1}")
@@ -168,6 +451,12 @@ def main():
         else:
             print(f"  MD5: Tidak dapat dihitung/ditemukan")
 
+        if provided_sha256:
+            print(f"  SHA256: {provided_sha256}")
+
+        if item.get('favicon_mmh3') is not None:
+            print(f"  Favicon MMH3: {item['favicon_mmh3']}")
+
         if item["lookup_links"]: # Cek apakah dictionary lookup_links tidak kosong
             print("  Link Pencarian:")
             for name, link in item["lookup_links"].items():
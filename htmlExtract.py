@@ -0,0 +1,203 @@
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+try:
+    from lxml import etree  # Opsional: backend tokenizer yang lebih cepat
+except ImportError:
+    etree = None
+
+# Mesin ekstraksi HTML bersama untuk parsing.py dan hashLookup.py. Dokumen dibaca
+# sekali dengan tokenizer streaming (tanpa membangun pohon DOM) dan semua referensi
+# yang dibutuhkan kedua skrip dikumpulkan dalam satu lintasan.
+
+# Tag dan atribut yang dianggap sebagai aset oleh hashLookup.py
+ASSET_TAG_ATTRS = {
+    "img": "src",
+    "script": "src",
+    "link": "href",      # Biasanya untuk CSS, bisa juga ikon
+    "iframe": "src",
+    "source": "src",     # Untuk tag <audio> dan <video>
+    "object": "data",
+    "embed": "src",
+}
+
+# Tag yang diperiksa parsing.py untuk URL eksternal (atribut src atau href)
+EXTERNAL_REF_TAGS = ("iframe", "script", "img", "link")
+
+# Tag navigasi yang diikuti oleh crawler (atribut href/src ke halaman lain)
+PAGE_LINK_TAGS = {"a": "href", "area": "href", "frame": "src", "iframe": "src"}
+
+CSS_URL_PATTERN = re.compile(r"""url\(\s*(['"]?)(.*?)\1\s*\)""", re.IGNORECASE)
+META_REFRESH_URL_PATTERN = re.compile(r"url=(.+)", re.IGNORECASE)
+
+
+def absolute_http_url(base_url: str, link: str) -> str | None:
+    """
+    `link` di-resolve terhadap `base_url` jika hasilnya URL http/https yang valid,
+    selain itu None. Tautan rusak (port bukan angka, IPv6 tanpa `]`) dilewati agar
+    satu href yang salah tidak menggagalkan seluruh halaman.
+    """
+    try:
+        absolute_url = urljoin(base_url, link.strip())
+        if not absolute_url.startswith(("http://", "https://")):
+            return None
+        urlsplit(absolute_url).port  # Memicu ValueError untuk port yang tidak valid
+    except ValueError:
+        return None
+    return absolute_url
+
+
+def parse_srcset(value: str) -> list[str]:
+    """Mengambil URL dari atribut srcset ("a.png 1x, b.png 2x")."""
+    urls = []
+    for candidate in value.split(","):
+        parts = candidate.strip().split()
+        if parts:
+            urls.append(parts[0])
+    return urls
+
+
+class LinkCollector:
+    """
+    Mengumpulkan referensi dari event tokenizer (start tag, data teks, end tag).
+
+    Hasil mentah (belum di-resolve) tersimpan di:
+    - `tag_refs`: daftar (tag, atribut) untuk tag di ASSET_TAG_ATTRS/EXTERNAL_REF_TAGS
+    - `meta_refresh`: target redirect dari <meta http-equiv="refresh">
+    - `srcset_urls`: URL dari atribut srcset
+    - `css_urls`: URL dari url(...) di atribut style dan blok <style>
+    - `page_links`: tautan navigasi dari <a>, <area>, <frame>, dan <iframe>
+    """
+
+    def __init__(self):
+        self.tag_refs = []
+        self.meta_refresh = []
+        self.srcset_urls = []
+        self.css_urls = []
+        self.page_links = []
+        self._in_style = False
+
+    def start(self, tag: str, attrs: dict):
+        tag = tag.lower()
+        if tag in ASSET_TAG_ATTRS or tag in EXTERNAL_REF_TAGS:
+            refs = {name: attrs[name] for name in ("src", "href", "data") if attrs.get(name)}
+            if refs:
+                self.tag_refs.append((tag, refs))
+        if tag in PAGE_LINK_TAGS and attrs.get(PAGE_LINK_TAGS[tag]):
+            self.page_links.append(attrs[PAGE_LINK_TAGS[tag]])
+        if tag == "meta" and (attrs.get("http-equiv") or "").strip().lower() == "refresh":
+            match = META_REFRESH_URL_PATTERN.search(attrs.get("content") or "")
+            if match:
+                self.meta_refresh.append(match.group(1).strip().strip("'\""))
+        srcset = attrs.get("srcset")
+        if srcset:
+            self.srcset_urls.extend(parse_srcset(srcset))
+        style = attrs.get("style")
+        if style and "url(" in style.lower():
+            self._collect_css(style)
+        if tag == "style":
+            self._in_style = True
+
+    def end(self, tag: str):
+        if tag.lower() == "style":
+            self._in_style = False
+
+    def data(self, text: str):
+        if self._in_style and "url(" in text.lower():
+            self._collect_css(text)
+
+    def _collect_css(self, text: str):
+        for match in CSS_URL_PATTERN.finditer(text):
+            url = match.group(2).strip()
+            if url and not url.startswith("data:"):
+                self.css_urls.append(url)
+
+    def asset_urls(self, base_url: str) -> set[str]:
+        """URL aset absolut (http/https) untuk di-hash, di-resolve terhadap `base_url`."""
+        candidates = [refs.get(ASSET_TAG_ATTRS[tag]) for tag, refs in self.tag_refs if tag in ASSET_TAG_ATTRS]
+        candidates += self.srcset_urls + self.css_urls
+        found = set()
+        for candidate in candidates:
+            if candidate:
+                absolute_url = absolute_http_url(base_url, candidate)
+                if absolute_url:
+                    found.add(absolute_url)
+        return found
+
+    def page_urls(self, base_url: str) -> set[str]:
+        """Tautan halaman absolut (http/https) untuk di-crawl, di-resolve terhadap `base_url`."""
+        found = set()
+        for link in self.page_links + self.meta_refresh:
+            absolute_url = absolute_http_url(base_url, link)
+            if absolute_url:
+                found.add(absolute_url)
+        return found
+
+    def external_urls(self) -> set[str]:
+        """URL absolut atau protocol-relative yang mungkin menunjuk ke domain lain."""
+        candidates = [refs.get("src") or refs.get("href") for tag, refs in self.tag_refs if tag in EXTERNAL_REF_TAGS]
+        candidates += self.srcset_urls + self.css_urls
+        found = {url for url in candidates if url and (url.startswith("http") or url.startswith("//"))}
+        found.update(url for url in self.meta_refresh if url)
+        return found
+
+
+class _StdlibTokenizer(HTMLParser):
+    def __init__(self, collector: LinkCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, {name: value for name, value in attrs if value is not None})
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+class _LxmlTarget:
+    """Target parser lxml: menerima event streaming tanpa membangun pohon."""
+
+    def __init__(self, collector: LinkCollector):
+        self.collector = collector
+
+    def start(self, tag, attrib):
+        self.collector.start(tag, dict(attrib))
+
+    def end(self, tag):
+        self.collector.end(tag)
+
+    def data(self, text):
+        self.collector.data(text)
+
+    def close(self):
+        return self.collector
+
+
+def extract_links(html: str, backend: str = "auto") -> LinkCollector:
+    """
+    Mem-parsing HTML dalam satu lintasan dan mengembalikan LinkCollector berisi semua
+    referensi. `backend` dapat berupa "lxml", "stdlib", atau "auto" (lxml jika terpasang).
+    """
+    collector = LinkCollector()
+    if not html:
+        return collector
+    if backend == "auto":
+        backend = "lxml" if etree is not None else "stdlib"
+    if backend == "lxml":
+        if etree is None:
+            raise ImportError("Backend 'lxml' membutuhkan paket lxml (pip install lxml)")
+        parser = etree.HTMLParser(target=_LxmlTarget(collector), recover=True)
+        parser.feed(html)
+        parser.close()
+    else:
+        tokenizer = _StdlibTokenizer(collector)
+        tokenizer.feed(html)
+        tokenizer.close()
+    return collector
@@ -0,0 +1,208 @@
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+
+# Klien HTTP bersama untuk ipFinder.py, hashLookup.py, dan parsing.py. Satu
+# session dengan pool koneksi keep-alive per host (tidak mengulang handshake TLS),
+# timeout dan User-Agent default, percobaan ulang dengan backoff + jitter, batas
+# laju per host yang menyesuaikan diri saat server membalas 429/503, dan statistik
+# latensi per host.
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; InfraTraceTools/1.0)"
+DEFAULT_TIMEOUT = 15
+DEFAULT_POOL_CONNECTIONS = 32  # Jumlah host yang pool-nya disimpan
+DEFAULT_POOL_MAXSIZE = 16      # Koneksi keep-alive per host
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_CAP = 30.0
+THROTTLE_STATUS_CODES = (429, 503)
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+LATENCY_SAMPLES_PER_HOST = 1000
+
+# Batas laju adaptif: jeda minimum antar permintaan ke host yang sama dimulai dari
+# 0 (tanpa batas), digandakan setiap kali host membalas 429/503, dan dikurangi
+# perlahan setelah respons yang berhasil.
+THROTTLE_INITIAL_INTERVAL = 0.1
+THROTTLE_MAX_INTERVAL = 10.0
+THROTTLE_RECOVERY_FACTOR = 0.9
+
+
+class AdaptiveHostLimiter:
+    """Jeda minimum antar permintaan per host yang naik saat di-throttle dan turun saat pulih."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._interval = {}
+        self._next_slot = {}
+
+    def wait_turn(self, host: str):
+        with self._lock:
+            interval = self._interval.get(host, 0.0)
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            if interval <= 0 and slot <= now:
+                return
+            self._next_slot[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def throttled(self, host: str, retry_after: float | None = None):
+        with self._lock:
+            interval = self._interval.get(host, 0.0)
+            self._interval[host] = min(THROTTLE_MAX_INTERVAL, max(THROTTLE_INITIAL_INTERVAL, interval * 2))
+            if retry_after:
+                self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + retry_after)
+
+    def succeeded(self, host: str):
+        with self._lock:
+            interval = self._interval.get(host, 0.0) * THROTTLE_RECOVERY_FACTOR
+            if interval < THROTTLE_INITIAL_INTERVAL / 10:
+                self._interval.pop(host, None)
+            else:
+                self._interval[host] = interval
+
+    def interval(self, host: str) -> float:
+        with self._lock:
+            return self._interval.get(host, 0.0)
+
+
+class PooledSession(requests.Session):
+    """
+    `requests.Session` dengan pool koneksi yang disetel, timeout/User-Agent default,
+    percobaan ulang, dan batas laju adaptif per host.
+
+    Permintaan yang gagal koneksi/timeout atau dibalas 429/502/503/504 diulang hingga
+    `max_retries` kali dengan backoff eksponensial + jitter (menghormati Retry-After).
+    Jika semua percobaan habis, respons terakhir dikembalikan apa adanya sehingga
+    pemanggil tetap bisa memakai `raise_for_status`. Statistik per host tersedia
+    lewat `host_stats()`.
+    """
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE, max_retries: int = DEFAULT_MAX_RETRIES,
+                 timeout: float = DEFAULT_TIMEOUT, user_agent: str = DEFAULT_USER_AGENT,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE, backoff_cap: float = DEFAULT_BACKOFF_CAP):
+        super().__init__()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.headers["User-Agent"] = user_agent
+        self.limiter = AdaptiveHostLimiter()
+        self.totals = {"requests": 0, "retries": 0, "throttled": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        self._host_stats = {}
+        self._pool_maxsize = 0
+        self.ensure_pool_size(pool_maxsize, pool_connections)
+
+    def ensure_pool_size(self, pool_maxsize: int, pool_connections: int = DEFAULT_POOL_CONNECTIONS):
+        """
+        Memastikan pool per host menampung sedikitnya `pool_maxsize` koneksi (misalnya
+        sebanyak jumlah worker). Adapter hanya diganti jika perlu diperbesar, sehingga
+        koneksi keep-alive yang sudah ada tidak dibuang setiap kali dipanggil.
+        """
+        if pool_maxsize <= self._pool_maxsize:
+            return
+        self._pool_maxsize = pool_maxsize
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max(pool_connections, 1),
+                                                pool_maxsize=pool_maxsize)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def _record(self, host: str, stat: str, latency: float | None = None):
+        with self._stats_lock:
+            self.totals[stat] += 1
+            host_stats = self._host_stats.setdefault(host, {
+                "requests": 0, "retries": 0, "throttled": 0, "errors": 0,
+                "latencies": deque(maxlen=LATENCY_SAMPLES_PER_HOST)})
+            host_stats[stat] += 1
+            if latency is not None:
+                host_stats["latencies"].append(latency)
+
+    def _backoff_delay(self, attempt: int, response: requests.Response | None) -> float:
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            return min(float(retry_after), self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        host = (urlparse(url).hostname or "").lower()
+        for attempt in range(self.max_retries + 1):
+            self.limiter.wait_turn(host)
+            start = time.perf_counter()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record(host, "errors")
+                if attempt >= self.max_retries:
+                    raise
+                self._record(host, "retries")
+                time.sleep(self._backoff_delay(attempt, None))
+                continue
+            self._record(host, "requests", time.perf_counter() - start)
+
+            if response.status_code in THROTTLE_STATUS_CODES:
+                self._record(host, "throttled")
+                retry_after = response.headers.get("Retry-After", "")
+                self.limiter.throttled(host, float(retry_after) if retry_after.isdigit() else None)
+            else:
+                self.limiter.succeeded(host)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return response
+            self._record(host, "retries")
+            delay = self._backoff_delay(attempt, response)
+            response.close()
+            time.sleep(delay)
+        raise requests.exceptions.RetryError(f"Batas percobaan habis untuk {url}")
+
+    def host_stats(self) -> dict[str, dict]:
+        """
+        Mengembalikan {host: {requests, retries, throttled, errors, p50_ms, p95_ms,
+        max_ms, interval}}; latensi diukur sampai header respons diterima.
+        """
+        with self._stats_lock:
+            snapshot = {host: (dict(stats), sorted(stats["latencies"])) for host, stats in self._host_stats.items()}
+        summary = {}
+        for host, (stats, latencies) in snapshot.items():
+            stats.pop("latencies")
+            if latencies:
+                stats["p50_ms"] = latencies[len(latencies) // 2] * 1000
+                stats["p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+                stats["max_ms"] = latencies[-1] * 1000
+            stats["interval"] = self.limiter.interval(host)
+            summary[host] = stats
+        return summary
+
+    def format_host_stats(self, limit: int = 10) -> list[str]:
+        """Baris ringkasan untuk host dengan permintaan terbanyak."""
+        stats = self.host_stats()
+        lines = []
+        for host in sorted(stats, key=lambda name: -stats[name]["requests"])[:limit]:
+            host_stats = stats[host]
+            line = f"{host or '-'}: {host_stats['requests']} permintaan"
+            if "p50_ms" in host_stats:
+                line += f", p50 {host_stats['p50_ms']:.0f} ms, p95 {host_stats['p95_ms']:.0f} ms"
+            if host_stats["retries"] or host_stats["errors"]:
+                line += f", {host_stats['retries']} percobaan ulang, {host_stats['errors']} gagal koneksi"
+            if host_stats["throttled"]:
+                line += f", di-throttle {host_stats['throttled']}x (jeda {host_stats['interval']:.2f} detik)"
+            lines.append(line)
+        return lines
+
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def shared_session() -> PooledSession:
+    """Session bersama per proses, untuk pemanggil yang tidak membawa session sendiri."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = PooledSession()
+        return _shared_session
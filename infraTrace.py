@@ -0,0 +1,352 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+from urllib.parse import urlparse
+
+from findingsStore import DEFAULT_STORE_PATH
+
+# Titik masuk tunggal non-interaktif untuk ketiga alat:
+#
+#   python3 infraTrace.py ip-find example.com example.org
+#   cat domains.txt | python3 infraTrace.py ip-find --dns-only
+#   python3 infraTrace.py hash-lookup https://example.com | jq -r .sha1
+#   python3 infraTrace.py parse-domains --crawl https://example.com
+#
+# Target diambil dari argumen atau stdin (satu per baris, komentar `#`). Setiap hasil
+# ditulis ke stdout sebagai satu baris JSON segera setelah tersedia, sedangkan
+# pesan progres berbahasa Indonesia dari alat-alat dialihkan ke stderr. Modul berat
+# (requests, pipeline ipFinder, hashLookup, parsing) hanya diimpor di dalam
+# subperintah yang memakainya, sehingga `--help` dan `ip-find --dns-only` tetap
+# cepat dimulai.
+
+
+class JSONLWriter:
+    """Menulis rekaman JSON per baris ke stdout asli; aman dipanggil dari beberapa thread."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def emit(self, record_type: str, **fields):
+        line = json.dumps({"type": record_type, **fields}, ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+            self.count += 1
+
+
+def read_targets(values: list[str]) -> list[str]:
+    """Target dari argumen, atau dari stdin jika kosong atau berisi `-`; duplikat dibuang."""
+    if not values or values == ["-"]:
+        values = sys.stdin if not sys.stdin.isatty() else []
+    targets, seen = [], set()
+    for value in values:
+        value = value.split("#", 1)[0].strip()
+        if value and value not in seen:
+            seen.add(value)
+            targets.append(value)
+    return targets
+
+
+def _hostname(target: str) -> str:
+    return (urlparse(target if "://" in target else "//" + target).hostname or "").rstrip(".")
+
+
+def _open_store(args):
+    if args.no_store:
+        return None
+    from findingsStore import FindingsStore
+    return FindingsStore(args.store)
+
+
+# --- ip-find ---
+
+def run_dns_only(domains: list[str], args, out: JSONLWriter, store=None):
+    """
+    Resolusi A dan MX lalu klasifikasi CDN/origin, tanpa subfinder/httpx/Wayback (tanpa
+    requests). Dengan `store`, IP domain (sumber "dns") dan host MX ikut disimpan.
+    """
+    from cdnIndex import load_cdn_index, rank_origin_candidates
+    from dnsResolver import DNSError, DNSResolver
+    from tracing import span
+
+    resolver = DNSResolver(args.nameservers, **({"max_concurrency": args.dns_concurrency}
+                                                if args.dns_concurrency else {}))
+    cdn_index = load_cdn_index(args.cdn_ranges) if args.cdn_ranges else load_cdn_index()
+    with span("dns", queries=2 * len(domains)):
+        answers = resolver.resolve_many_sync([(domain, qtype) for domain in domains for qtype in ("A", "MX")])
+    mx_hosts = {}
+    for domain in domains:
+        for qtype in ("A", "MX"):
+            result = answers[(domain, qtype)]
+            if isinstance(result, DNSError):
+                out.emit("dns", domain=domain, qtype=qtype, error=str(result))
+            else:
+                out.emit("dns", domain=domain, qtype=qtype, answers=result)
+                if qtype == "MX":
+                    mx_hosts[domain] = [line.split()[-1].strip(".") for line in result if line.split()]
+    mx_queries = [(host, "A") for hosts in mx_hosts.values() for host in hosts]
+    with span("dns", queries=len(mx_queries)):
+        mx_answers = resolver.resolve_many_sync(mx_queries)
+    for domain in domains:
+        a_records = answers[(domain, "A")]
+        host_ips = {domain: a_records} if not isinstance(a_records, DNSError) and a_records else {}
+        mx_ips = {}
+        for host in mx_hosts.get(domain, []):
+            ips = mx_answers[(host, "A")]
+            if not isinstance(ips, DNSError) and ips:
+                mx_ips[host] = ips
+                out.emit("mx", domain=domain, mx_host=host, ips=ips)
+        if store is not None:
+            store.record_host_ips(domain, host_ips, "dns")
+            store.record_mx_hosts(domain, mx_ips)
+        _emit_ranking(domain, rank_origin_candidates(host_ips, mx_ips, cdn_index), out)
+
+
+def _emit_ranking(domain: str, ranking: dict, out: JSONLWriter):
+    for ip, provider in sorted(ranking["cdn"].items()):
+        out.emit("cdn_ip", domain=domain, ip=ip, provider=provider)
+    for rank, candidate in enumerate(ranking["candidates"], start=1):
+        out.emit("origin_candidate", domain=domain, rank=rank, **candidate)
+
+
+def cmd_ip_find(args, out: JSONLWriter) -> int:
+    domains = [domain for domain in map(_hostname, read_targets(args.targets)) if domain]
+    if not domains:
+        print("[!] Tidak ada domain target (argumen atau stdin).")
+        return 2
+    if args.dns_only:
+        store = _open_store(args)
+        try:
+            run_dns_only(domains, args, out, store)
+        finally:
+            if store is not None:
+                store.close()
+        return 0
+
+    from cdnIndex import load_cdn_index
+    from dnsResolver import DNSResolver
+    from ipFinder import run_domains
+    from waybackScanner import WaybackScanner
+
+    resolver = DNSResolver(args.nameservers, **({"max_concurrency": args.dns_concurrency}
+                                                if args.dns_concurrency else {}))
+    wayback = WaybackScanner(args.wayback_endpoint) if args.wayback_endpoint else WaybackScanner()
+    cdn_index = load_cdn_index(args.cdn_ranges) if args.cdn_ranges else load_cdn_index()
+    verifier = None
+    if args.verify_origins:
+        from originVerifier import OriginVerifier
+        verifier = OriginVerifier()
+    store = _open_store(args)
+
+    def on_record(domain, record):
+        out.emit("host", domain=domain, **record)
+
+    def on_domain(domain, stage_data, ranking):
+        for mx_host, ips in sorted(stage_data.get("mx_ips", {}).items()):
+            out.emit("mx", domain=domain, mx_host=mx_host, ips=ips)
+        for path, entries in stage_data.get("wayback_results", {}).items():
+            if isinstance(entries, list):
+                if entries:
+                    out.emit("wayback", domain=domain, path=path, entries=entries)
+            else:
+                out.emit("wayback", domain=domain, path=path, error=str(entries))
+        _emit_ranking(domain, ranking, out)
+        out.emit("domain_done", domain=domain, subdomains=len(stage_data.get("subdomains", [])))
+
+    try:
+        stats = run_domains(domains, resolver=resolver, wayback=wayback, cdn_index=cdn_index, on_record=on_record,
+                            verifier=verifier, store=store, incremental=args.incremental, on_domain=on_domain)
+    finally:
+        if store is not None:
+            store.close()
+    for result in stats.get("origin_verified", []):
+        out.emit("origin_verified", **result)
+    out.emit("stats", domains=stats["domains"], stage_failures=stats["stage_failures"],
+             elapsed=round(stats["elapsed"], 3), dns=stats["dns"], wayback=stats["wayback"])
+    return 0 if not stats["stage_failures"] else 1
+
+
+# --- hash-lookup ---
+
+def cmd_hash_lookup(args, out: JSONLWriter) -> int:
+    from hashLookup import generate_lookup_links, prepare_url_for_requests
+    from knownLibs import load_known_libs
+
+    known_libs = None if args.no_known_libs else load_known_libs(args.known_libs)
+    if args.offline:
+        from offlineExtract import iter_offline_results
+        for result in iter_offline_results(args.offline, "assets", args.processes, known_libs):
+            if result["type"] == "asset":
+                result["lookup_links"] = generate_lookup_links([result])[0]["lookup_links"]
+            out.emit(result.pop("type"), **result)
+        return 0
+
+    targets = [url for url in map(prepare_url_for_requests, read_targets(args.targets)) if url]
+    if not targets:
+        print("[!] Tidak ada URL target (argumen atau stdin).")
+        return 2
+
+    from assetCache import AssetHashCache
+    from hashLookup import DEFAULT_MAX_ASSET_BYTES, DEFAULT_MAX_WORKERS, DEFAULT_OVERSIZE_POLICY, \
+        extract_assets_from_url
+    from httpClient import PooledSession
+
+    store = _open_store(args)
+    workers = args.workers or DEFAULT_MAX_WORKERS
+    max_bytes = max(1, args.max_asset_bytes or DEFAULT_MAX_ASSET_BYTES)
+    failures = 0
+    with PooledSession(pool_maxsize=workers) as session, AssetHashCache() as cache:
+        for target_url in targets:
+            def on_asset(asset, target_url=target_url):
+                links = generate_lookup_links([asset])[0]["lookup_links"]
+                out.emit("asset", target=target_url, **asset, lookup_links=links)
+
+            page_stats = {}
+            assets = extract_assets_from_url(target_url, session, max_workers=workers, max_bytes=max_bytes,
+                                             oversize_policy=args.oversize or DEFAULT_OVERSIZE_POLICY,
+                                             cache=cache, known_libs=known_libs, on_asset=on_asset,
+                                             stats=page_stats)
+            # Daftar aset kosong bukan kegagalan: semua aset bisa saja pustaka umum yang dilewati
+            if page_stats.get("page_failures"):
+                failures += 1
+                out.emit("error", target=target_url, error="halaman utama gagal diambil")
+                continue
+            fields = {}
+            if store is not None:
+                fields["changes"] = store.record_assets(urlparse(target_url).hostname, assets)
+            out.emit("target_done", target=target_url, assets=len(assets), **fields)
+    if store is not None:
+        store.close()
+    return 0 if failures < len(targets) else 1
+
+
+# --- parse-domains ---
+
+def cmd_parse_domains(args, out: JSONLWriter) -> int:
+    if args.offline:
+        from offlineExtract import iter_offline_results
+        for result in iter_offline_results(args.offline, "domains", args.processes):
+            out.emit(result.pop("type"), **result)
+        return 0
+
+    from parsing import crawl_external_domains, extract_external_domains, prepare_url_for_requests
+
+    targets = [url for url in map(prepare_url_for_requests, read_targets(args.targets)) if url]
+    if not targets:
+        print("[!] Tidak ada URL target (argumen atau stdin).")
+        return 2
+
+    store = _open_store(args)
+    failures = 0
+    for target_url in targets:
+        if args.crawl:
+            crawl_kwargs = {name: value for name, value in (("max_depth", args.max_depth),
+                                                            ("max_pages", args.max_pages)) if value is not None}
+            result = crawl_external_domains(
+                target_url, on_domain=lambda domain, page, target_url=target_url: out.emit(
+                    "external_domain", target=target_url, domain=domain, first_seen=page),
+                **crawl_kwargs)
+        else:
+            result = extract_external_domains(target_url)
+            for domain in result.get("external_domains", []):
+                out.emit("external_domain", target=target_url, domain=domain)
+        if "error" in result:
+            failures += 1
+            out.emit("error", target=target_url, error=result["error"])
+            continue
+        if store is not None:
+            store.record_external_domains(urlparse(result["source_url"]).hostname, result["external_domains"],
+                                          result.get("domain_details"))
+        out.emit("target_done", target=target_url, total_found=result["total_found"],
+                 pages_crawled=result.get("pages_crawled", 1))
+    if store is not None:
+        store.close()
+    return 0 if failures < len(targets) else 1
+
+
+def parse_args(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("targets", nargs="*", help="Target; jika kosong atau '-', dibaca dari stdin.")
+    common.add_argument("--trace", metavar="FILE", help="Tulis span per tahap ke FILE (JSONL).")
+    common.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"Database temuan (default: {DEFAULT_STORE_PATH}).")
+    common.add_argument("--no-store", action="store_true", help="Jangan simpan temuan ke database.")
+
+    offline = argparse.ArgumentParser(add_help=False)
+    offline.add_argument("--offline", action="append", metavar="PATH",
+                         help="Baca dari arsip WARC/HAR atau halaman tersimpan, bukan URL live.")
+    offline.add_argument("--processes", type=int, default=None,
+                         help="Jumlah proses worker mode --offline (default: jumlah CPU).")
+
+    parser = argparse.ArgumentParser(
+        description="Titik masuk non-interaktif untuk ipFinder, hashLookup, dan parsing dengan output JSONL.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ip_find = subparsers.add_parser("ip-find", parents=[common], help="Cari kandidat origin IP domain.")
+    ip_find.add_argument("--dns-only", action="store_true",
+                         help="Hanya resolusi A/MX dan klasifikasi CDN (tanpa subfinder/httpx/Wayback).")
+    ip_find.add_argument("--nameserver", action="append", dest="nameservers", help="Nameserver (ip atau ip:port).")
+    ip_find.add_argument("--dns-concurrency", type=int, help="Kueri DNS bersamaan maksimum.")
+    ip_find.add_argument("--cdn-ranges", help="Direktori daftar prefix CDN.")
+    ip_find.add_argument("--wayback-endpoint", help="Endpoint CDX API Wayback.")
+    ip_find.add_argument("--verify-origins", action="store_true", help="Verifikasi kandidat origin (Host + SNI).")
+    ip_find.add_argument("--incremental", action="store_true", help="Lewati subdomain yang sudah tersimpan.")
+    ip_find.set_defaults(handler=cmd_ip_find)
+
+    hash_lookup = subparsers.add_parser("hash-lookup", parents=[common, offline], help="Hash aset halaman target.")
+    hash_lookup.add_argument("--workers", type=int, help="Worker pengambilan aset.")
+    hash_lookup.add_argument("--max-asset-bytes", type=int, help="Batas ukuran aset yang di-hash (byte, default 10 MB).")
+    hash_lookup.add_argument("--oversize", choices=("skip", "partial"),
+                             help="Aset melebihi batas: 'skip' dilewati, 'partial' di-hash bagian awalnya "
+                                  "(default: partial).")
+    hash_lookup.add_argument("--known-libs", action="append", metavar="DIR",
+                             help="Daftar pustaka umum tambahan. hashes.txt bawaan kosong: tanpa digest tambahan "
+                                  "hanya filter host/path yang aktif.")
+    hash_lookup.add_argument("--no-known-libs", action="store_true", help="Jangan lewati pustaka umum.")
+    hash_lookup.set_defaults(handler=cmd_hash_lookup)
+
+    parse_domains = subparsers.add_parser("parse-domains", parents=[common, offline],
+                                          help="Ekstrak domain eksternal dari halaman target.")
+    parse_domains.add_argument("--crawl", action="store_true", help="Crawl halaman di situs yang sama (BFS).")
+    parse_domains.add_argument("--max-depth", type=int)
+    parse_domains.add_argument("--max-pages", type=int)
+    parse_domains.set_defaults(handler=cmd_parse_domains)
+    args = parser.parse_args(argv)
+    if args.command == "ip-find" and args.dns_only:
+        # --dns-only tidak menjalankan httpx, Wayback, maupun probe origin
+        ignored = [flag for flag, value in (("--incremental", args.incremental),
+                                            ("--verify-origins", args.verify_origins),
+                                            ("--wayback-endpoint", args.wayback_endpoint)) if value]
+        if ignored:
+            ip_find.error(f"{', '.join(ignored)} tidak dapat dipakai bersama --dns-only")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    out = JSONLWriter(sys.stdout)
+    if args.trace:
+        from tracing import enable_tracing
+        enable_tracing(args.trace)
+    try:
+        # Semua print() alat (progres, ringkasan) ke stderr; stdout hanya berisi JSONL
+        with contextlib.redirect_stdout(sys.stderr):
+            exit_code = args.handler(args, out)
+            if args.trace:
+                from tracing import print_trace_summary
+                print_trace_summary()
+    except BrokenPipeError:
+        # Pembaca pipeline berhenti lebih awal (misalnya `head`)
+        sys.stdout = open(os.devnull, "w")
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,31 @@ import os
 import subprocess
 import requests
 import json
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from urllib.parse import urlparse
 import re # For domain sanitization regex
 
+from dnsResolver import DNSResolver, DNSError, DEFAULT_MAX_CONCURRENCY
+from waybackScanner import WaybackScanner, DEFAULT_CDX_ENDPOINT, DEFAULT_SENSITIVE_PATHS
+from cdnIndex import CDNIndex, DEFAULT_RANGES_DIR, load_cdn_index, rank_origin_candidates
+from originVerifier import OriginVerifier, format_result, DEFAULT_PER_IP_LIMIT as VERIFY_DEFAULT_PER_IP
+from originVerifier import DEFAULT_MAX_CONCURRENCY as VERIFY_DEFAULT_CONCURRENCY
+from tracing import enable_tracing, print_trace_summary, span
+from findingsStore import FindingsStore, DEFAULT_STORE_PATH
+
+# Maximum number of concurrent invocations per external tool/service in batch mode.
+DEFAULT_TOOL_LIMITS = {
+    "subfinder": 4,
+    "httpx": 4,
+    "wayback": 2,
+}
+
 def sanitize_domain(input_str: str) -> str:
     input_str = input_str.strip()
     if not input_str:
@@ -22,133 +44,380 @@ def sanitize_domain(input_str: str) -> str:
         domain = domain.split(':')[0]
     return domain
 
-def run_command(cmd_list: list[str], check_return_code: bool = True) -> str | None:
+class ToolLimiter:
+    """Bounds how many invocations of each external tool/service run at once."""
+
+    def __init__(self, limits: dict[str, int] | None = None):
+        self.limits = {**DEFAULT_TOOL_LIMITS, **(limits or {})}
+        self._semaphores = {tool: threading.BoundedSemaphore(limit) for tool, limit in self.limits.items()}
+
+    def __call__(self, tool: str):
+        return self._semaphores[tool]
+
+class PipelineContext:
+    """
+    Resources shared by every stage of a run: tool limits, the DNS resolver (with
+    its cache), the Wayback CDX scanner (with its disk cache), the CDN range index,
+    an optional `on_record(domain, record)` callback that receives httpx records
+    the moment they are parsed, and an optional findings store. With `incremental`
+    set, subdomains already in the store are not probed again; their stored IPs
+    are reused instead.
+    """
+
+    def __init__(self, limiter: ToolLimiter, resolver: DNSResolver, wayback: WaybackScanner,
+                 cdn_index: CDNIndex, on_record=None, store: FindingsStore | None = None,
+                 incremental: bool = False):
+        self.limiter = limiter
+        self.resolver = resolver
+        self.wayback = wayback
+        self.cdn_index = cdn_index
+        self.on_record = on_record
+        self.store = store
+        self.incremental = incremental and store is not None
+
+def resolve_subdomains_dns(domain: str, subdomains: list[str], ctx: PipelineContext, log=print) -> dict:
+    """
+    Resolves A records of the given subdomains in-process, writes
+    '{domain}_dns_subs.txt' and returns {subdomain: [ips]} for the subdomains that
+    resolved.
+    """
+    dns_subdomains_file = f"{domain}_dns_subs.txt"
+    log(f"\n[*] Resolusi A record {len(subdomains)} subdomain dengan resolver internal...")
+    with span("dns", domain, queries=len(subdomains)) as dns_span:
+        results = ctx.resolver.resolve_many_sync((subdomain, "A") for subdomain in subdomains)
+        dns_span.set(failures=sum(isinstance(ips, DNSError) for ips in results.values()))
+    subdomain_ips = {}
+    with open(dns_subdomains_file, "w") as out:
+        for subdomain in subdomains:
+            ips = results.get((subdomain, "A"))
+            if isinstance(ips, DNSError):
+                log(f"Gagal melakukan resolve A record untuk {subdomain}: {ips}")
+            elif ips:
+                subdomain_ips[subdomain] = ips
+                out.write(f"{subdomain} {','.join(ips)}\n")
+    log(f"{len(subdomain_ips)} subdomain memiliki A record, disimpan ke {dns_subdomains_file}")
+    return subdomain_ips
+
+def parse_httpx_record(line: str) -> dict | None:
+    """Parses one line of `httpx -json` output into a structured record."""
     try:
-        process = subprocess.run(cmd_list, capture_output=True, text=True, check=False)
-        if check_return_code and process.returncode != 0:
-            print(f"Error running command: {' '.join(cmd_list)}")
-            print(f"Return code: {process.returncode}")
-            if process.stdout.strip():
-                print(f"Stdout: {process.stdout.strip()}")
-            if process.stderr.strip():
-                print(f"Stderr: {process.stderr.strip()}")
-            return None
-        return process.stdout.strip()
-    except FileNotFoundError:
-        print(f"Error: Command '{cmd_list[0]}' not found. Please ensure it's installed and in your PATH.")
+        raw = json.loads(line)
+    except json.JSONDecodeError:
         return None
-    except Exception as e:
-        print(f"An unexpected error occurred while running {' '.join(cmd_list)}: {e}")
+    if not isinstance(raw, dict) or not raw.get("url"):
         return None
+    ips = raw.get("a") or []
+    if not ips and re.match(r"^[0-9a-fA-F:.]+$", raw.get("host", "")):
+        ips = [raw["host"]]  # Older httpx versions report the IP in "host"
+    cdn_name = raw.get("cdn_name") or ("cdn" if raw.get("cdn") else "")
+    return {
+        "url": raw["url"],
+        "input": raw.get("input", ""),
+        "ips": ips,
+        "cdn": bool(raw.get("cdn") or raw.get("cdn_name")),
+        "cdn_name": cdn_name,
+        "status_code": raw.get("status_code") or raw.get("status-code"),
+        "title": raw.get("title", ""),
+    }
 
-def main():
-    raw_domain_input = input("Masukkan domain target (contoh: example.com): ").strip()
-    domain = sanitize_domain(raw_domain_input)
+def format_httpx_record(record: dict) -> str:
+    line = f"{record['url']} [{','.join(record['ips'])}]"
+    if record["cdn_name"]:
+        line += f" [{record['cdn_name']}]"
+    return line
 
-    if not domain:
-        print("Input domain tidak valid. Keluar.")
-        return
+def _stop_process(process: subprocess.Popen | None):
+    if process is not None and process.poll() is None:
+        process.kill()
+        process.wait()
 
-    print(f"\n[*] Domain target yang disanitasi: {domain}")
+def _report_process_error(process: subprocess.Popen, stderr_file, log=print):
+    if process.returncode != 0:
+        log(f"Error running command: {' '.join(process.args)}")
+        log(f"Return code: {process.returncode}")
+        stderr_file.seek(0)
+        stderr_text = stderr_file.read().strip()
+        if stderr_text:
+            log(f"Stderr: {stderr_text[-2000:]}")
+        return False
+    return True
 
+def stream_subfinder_to_httpx(domain: str, subdomains_file: str, resolved_subdomains_file: str,
+                              ctx: PipelineContext, log=print, skip_probe: set[str] | None = None,
+                              on_enumerated=None) -> dict:
+    """
+    Pipes subfinder's stdout line by line into httpx's stdin, so probing starts with
+    the first discovered subdomain instead of after enumeration has finished.
+    Subdomains and httpx results are deduplicated on the fly, httpx JSON output is
+    parsed into records as it arrives, and both are appended to their files without
+    holding the full result set in memory. Returns a dict with the subdomain and
+    record counts plus the per-host IPs and httpx CDN flags ({ip: cdn_name}) needed
+    for origin classification. Subdomains in `skip_probe` are still written to the
+    subdomains file but are not sent to httpx. `on_enumerated()` (if given) is called
+    as soon as subfinder's output ends, while httpx may still be probing.
+    """
+    subfinder_cmd_list = ["subfinder", "-d", domain, "-silent"]
+    httpx_cmd_list = ["httpx", "-silent", "-json", "-ip", "-cdn"]
+    subfinder = httpx = None
+    skip_probe = skip_probe or set()
+    counts = {"subdomains": 0, "records": 0, "skipped": 0, "host_ips": {}, "cdn_ips": {}}
+    # Both processes run concurrently, so each gets its own span finished when it exits
+    subfinder_span = span("subfinder", domain)
+    httpx_span = span("httpx", domain)
+    stdout_bytes = {"subfinder": 0, "httpx": 0}
+
+    with tempfile.TemporaryFile(mode="w+") as subfinder_err, tempfile.TemporaryFile(mode="w+") as httpx_err:
+        try:
+            try:
+                subfinder = subprocess.Popen(subfinder_cmd_list, stdout=subprocess.PIPE, stderr=subfinder_err,
+                                             text=True, bufsize=1)
+            except FileNotFoundError:
+                subfinder_span.set(error="not found")
+                log("Error: Command 'subfinder' not found. Please ensure it's installed and in your PATH.")
+                return counts
+            try:
+                httpx = subprocess.Popen(httpx_cmd_list, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=httpx_err, text=True, bufsize=1)
+            except FileNotFoundError:
+                httpx_span.set(error="not found")
+                httpx_span.finish()
+                log("Error: Command 'httpx' not found. Please ensure it's installed and in your PATH.")
+
+            def feed_subdomains():
+                seen_subdomains = set()
+                httpx_open = httpx is not None
+                with open(subdomains_file, "w") as subs_out:
+                    for line in subfinder.stdout:
+                        stdout_bytes["subfinder"] += len(line)
+                        subdomain = line.strip().lower()
+                        if not subdomain or subdomain in seen_subdomains:
+                            continue
+                        seen_subdomains.add(subdomain)
+                        subs_out.write(subdomain + "\n")
+                        counts["subdomains"] += 1
+                        if subdomain in skip_probe:
+                            counts["skipped"] += 1
+                            continue
+                        if httpx_open:
+                            try:
+                                httpx.stdin.write(subdomain + "\n")
+                                httpx.stdin.flush()
+                            except (BrokenPipeError, ValueError):
+                                httpx_open = False  # httpx exited early; keep collecting subdomains
+                if on_enumerated is not None:
+                    on_enumerated()
+                if httpx_open:
+                    try:
+                        httpx.stdin.close()
+                    except BrokenPipeError:
+                        pass
+
+            feeder = threading.Thread(target=feed_subdomains, daemon=True)
+            feeder.start()
+
+            if httpx is not None:
+                seen_urls = set()
+                with open(resolved_subdomains_file, "w") as resolved_out:
+                    for line in httpx.stdout:
+                        stdout_bytes["httpx"] += len(line)
+                        record = parse_httpx_record(line)
+                        if record is None or record["url"] in seen_urls:
+                            continue
+                        seen_urls.add(record["url"])
+                        counts["records"] += 1
+                        host = urlparse(record["url"]).hostname or record["input"]
+                        counts["host_ips"].setdefault(host, set()).update(record["ips"])
+                        if record["cdn"]:
+                            for ip in record["ips"]:
+                                counts["cdn_ips"][ip] = record["cdn_name"]
+                        formatted = format_httpx_record(record)
+                        resolved_out.write(formatted + "\n")
+                        resolved_out.flush()
+                        log(formatted)
+                        if ctx.on_record is not None:
+                            ctx.on_record(domain, record)
+
+            feeder.join()
+            subfinder.wait()
+            subfinder_span.set(exit_code=subfinder.returncode, bytes=stdout_bytes["subfinder"],
+                               subdomains=counts["subdomains"])
+            subfinder_span.finish()
+            _report_process_error(subfinder, subfinder_err, log=log)
+            if httpx is not None:
+                httpx.wait()
+                httpx_span.set(exit_code=httpx.returncode, bytes=stdout_bytes["httpx"], records=counts["records"])
+                httpx_span.finish()
+                _report_process_error(httpx, httpx_err, log=log)
+        finally:
+            _stop_process(httpx)
+            _stop_process(subfinder)
+            subfinder_span.finish()  # No-op if already finished normally
+            httpx_span.finish()
+
+    return counts
+
+def enumerate_and_resolve_subdomains(domain: str, ctx: PipelineContext, log=print) -> dict:
+    """
+    Stage chain: subfinder | httpx (streamed), then DNS A resolution of the subdomains.
+    In incremental mode only subdomains missing from the findings store are probed
+    and resolved; known ones reuse their stored IPs. Returns {"host_ips": {host: [ips]},
+    "httpx_cdn": {ip: cdn_name}, "subdomains": [...], "probed_ips": {"httpx": ..., "dns": ...}}.
+    """
     subdomains_file = f"{domain}_subs.txt"
     resolved_subdomains_file = f"{domain}_resolved_subs.txt"
+    known_subdomains = ctx.store.known_subdomains(domain) if ctx.incremental else set()
 
-    print("\n[*] Enumerasi subdomain dengan subfinder...")
-    subfinder_cmd_list = ["subfinder", "-d", domain, "-silent", "-o", subdomains_file]
-    subfinder_result = run_command(subfinder_cmd_list)
+    log("\n[*] Enumerasi subdomain dengan subfinder, dialirkan langsung ke httpx (resolusi + cek CDN)...")
+    if known_subdomains:
+        log(f"[*] Mode inkremental: {len(known_subdomains)} subdomain yang sudah tersimpan tidak diprobe ulang.")
+    log(f"\n[*] Hasil subdomain dan IP ({resolved_subdomains_file}):")
+    # The httpx slot is taken first (in run_domains this lane is exactly as wide as
+    # the httpx limit, so it is always free) and the subfinder slot is released as
+    # soon as enumeration ends, so httpx probing (usually the longer half) is bounded
+    # only by the httpx limit and no subfinder slot is held while waiting for httpx.
+    with ctx.limiter("httpx"):
+        subfinder_slot = ctx.limiter("subfinder")
+        subfinder_slot.acquire()
+        release_lock = threading.Lock()
+        slot_held = [True]
 
-    if subfinder_result is None:
-        print(f"Perintah subfinder gagal. File '{subdomains_file}' mungkin tidak dibuat atau kosong.")
-    elif not os.path.exists(subdomains_file) or os.path.getsize(subdomains_file) == 0:
-        print(f"Subfinder berjalan, tetapi tidak menghasilkan subdomain atau file output '{subdomains_file}' kosong/tidak ditemukan.")
-    else:
-        print(f"Subdomain disimpan ke {subdomains_file}")
+        def release_subfinder_slot():
+            with release_lock:
+                if slot_held[0]:
+                    slot_held[0] = False
+                    subfinder_slot.release()
 
-    # Lanjutkan ke httpx hanya jika file subdomain ada dan tidak kosong
-    if os.path.exists(subdomains_file) and os.path.getsize(subdomains_file) > 0:
-        print("\n[*] Resolusi subdomain dan cek proteksi CDN dengan httpx...")
-        httpx_cmd_list = ["httpx", "-l", subdomains_file, "-ip", "-cdn", "-silent", "-o", resolved_subdomains_file]
-        httpx_result = run_command(httpx_cmd_list)
-        if httpx_result is None:
-            print(f"Perintah httpx gagal. File '{resolved_subdomains_file}' mungkin tidak dibuat atau kosong.")
-        elif not os.path.exists(resolved_subdomains_file) or os.path.getsize(resolved_subdomains_file) == 0:
-            print(f"Httpx berjalan, tetapi file output '{resolved_subdomains_file}' kosong atau tidak ditemukan.")
-        else:
-             print(f"Subdomain yang diresolusi disimpan ke {resolved_subdomains_file}")
-    else:
-        print(f"\n[*] Melewati httpx karena '{subdomains_file}' tidak ada atau kosong.")
-
-    print(f"\n[*] Hasil subdomain dan IP ({resolved_subdomains_file}):")
-    if os.path.exists(resolved_subdomains_file) and os.path.getsize(resolved_subdomains_file) > 0:
         try:
-            with open(resolved_subdomains_file, "r") as f:
-                print(f.read())
-        except Exception as e:
-            print(f"Gagal membaca file '{resolved_subdomains_file}': {e}")
-    else:
-        print(f"File '{resolved_subdomains_file}' tidak ditemukan atau kosong. Pastikan perintah httpx berjalan dengan benar dan menghasilkan output.")
-
-    print("\n[*] Mencari MX record...")
-    dig_mx_cmd_list = ["dig", "mx", domain, "+short"]
-    mx_output = run_command(dig_mx_cmd_list)
-
-    if mx_output:
-        print(mx_output)
-        print("\n[*] Resolving MX record ke IP...")
-        for line in mx_output.splitlines():
-            line = line.strip()
-            if not line:
-                continue
+            stream_result = stream_subfinder_to_httpx(
+                domain, subdomains_file, resolved_subdomains_file, ctx, log=log, skip_probe=known_subdomains,
+                on_enumerated=release_subfinder_slot)
+        finally:
+            release_subfinder_slot()
+
+    host_ips = {host: set(ips) for host, ips in stream_result["host_ips"].items()}
+    stage_data = {"host_ips": host_ips, "httpx_cdn": stream_result["cdn_ips"], "subdomains": [],
+                  "probed_ips": {"httpx": stream_result["host_ips"], "dns": {}}}
+    if stream_result["subdomains"] == 0:
+        log(f"Subfinder tidak menghasilkan subdomain; '{subdomains_file}' kosong atau tidak dibuat.")
+        return stage_data
+    with open(subdomains_file, "r") as f:
+        subdomains = [line.strip() for line in f if line.strip()]
+    stage_data["subdomains"] = subdomains
+    log(f"\n[+] {stream_result['subdomains']} subdomain unik disimpan ke {subdomains_file}")
+    if stream_result["records"]:
+        log(f"[+] {stream_result['records']} host hidup dari httpx disimpan ke {resolved_subdomains_file}")
+    elif not stream_result["skipped"]:
+        log(f"Httpx tidak menghasilkan output; '{resolved_subdomains_file}' kosong atau tidak ditemukan.")
+
+    if known_subdomains:
+        # Keep the resolved file complete by adding the stored IPs of hosts that were not probed
+        stored_ips = ctx.store.host_ips(domain)
+        reused = 0
+        with open(resolved_subdomains_file, "a") as resolved_out:
+            for subdomain in subdomains:
+                if subdomain in known_subdomains and stored_ips.get(subdomain):
+                    host_ips.setdefault(subdomain, set()).update(stored_ips[subdomain])
+                    resolved_out.write(f"{subdomain} [{','.join(sorted(stored_ips[subdomain]))}] (tersimpan)\n")
+                    reused += 1
+        log(f"[+] {reused} host memakai IP dari penyimpanan temuan, "
+            f"{len(subdomains) - stream_result['skipped']} subdomain baru diprobe.")
+
+    new_subdomains = [subdomain for subdomain in subdomains if subdomain not in known_subdomains]
+    if new_subdomains:
+        dns_ips = resolve_subdomains_dns(domain, new_subdomains, ctx, log=log)
+        stage_data["probed_ips"]["dns"] = dns_ips
+        for subdomain, ips in dns_ips.items():
+            host_ips.setdefault(subdomain, set()).update(ips)
+    return stage_data
+
+def lookup_mx_records(domain: str, ctx: PipelineContext, log=print) -> dict:
+    """
+    Stage chain: MX lookup -> A lookup for every MX host (batched). Independent of
+    subfinder. Returns {"mx_ips": {mx_host: [ips]}}.
+    """
+    log("\n[*] Mencari MX record...")
+    mx_ips = {}
+    with span("dns-mx", domain):
+        mx_records = ctx.resolver.resolve_many_sync([(domain, "MX")])[(domain, "MX")]
+
+    if isinstance(mx_records, DNSError):
+        log(f"Tidak ada MX record ditemukan untuk {domain} atau kueri DNS gagal: {mx_records}")
+    elif mx_records:
+        log("\n".join(mx_records))
+        log("\n[*] Resolving MX record ke IP...")
+        mx_hosts = []
+        for line in mx_records:
             parts = line.split()
             if len(parts) >= 2:  # MX records typically priority host
-                mx_host = parts[-1].strip('.') # The last part is the host
-                
-                # Resolve A records for the MX host
-                dig_a_cmd_list = ["dig", "A", mx_host, "+short"]
-                ip_output = run_command(dig_a_cmd_list)
-                if ip_output:
-                    ips = [ip.strip() for ip in ip_output.splitlines() if ip.strip()]
-                    if ips:
-                        print(f"{mx_host}: {', '.join(ips)}")
-                    else:
-                        print(f"Tidak ada A record ditemukan untuk MX host: {mx_host}")
-                else:
-                    print(f"Gagal melakukan resolve A record untuk MX host: {mx_host} (perintah dig gagal)")
+                mx_hosts.append(parts[-1].strip('.')) # The last part is the host
             else:
-                print(f"Tidak dapat mem-parsing baris MX record: {line}")
+                log(f"Tidak dapat mem-parsing baris MX record: {line}")
+
+        # Resolve A records for all MX hosts in one concurrent batch
+        with span("dns", domain, queries=len(mx_hosts)):
+            ip_results = ctx.resolver.resolve_many_sync((mx_host, "A") for mx_host in mx_hosts)
+        for mx_host in mx_hosts:
+            ips = ip_results[(mx_host, "A")]
+            if isinstance(ips, DNSError):
+                log(f"Gagal melakukan resolve A record untuk MX host: {mx_host} ({ips})")
+            elif ips:
+                mx_ips[mx_host] = ips
+                log(f"{mx_host}: {', '.join(ips)}")
+            else:
+                log(f"Tidak ada A record ditemukan untuk MX host: {mx_host}")
     else:
-        print(f"Tidak ada MX record ditemukan untuk {domain} atau perintah dig gagal.")
+        log(f"Tidak ada MX record ditemukan untuk {domain}.")
+    return {"mx_ips": mx_ips}
 
-    print("\n[*] Cek Wayback Machine untuk /.env leak...")
-    wayback_url = f"http://web.archive.org/cdx/search/cdx?url={domain}/.env&output=json&fl=timestamp,original,mimetype,statuscode,digest,length&showDupeCount=true&collapse=digest"
-    try:
-        res = requests.get(wayback_url, timeout=15)
-        res.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-        results = res.json()
-        if results and len(results) > 1:  # Header row + data rows
-            header = results[0]
-            print(f"Hasil Wayback Machine untuk {domain}/.env (Fields: {', '.join(header)}):")
-            for entry_list in results[1:]:
-                entry_dict = dict(zip(header, entry_list))
-                print(f"  - {entry_dict}")
-        elif results and len(results) == 1: # Only header returned
-             print(f"Tidak ada entri Wayback Machine yang ditemukan untuk {domain}/.env (hanya header yang dikembalikan).")
-        else:
-            print(f"Tidak ada entri Wayback Machine yang ditemukan untuk {domain}/.env.")
-    except requests.exceptions.HTTPError as e:
-        print(f"Permintaan Wayback Machine gagal untuk {domain}/.env. Status: {e.response.status_code}")
-    except requests.exceptions.RequestException as e:
-        print(f"Error saat mengakses Wayback Machine untuk {domain}/.env: {e}")
-    except json.JSONDecodeError:
-        print(f"Error saat men-decode respons JSON dari Wayback Machine untuk {domain}/.env.")
-        if 'res' in locals() and hasattr(res, 'text'):
-             print(f"Response text (awal): {res.text[:200]}...")
+def check_wayback(domain: str, ctx: PipelineContext, log=print) -> dict:
+    """
+    Stage: paginated Wayback Machine CDX scan of sensitive paths. Independent of
+    subfinder. Returns {"wayback_results": {path: entries}}.
+    """
+    log(f"\n[*] Cek Wayback Machine untuk {len(ctx.wayback.paths)} path sensitif "
+        f"({', '.join(ctx.wayback.paths)})...")
+    with ctx.limiter("wayback"):
+        results = ctx.wayback.scan(domain)
 
+    total_entries = 0
+    for path, entries in results.items():
+        if isinstance(entries, requests.exceptions.HTTPError) and entries.response is not None:
+            log(f"Permintaan Wayback Machine gagal untuk {domain}/{path}. Status: {entries.response.status_code}")
+        elif isinstance(entries, Exception):
+            log(f"Error saat mengakses Wayback Machine untuk {domain}/{path}: {entries}")
+        elif entries:
+            total_entries += len(entries)
+            log(f"Hasil Wayback Machine untuk {domain}/{path}* ({len(entries)} entri):")
+            for entry_dict in entries:
+                log(f"  - {entry_dict}")
+    if total_entries == 0:
+        log(f"Tidak ada entri Wayback Machine yang ditemukan untuk path sensitif di {domain}.")
+    return {"wayback_results": results}
 
-    print("\n[*] Silakan buka URL ini secara manual untuk investigasi lebih lanjut:")
-    print(f"  - DNS History: https://securitytrails.com/domain/{domain}/history")
-    print(f"  - Certificate Transparency: https://crt.sh/?q=%25.{domain}")
+def record_findings(domain: str, stage_data: dict, ctx: PipelineContext, log=print):
+    """
+    Saves a finished domain's subdomains, probed host IPs, MX hosts and Wayback hits
+    into the findings store, and reports what is new since the previous scan.
+    """
+    store = ctx.store
+    new_subdomains = store.record_subdomains(domain, stage_data.get("subdomains", []))
+    for source, host_ips in stage_data.get("probed_ips", {}).items():
+        store.record_host_ips(domain, host_ips, source)
+    store.record_mx_hosts(domain, stage_data.get("mx_ips", {}))
+    new_wayback_hits = store.record_wayback_hits(domain, stage_data.get("wayback_results", {}))
+    log(f"\n[*] Temuan disimpan ke {store.path}: {len(new_subdomains)} subdomain baru, "
+        f"{new_wayback_hits} entri Wayback baru sejak pemindaian sebelumnya.")
+    for subdomain in sorted(new_subdomains)[:50]:
+        log(f"  [+] Subdomain baru: {subdomain}")
+
+def report_summary(domain: str, log=print):
+    subdomains_file = f"{domain}_subs.txt"
+    resolved_subdomains_file = f"{domain}_resolved_subs.txt"
+    origin_candidates_file = f"{domain}_origin_candidates.txt"
+
+    log("\n[*] Silakan buka URL ini secara manual untuk investigasi lebih lanjut:")
+    log(f"  - DNS History: https://securitytrails.com/domain/{domain}/history")
+    log(f"  - Certificate Transparency: https://crt.sh/?q=%25.{domain}")
 
     # Determine which files were successfully created and are non-empty for the final message
     created_file_descriptions = []
@@ -158,16 +427,345 @@ def main():
     if os.path.exists(resolved_subdomains_file) and os.path.getsize(resolved_subdomains_file) > 0:
         created_file_descriptions.append(f"'{resolved_subdomains_file}' (resolved IPs)")
 
+    if os.path.exists(origin_candidates_file) and os.path.getsize(origin_candidates_file) > 0:
+        created_file_descriptions.append(f"'{origin_candidates_file}' (origin candidates)")
+
     if created_file_descriptions:
         files_summary = ""
         if len(created_file_descriptions) == 1:
             files_summary = created_file_descriptions[0]
-        elif len(created_file_descriptions) == 2:
-            files_summary = f"{created_file_descriptions[0]} dan {created_file_descriptions[1]}"
-        print(f"\n[✓] Selesai. Analisis hasil di {files_summary}.")
+        else:
+            files_summary = f"{', '.join(created_file_descriptions[:-1])} dan {created_file_descriptions[-1]}"
+        log(f"\n[✓] Selesai. Analisis hasil di {files_summary}.")
     else:
-        print(f"\n[!] Selesai, tetapi tidak ada file output yang berhasil dibuat atau berisi data.")
-        print(f"  Harap periksa log di atas untuk detail mengapa '{subdomains_file}' atau '{resolved_subdomains_file}' mungkin tidak dibuat atau ditemukan kosong.")
+        log(f"\n[!] Selesai, tetapi tidak ada file output yang berhasil dibuat atau berisi data.")
+        log(f"  Harap periksa log di atas untuk detail mengapa '{subdomains_file}' atau '{resolved_subdomains_file}' mungkin tidak dibuat atau ditemukan kosong.")
+
+# Independent stage chains per domain; they are scheduled concurrently and their
+# buffered output is reported in this order once the whole domain is done.
+DOMAIN_STAGES = [
+    ("subdomains", enumerate_and_resolve_subdomains),
+    ("mx", lookup_mx_records),
+    ("wayback", check_wayback),
+]
+
+# MX lookups only use the shared asyncio resolver, which bounds its own queries.
+MX_STAGE_WORKERS = 4
+
+def stage_pool_sizes(limiter: ToolLimiter) -> dict[str, int]:
+    """
+    Worker threads per stage, one pool each, so a stage waiting for a tool slot
+    never occupies a thread that another stage could run on. The subdomain chain
+    holds an httpx slot for its whole run (subfinder only until enumeration ends),
+    so its pool is as wide as the httpx limit and its threads only ever wait on
+    subfinder.
+    """
+    return {"subdomains": limiter.limits["httpx"], "mx": MX_STAGE_WORKERS, "wayback": limiter.limits["wayback"]}
+
+def run_stage(stage_func, domain: str, ctx: PipelineContext) -> tuple[list[str], bool, dict]:
+    """
+    Runs one stage chain with buffered output and returns (lines, ok, data), where
+    data is whatever structured result the stage returned. Failures are logged,
+    never raised.
+    """
+    lines = []
+    try:
+        data = stage_func(domain, ctx, log=lines.append)
+        return lines, True, data or {}
+    except Exception as e:
+        lines.append(f"[!] Tahap {stage_func.__name__} gagal untuk {domain}: {e}")
+        return lines, False, {}
+
+def run_domain_step(step_func, domain: str, *args, log=print):
+    """
+    Runs one post-processing step of a finished domain (storing, classification,
+    callbacks) and returns (ok, result). Like run_stage, failures are logged, never
+    raised, so one domain cannot abort the rest of the batch.
+    """
+    try:
+        return True, step_func(*args)
+    except Exception as e:
+        log(f"[!] Langkah {getattr(step_func, '__name__', 'pascaproses')} gagal untuk {domain}: {e}")
+        return False, None
+
+def classify_origin_candidates(domain: str, stage_data: dict, ctx: PipelineContext, log=print) -> dict:
+    """
+    Classifies every resolved subdomain and MX IP as CDN or non-CDN using the CDN
+    range index, logs the ranked origin candidates (IP -> subdomains) and writes
+    them to '{domain}_origin_candidates.txt'.
+    """
+    origin_candidates_file = f"{domain}_origin_candidates.txt"
+    ranking = rank_origin_candidates(stage_data.get("host_ips", {}), stage_data.get("mx_ips", {}),
+                                     ctx.cdn_index, stage_data.get("httpx_cdn"))
+
+    log("\n[*] Klasifikasi IP (rentang CDN) dan kandidat origin IP:")
+    provider_counts = {}
+    for provider in ranking["cdn"].values():
+        provider_counts[provider] = provider_counts.get(provider, 0) + 1
+    if provider_counts:
+        log("IP di belakang CDN: " + ", ".join(f"{provider}={count}" for provider, count in sorted(provider_counts.items())))
+    if ranking["non_public"]:
+        log(f"IP privat/reserved diabaikan: {', '.join(ranking['non_public'])}")
+
+    if not ranking["candidates"]:
+        log("Tidak ada kandidat origin IP (semua IP berada di rentang CDN atau tidak ada IP yang teresolusi).")
+        return ranking
+
+    with open(origin_candidates_file, "w") as out:
+        for rank, candidate in enumerate(ranking["candidates"], start=1):
+            line = f"{rank}. {candidate['ip']} (skor {candidate['score']})"
+            if candidate["subdomains"]:
+                line += f" subdomain: {', '.join(candidate['subdomains'])}"
+            if candidate["mx_hosts"]:
+                line += f" MX: {', '.join(candidate['mx_hosts'])}"
+            out.write(line + "\n")
+            log(line)
+    log(f"Kandidat origin IP disimpan ke {origin_candidates_file}")
+    return ranking
+
+def origin_probe_pairs(domain: str, ranking: dict) -> list[tuple[str, str]]:
+    """
+    Builds the (ip, hostname) pairs to verify for one domain: every candidate IP with
+    each subdomain that resolved to it, or with the apex domain for MX-only IPs.
+    """
+    pairs = []
+    for candidate in ranking.get("candidates", []):
+        for hostname in candidate["subdomains"] or [domain]:
+            pairs.append((candidate["ip"], hostname))
+    return pairs
+
+def verify_origin_candidates(pairs_by_domain: dict[str, list[tuple[str, str]]],
+                             verifier: OriginVerifier, log=print) -> list[dict]:
+    """
+    Verifies the origin candidates of all domains in one async batch, so the global
+    and per-IP limits of `verifier` apply to the whole run. Confirmed and similar
+    responses are logged per domain and every result is written to
+    '{domain}_origin_verified.txt'.
+    """
+    all_pairs = [pair for pairs in pairs_by_domain.values() for pair in pairs]
+    if not all_pairs:
+        return []
+    log(f"\n[*] Memverifikasi {len(all_pairs)} pasangan kandidat origin IP x hostname (Host header + SNI)...")
+    with span("origin-verify", f"{len(all_pairs)} pasangan", pairs=len(all_pairs)) as verify_span:
+        results = verifier.verify_sync(all_pairs)
+        verify_span.set(errors=verifier.stats["errors"])
+
+    for domain, pairs in pairs_by_domain.items():
+        if not pairs:
+            continue
+        wanted = set(pairs)
+        domain_results = [result for result in results if (result["ip"], result["hostname"]) in wanted]
+        origin_verified_file = f"{domain}_origin_verified.txt"
+        with open(origin_verified_file, "w") as out:
+            for result in domain_results:
+                out.write(format_result(result) + "\n")
+        confirmed = [result for result in domain_results if result["verdict"] in ("exact", "match", "similar")]
+        log(f"\n[*] Verifikasi origin untuk {domain}: {len(confirmed)} dari {len(domain_results)} probe cocok dengan halaman CDN.")
+        for result in confirmed:
+            log(f"  [+] {format_result(result)}")
+        log(f"Hasil verifikasi origin disimpan ke {origin_verified_file}")
+    return results
+
+def run_domains(domains: list[str], tool_limits: dict[str, int] | None = None,
+                resolver: DNSResolver | None = None, wayback: WaybackScanner | None = None,
+                cdn_index: CDNIndex | None = None, on_record=None, verifier: OriginVerifier | None = None,
+                store: FindingsStore | None = None, incremental: bool = False, on_domain=None,
+                log=print) -> dict:
+    """
+    Processes every domain, running independent stages (subfinder->httpx, MX, Wayback)
+    concurrently within a domain and across domains. Each external tool is bounded
+    by its own limit, and one DNS resolver (and its TTL cache) is shared by all
+    domains. A domain's output is printed as one block as soon as all of its stages
+    are done, followed by the CDN/origin classification of all IPs found; `on_record`
+    (if given) sees httpx results live. With a `verifier`, origin candidates of all
+    domains are probed with the target Host header once the batch is done. With a
+    `store`, each domain's findings are saved as it completes; `incremental` also
+    skips httpx/DNS for subdomains already stored and reuses their stored IPs.
+    `on_domain(domain, stage_data, ranking)` (if given) sees each finished domain's
+    stage results and origin ranking. Returns batch statistics, including the
+    verification results under "origin_verified".
+    """
+    limiter = ToolLimiter(tool_limits)
+    ctx = PipelineContext(limiter, resolver or DNSResolver(), wayback or WaybackScanner(),
+                          cdn_index or load_cdn_index(), on_record, store, incremental)
+    stats = {"domains": len(domains), "stage_failures": 0, "elapsed": 0.0}
+    pending = {domain: len(DOMAIN_STAGES) for domain in domains}
+    outputs = {domain: {} for domain in domains}
+    stage_data = {domain: {} for domain in domains}
+    probe_pairs = {}
+    batch_start = time.perf_counter()
+
+    with ExitStack() as pools:
+        executors = {stage_name: pools.enter_context(ThreadPoolExecutor(max_workers=workers))
+                     for stage_name, workers in stage_pool_sizes(limiter).items()}
+        futures = {}
+        for domain in domains:
+            for stage_name, stage_func in DOMAIN_STAGES:
+                future = executors[stage_name].submit(run_stage, stage_func, domain, ctx)
+                futures[future] = (domain, stage_name)
+
+        for future in as_completed(futures):
+            # Drop the finished future so its buffered lines can be freed with the domain
+            domain, stage_name = futures.pop(future)
+            lines, ok, data = future.result()
+            outputs[domain][stage_name] = lines
+            stage_data[domain].update(data)
+            if not ok:
+                stats["stage_failures"] += 1
+            pending[domain] -= 1
+            if pending[domain] == 0:
+                log(f"\n========== {domain} ==========")
+                for name, _ in DOMAIN_STAGES:
+                    for line in outputs[domain][name]:
+                        log(line)
+                steps_ok = []
+                if store is not None:
+                    steps_ok.append(run_domain_step(record_findings, domain, domain, stage_data[domain],
+                                                    ctx, log, log=log)[0])
+                ok, ranking = run_domain_step(classify_origin_candidates, domain, domain, stage_data[domain],
+                                              ctx, log, log=log)
+                steps_ok.append(ok)
+                if ranking is not None:
+                    if on_domain is not None:
+                        steps_ok.append(run_domain_step(on_domain, domain, domain, stage_data[domain],
+                                                        ranking, log=log)[0])
+                    if verifier is not None:
+                        probe_pairs[domain] = origin_probe_pairs(domain, ranking)
+                steps_ok.append(run_domain_step(report_summary, domain, domain, log, log=log)[0])
+                stats["stage_failures"] += steps_ok.count(False)
+                del outputs[domain]
+                del stage_data[domain]
+
+    if verifier is not None:
+        stats["origin_verified"] = verify_origin_candidates(probe_pairs, verifier, log=log)
+        stats["origin_verify"] = dict(verifier.stats)
+
+    stats["elapsed"] = time.perf_counter() - batch_start
+    stats["dns"] = dict(ctx.resolver.stats)
+    stats["wayback"] = dict(ctx.wayback.stats)
+    stats["http_hosts"] = ctx.wayback.session.format_host_stats()
+    return stats
+
+def read_domain_list(path: str) -> list[str]:
+    """Reads domains (one per line, '#' comments allowed) from a file or '-' for stdin."""
+    handle = sys.stdin if path == "-" else open(path, "r")
+    try:
+        domains = []
+        seen = set()
+        for raw_line in handle:
+            raw_line = raw_line.split("#", 1)[0].strip()
+            domain = sanitize_domain(raw_line) if raw_line else ""
+            if domain and domain not in seen:
+                seen.add(domain)
+                domains.append(domain)
+        return domains
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Enumerasi subdomain, MX, dan Wayback untuk satu atau banyak domain.")
+    parser.add_argument("-l", "--list", dest="domain_list",
+                        help="File berisi daftar domain (satu per baris, '-' untuk stdin). Mengaktifkan mode batch non-interaktif.")
+    for tool, limit in DEFAULT_TOOL_LIMITS.items():
+        parser.add_argument(f"--{tool}-workers", type=int, default=limit,
+                            help=f"Jumlah maksimum proses {tool} bersamaan (default: {limit}).")
+    parser.add_argument("--nameserver", action="append", dest="nameservers",
+                        help="Nameserver untuk resolver DNS internal (ip atau ip:port, bisa diulang). Default: /etc/resolv.conf.")
+    parser.add_argument("--dns-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f"Jumlah maksimum kueri DNS bersamaan per batch (default: {DEFAULT_MAX_CONCURRENCY}).")
+    parser.add_argument("--wayback-endpoint", default=DEFAULT_CDX_ENDPOINT,
+                        help=f"Endpoint CDX API (default: {DEFAULT_CDX_ENDPOINT}).")
+    parser.add_argument("--wayback-path", action="append", dest="wayback_paths",
+                        help="Path sensitif untuk dicek di Wayback (prefix, bisa diulang). "
+                             f"Default: {', '.join(DEFAULT_SENSITIVE_PATHS)}.")
+    parser.add_argument("--cdn-ranges", default=DEFAULT_RANGES_DIR,
+                        help="Direktori daftar prefix CDN (<provider>.txt, ip-ranges.json AWS). "
+                             f"Default: {DEFAULT_RANGES_DIR}.")
+    parser.add_argument("--verify-origins", action="store_true",
+                        help="Verifikasi kandidat origin IP dengan mengirim permintaan HTTPS/HTTP ke IP "
+                             "memakai header Host dan SNI hostname target, lalu membandingkannya dengan halaman CDN.")
+    parser.add_argument("--verify-concurrency", type=int, default=VERIFY_DEFAULT_CONCURRENCY,
+                        help=f"Jumlah maksimum probe origin bersamaan (default: {VERIFY_DEFAULT_CONCURRENCY}).")
+    parser.add_argument("--verify-per-ip", type=int, default=VERIFY_DEFAULT_PER_IP,
+                        help=f"Jumlah maksimum probe bersamaan per IP (default: {VERIFY_DEFAULT_PER_IP}).")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Aktifkan tracing per tahap: span ditulis ke FILE (JSONL) dan ringkasan "
+                             "tahap/host terlambat dicetak di akhir.")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH,
+                        help=f"Database SQLite untuk menyimpan temuan antar pemindaian (default: {DEFAULT_STORE_PATH}).")
+    parser.add_argument("--no-store", action="store_true", help="Jangan simpan temuan ke database.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Lewati httpx/DNS untuk subdomain yang sudah tersimpan dan pakai IP tersimpannya; "
+                             "hanya subdomain baru yang diperiksa.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.trace:
+        enable_tracing(args.trace)
+    tool_limits = {tool: max(1, getattr(args, f"{tool}_workers")) for tool in DEFAULT_TOOL_LIMITS}
+    resolver = DNSResolver(args.nameservers, max_concurrency=max(1, args.dns_concurrency))
+    wayback = WaybackScanner(args.wayback_endpoint, args.wayback_paths)
+    cdn_index = load_cdn_index(args.cdn_ranges)
+    verifier = None
+    if args.verify_origins:
+        verifier = OriginVerifier(max_concurrency=max(1, args.verify_concurrency),
+                                  per_ip_limit=max(1, args.verify_per_ip))
+    store = None if args.no_store else FindingsStore(args.store)
+    if args.incremental and store is None:
+        print("[-] --incremental membutuhkan database temuan; diabaikan karena --no-store.")
+
+    try:
+        if args.domain_list:
+            try:
+                domains = read_domain_list(args.domain_list)
+            except OSError as e:
+                print(f"Gagal membaca daftar domain '{args.domain_list}': {e}")
+                return
+            if not domains:
+                print("Daftar domain kosong atau tidak valid. Keluar.")
+                return
+            print(f"[*] Mode batch: {len(domains)} domain, batas worker per alat: {tool_limits}")
+            stats = run_domains(domains, tool_limits, resolver, wayback, cdn_index, verifier=verifier,
+                                store=store, incremental=args.incremental)
+            print(f"\n[✓] Batch selesai: {stats['domains']} domain dalam {stats['elapsed']:.1f} detik "
+                  f"({stats['domains'] / stats['elapsed'] if stats['elapsed'] else 0:.2f} domain/detik), "
+                  f"{stats['stage_failures']} tahap gagal.")
+            print(f"[*] Statistik DNS: {stats['dns']['queries']} kueri, {stats['dns']['cache_hits']} cache hit, "
+                  f"{stats['dns']['failures']} gagal.")
+            print(f"[*] Statistik Wayback: {stats['wayback']['requests']} permintaan, "
+                  f"{stats['wayback']['cache_hits']} cache hit, {stats['wayback']['retries']} percobaan ulang.")
+            for line in stats["http_hosts"]:
+                print(f"  - {line}")
+            if "origin_verify" in stats:
+                print(f"[*] Statistik verifikasi origin: {stats['origin_verify']['requests']} permintaan, "
+                      f"{stats['origin_verify']['errors']} gagal, koneksi dipakai ulang "
+                      f"{stats['origin_verify']['connections_reused']}.")
+            print_trace_summary()
+            return
+
+        raw_domain_input = input("Masukkan domain target (contoh: example.com): ").strip()
+        domain = sanitize_domain(raw_domain_input)
+
+        if not domain:
+            print("Input domain tidak valid. Keluar.")
+            return
+
+        print(f"\n[*] Domain target yang disanitasi: {domain}")
+        print("[*] Menjalankan subfinder/httpx, pencarian MX, dan cek Wayback secara paralel...")
+        print_lock = threading.Lock()
+
+        def print_live_record(_, record):
+            with print_lock:
+                print(f"  [+] {format_httpx_record(record)}")
+
+        run_domains([domain], tool_limits, resolver, wayback, cdn_index, on_record=print_live_record,
+                    verifier=verifier, store=store, incremental=args.incremental)
+        print_trace_summary()
+    finally:
+        if store is not None:
+            store.close()
 
 if __name__ == "__main__":
     main()
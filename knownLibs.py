@@ -0,0 +1,190 @@
+import argparse
+import hashlib
+import os
+import re
+import threading
+from urllib.parse import urlparse
+
+# Filter pustaka pihak ketiga yang umum (jQuery, Bootstrap, Google Fonts, skrip
+# analitik, ...). Hash file seperti ini sama di ribuan situs sehingga tidak berguna
+# untuk menemukan origin, dan mengunduhnya menghabiskan sebagian besar bandwidth
+# hashLookup. URL dicocokkan sebelum diunduh (host dan nama file pustaka yang persis,
+# agar file milik situs target tidak ikut terlewati), hash dicocokkan setelah
+# di-hash (untuk salinan pustaka yang di-host sendiri dengan nama lain). Daftar digest
+# bawaan kosong, jadi pencocokan hash hanya aktif setelah pengguna menambah digest.
+
+DEFAULT_KNOWN_LIBS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "known_libs")
+HOSTS_FILE = "hosts.txt"
+PATHS_FILE = "paths.txt"
+HASHES_FILE = "hashes.txt"
+# Panjang hex digest yang dikenali: MD5, SHA1, SHA256
+HASH_HEX_LENGTHS = (32, 40, 64)
+
+
+def _read_entries(path: str):
+    """Baris tanpa komentar (`#`) dan spasi; baris kosong dilewati."""
+    with open(path, "r") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                yield line
+
+
+class KnownLibraryFilter:
+    """
+    Himpunan host, pola path, dan digest pustaka umum.
+
+    Host dicocokkan beserta semua subdomainnya (`googletagmanager.com` juga
+    mencakup `www.googletagmanager.com`) dengan beberapa lookup set per URL. Pola
+    path digabung menjadi satu regex. Digest disimpan sebagai bytes mentah
+    (bukan hex) agar ringkas, dan lookup-nya O(1). Penghitung lewat/buang aman
+    diperbarui dari beberapa thread.
+    """
+
+    def __init__(self):
+        self.hosts = set()
+        self.path_patterns = []
+        self.digests = set()
+        self._path_regex = None
+        self._lock = threading.Lock()
+        self.skip_counts = {}
+        self.stats = {"urls_skipped": 0, "hashes_dropped": 0}
+
+    def __len__(self):
+        return len(self.hosts) + len(self.path_patterns) + len(self.digests)
+
+    def add_host(self, host: str):
+        self.hosts.add(host.strip().lower().lstrip("*.").rstrip("."))
+
+    def add_path_pattern(self, pattern: str):
+        re.compile(pattern)  # Validasi lebih awal agar baris yang salah mudah ditemukan
+        self.path_patterns.append(pattern)
+        self._path_regex = None
+
+    def add_hash(self, value: str):
+        value = value.strip().lower()
+        if len(value) not in HASH_HEX_LENGTHS:
+            raise ValueError(f"bukan digest MD5/SHA1/SHA256: {value!r}")
+        self.digests.add(bytes.fromhex(value))
+
+    def load_dir(self, path: str):
+        """Memuat `hosts.txt`, `paths.txt`, dan `hashes.txt` dari direktori (yang ada saja)."""
+        for name, add in ((HOSTS_FILE, self.add_host), (PATHS_FILE, self.add_path_pattern),
+                          (HASHES_FILE, self.add_hash)):
+            file_path = os.path.join(path, name)
+            if os.path.isfile(file_path):
+                for entry in _read_entries(file_path):
+                    add(entry.split()[0] if add is self.add_hash else entry)
+        return self
+
+    def _compiled_paths(self):
+        if self._path_regex is None and self.path_patterns:
+            self._path_regex = re.compile("|".join(f"(?:{pattern})" for pattern in self.path_patterns),
+                                          re.IGNORECASE)
+        return self._path_regex
+
+    def _count(self, reason: str, label: str):
+        with self._lock:
+            self.stats["urls_skipped" if reason != "hash" else "hashes_dropped"] += 1
+            key = f"{reason}:{label}"
+            self.skip_counts[key] = self.skip_counts.get(key, 0) + 1
+
+    def match_url(self, url: str) -> str | None:
+        """
+        Mengembalikan alasan ("host:<host>" atau "path:<nama file>") jika URL adalah
+        pustaka umum, atau None. Setiap kecocokan dihitung di `stats`.
+        """
+        parsed = urlparse(url)
+        host = (parsed.hostname or "").lower()
+        labels = host.split(".")
+        for position in range(len(labels) - 1):
+            suffix = ".".join(labels[position:])
+            if suffix in self.hosts:
+                self._count("host", suffix)
+                return f"host:{suffix}"
+        regex = self._compiled_paths()
+        if regex is not None and regex.search(parsed.path):
+            name = parsed.path.rsplit("/", 1)[-1] or parsed.path
+            self._count("path", name)
+            return f"path:{name}"
+        return None
+
+    def match_hashes(self, asset: dict) -> bool:
+        """True jika salah satu hash lengkap aset (MD5/SHA1/SHA256) ada di daftar digest."""
+        if not self.digests or asset.get("hash_status", "full") != "full":
+            return False
+        for key in ("sha1", "md5", "sha256"):
+            value = asset.get(key)
+            if value and bytes.fromhex(value) in self.digests:
+                self._count("hash", urlparse(asset.get("asset_url", "")).path.rsplit("/", 1)[-1])
+                return True
+        return False
+
+    def summary(self, limit: int = 5) -> str:
+        with self._lock:
+            stats = dict(self.stats)
+            top = sorted(self.skip_counts.items(), key=lambda item: -item[1])[:limit]
+        line = (f"{stats['urls_skipped']} URL dilewati sebelum diunduh, "
+                f"{stats['hashes_dropped']} aset dibuang karena hash dikenal")
+        if top:
+            line += " (terbanyak: " + ", ".join(f"{key} x{count}" for key, count in top) + ")"
+        if not self.digests:
+            line += "; pencocokan hash nonaktif (0 digest)"
+        return line
+
+
+def load_known_libs(paths=None) -> KnownLibraryFilter:
+    """
+    Memuat daftar bawaan `known_libs/` lalu setiap direktori tambahan di `paths`
+    (struktur file yang sama), sehingga pengguna bisa memperluas filter tanpa
+    mengubah daftar bawaan.
+    """
+    known_libs = KnownLibraryFilter()
+    for path in [DEFAULT_KNOWN_LIBS_DIR, *(paths or [])]:
+        if os.path.isdir(path):
+            known_libs.load_dir(path)
+    return known_libs
+
+
+def hash_files(paths: list[str]) -> list[str]:
+    """Baris `hashes.txt` (SHA1 dan SHA256 per file) untuk salinan lokal pustaka yang diketahui."""
+    lines = []
+    for path in paths:
+        sha1, sha256 = hashlib.sha1(), hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                sha1.update(chunk)
+                sha256.update(chunk)
+        name = os.path.basename(path)
+        lines.append(f"{sha1.hexdigest()}  # {name}")
+        lines.append(f"{sha256.hexdigest()}  # {name}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kelola dan uji filter pustaka umum hashLookup.")
+    parser.add_argument("--known-libs", action="append", metavar="DIR",
+                        help="Direktori daftar tambahan (hosts.txt, paths.txt, hashes.txt).")
+    parser.add_argument("--check", action="append", metavar="URL", help="Uji apakah URL akan dilewati.")
+    parser.add_argument("--hash-files", nargs="+", metavar="FILE",
+                        help="Hitung digest file pustaka lokal dan tambahkan ke --output.")
+    parser.add_argument("--output", default=os.path.join(DEFAULT_KNOWN_LIBS_DIR, HASHES_FILE),
+                        help="File hashes.txt tujuan untuk --hash-files.")
+    args = parser.parse_args(argv)
+
+    if args.hash_files:
+        lines = hash_files(args.hash_files)
+        with open(args.output, "a") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"[+] {len(lines)} digest ditambahkan ke {args.output}")
+
+    known_libs = load_known_libs(args.known_libs)
+    print(f"[*] Filter pustaka umum: {len(known_libs.hosts)} host, {len(known_libs.path_patterns)} pola path, "
+          f"{len(known_libs.digests)} digest.")
+    for url in args.check or []:
+        reason = known_libs.match_url(url)
+        print(f"  {'[-] dilewati (' + reason + ')' if reason else '[+] diunduh'}: {url}")
+
+
+if __name__ == "__main__":
+    main()
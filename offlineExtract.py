@@ -0,0 +1,652 @@
+import argparse
+import base64
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+from hashLookup import HASH_CHUNK_SIZE, is_favicon_candidate, mmh3
+from htmlExtract import extract_links
+from knownLibs import KnownLibraryFilter, load_known_libs
+from parsing import domains_from_urls
+
+# Mode offline untuk logika ekstraksi parsing.py dan hashLookup.py: rekaman dibaca
+# dari arsip WARC (.warc / .warc.gz), HAR, atau direktori halaman tersimpan, bukan
+# diambil langsung dari internet. Proses utama hanya memindai batas rekaman lewat
+# mmap (pencarian byte di C, tanpa menyalin body); parsing HTML dan hashing
+# dikerjakan pool proses yang membuka mmap file yang sama, sehingga body tidak
+# pernah dikirim antar proses kecuali untuk .warc.gz. Jumlah batch yang sedang
+# diproses dibatasi agar memori tetap kecil berapa pun ukuran arsipnya.
+
+DEFAULT_BATCH_SIZE = 64            # Rekaman per tugas pool proses
+DEFAULT_BATCH_BYTES = 16 * 1024 * 1024  # Batas body inline (.warc.gz) per tugas
+# Batas body yang harus disalin ke memori (rekaman .warc.gz, body chunked/gzip/deflate
+# setelah didekode, entri HAR, halaman HTML); yang lebih besar dilewati sebagai error
+DEFAULT_MAX_RECORD_BYTES = 64 * 1024 * 1024
+GZIP_READ_SIZE = 1024 * 1024
+HTML_EXTENSIONS = (".html", ".htm", ".xhtml")
+MODES = ("all", "domains", "assets")
+
+# Penanda "Save Page As" browser: <!-- saved from url=(0023)https://example.com/ -->
+SAVED_FROM_PATTERN = re.compile(rb"<!--\s*saved from url=\(\d+\)(\S+?)\s*-->", re.IGNORECASE)
+_JSON_TOKEN = re.compile(rb'[{}\[\]"]')
+_JSON_STRING_END = re.compile(rb'["\\]')
+_JSON_SEPARATORS = re.compile(rb"[\s,]*")
+_JSON_COLON = re.compile(rb"\s*:\s*")
+_JSON_SCALAR = re.compile(rb"[^\s,\]}]+")
+_CRLF = re.compile(rb"\r\n")
+
+
+# --- Pemindaian rekaman (proses utama) ---
+
+def _parse_header_block(block: bytes) -> tuple[str, dict]:
+    """Baris pertama dan header (nama huruf kecil) dari blok header WARC/HTTP."""
+    lines = bytes(block).decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+
+def _warc_records(buf, pos: int, end: int):
+    """
+    Memindai rekaman WARC lengkap di `buf[pos:end]`. Menghasilkan (info, posisi
+    berikutnya); info None untuk rekaman yang bukan response/resource. Berhenti jika
+    rekaman berikutnya belum lengkap (untuk buffer .warc.gz yang bergulir).
+    """
+    while True:
+        start = buf.find(b"WARC/", pos, end)
+        if start < 0:
+            return
+        header_end = buf.find(b"\r\n\r\n", start, end)
+        if header_end < 0:
+            return
+        _, headers = _parse_header_block(buf[start:header_end])
+        block_start = header_end + 4
+        block_end = block_start + int(headers.get("content-length", "0") or 0)
+        if block_end > end:
+            return
+        info = None
+        record_type = headers.get("warc-type", "")
+        url = headers.get("warc-target-uri", "").strip("<>")
+        if record_type == "response" and headers.get("content-type", "").startswith("application/http"):
+            http_end = buf.find(b"\r\n\r\n", block_start, block_end)
+            if http_end >= 0:
+                status_line, http_headers = _parse_header_block(buf[block_start:http_end])
+                parts = status_line.split(" ", 2)
+                info = {
+                    "url": url,
+                    "status": int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0,
+                    "content_type": http_headers.get("content-type", ""),
+                    "transfer_encoding": http_headers.get("transfer-encoding", "").lower(),
+                    "content_encoding": http_headers.get("content-encoding", "").lower(),
+                    "offset": http_end + 4,
+                    "length": block_end - http_end - 4,
+                }
+        elif record_type == "resource":
+            info = {"url": url, "status": 200, "content_type": headers.get("content-type", ""),
+                    "transfer_encoding": "", "content_encoding": "", "offset": block_start,
+                    "length": block_end - block_start}
+        yield info, block_end
+        pos = block_end
+
+
+def _scan_warc(path: str, mm, max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES):
+    # Body tak terkompresi dibaca worker langsung dari mmap; batas ukuran berlaku saat didekode
+    for info, _ in _warc_records(mm, 0, len(mm)):
+        if info is not None:
+            yield {"kind": "body", "source": path, **info}
+
+
+def _gunzip_pieces(mm):
+    """
+    Mendekompresi isi mmap gzip (satu atau banyak member) menjadi potongan paling
+    banyak GZIP_READ_SIZE byte; input yang belum terpakai disimpan di
+    `unconsumed_tail`, sehingga member dengan rasio kompresi tinggi tidak pernah
+    diekspansi sekaligus.
+    """
+    decompressor = zlib.decompressobj(31)
+    position = 0
+    pending = b""
+    while pending or position < len(mm):
+        if not pending:
+            pending = mm[position:position + GZIP_READ_SIZE]
+            position += len(pending)
+        piece = decompressor.decompress(pending, GZIP_READ_SIZE)
+        pending = decompressor.unconsumed_tail
+        if decompressor.eof:
+            pending = decompressor.unused_data  # Member gzip berikutnya
+            decompressor = zlib.decompressobj(31)
+        if piece:
+            yield piece
+
+
+def _scan_warc_gz(path: str, mm, max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES):
+    """
+    Mendekompresi .warc.gz secara bertahap ke buffer bergulir (mendukung satu member
+    gzip per rekaman maupun satu stream untuk seluruh file) dan mengirim body rekaman
+    secara inline. Rekaman yang lebih besar dari `max_record_bytes` dilewati tanpa
+    ditampung, sehingga memori dibatasi batas tersebut ditambah satu potongan
+    dekompresi (GZIP_READ_SIZE).
+    """
+    buffer = bytearray()
+    discard = 0  # Sisa byte rekaman raksasa yang sedang dilewati
+    for piece in _gunzip_pieces(mm):
+        buffer += piece
+        if discard:
+            dropped = min(discard, len(buffer))
+            del buffer[:dropped]
+            discard -= dropped
+            if discard:
+                continue
+        consumed = 0
+        for info, next_pos in _warc_records(buffer, 0, len(buffer)):
+            consumed = next_pos
+            if info is not None:
+                body = bytes(buffer[info["offset"]:next_pos])
+                yield {"kind": "inline", "source": path, **info, "offset": 0, "data": body}
+        del buffer[:consumed]
+        if len(buffer) > max_record_bytes:
+            start = buffer.find(b"WARC/")
+            header_end = buffer.find(b"\r\n\r\n", start) if start >= 0 else -1
+            if header_end < 0:
+                raise ValueError("header rekaman WARC tidak ditemukan")
+            _, headers = _parse_header_block(buffer[start:header_end])
+            record_end = header_end + 4 + int(headers.get("content-length", "0") or 0)
+            yield {"kind": "error", "source": path, "url": headers.get("warc-target-uri", "").strip("<>"),
+                   "error": f"rekaman melebihi {max_record_bytes} byte, dilewati"}
+            discard = max(0, record_end - len(buffer))
+            del buffer[:record_end]
+    if buffer.strip():
+        yield {"kind": "error", "source": path, "url": "", "error": "rekaman WARC terakhir terpotong"}
+
+
+def _json_string_end(mm, pos: int) -> int:
+    """Posisi setelah kutip penutup string JSON yang isinya dimulai di `pos`."""
+    while True:
+        match = _JSON_STRING_END.search(mm, pos)
+        if match is None:
+            raise ValueError("string JSON tidak tertutup")
+        pos = match.end()
+        if match.group() == b"\\":
+            pos += 1  # Lewati karakter yang di-escape
+            continue
+        return pos
+
+
+def _json_value_end(mm, start: int) -> int:
+    """Posisi setelah nilai JSON yang dimulai di `start` (string dilompati utuh di C)."""
+    first = mm[start:start + 1]
+    if first == b'"':
+        return _json_string_end(mm, start + 1)
+    if first not in (b"{", b"["):
+        match = _JSON_SCALAR.match(mm, start)
+        if match is None:
+            raise ValueError("nilai JSON tidak valid")
+        return match.end()
+    depth = 0
+    pos = start
+    while True:
+        match = _JSON_TOKEN.search(mm, pos)
+        if match is None:
+            raise ValueError("objek JSON tidak tertutup")
+        token = match.group()
+        pos = match.end()
+        if token == b'"':
+            pos = _json_string_end(mm, pos)
+        elif token in (b"{", b"["):
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def _json_member_value(mm, start: int, key: str) -> int | None:
+    """
+    Posisi awal nilai anggota `key` dari objek JSON yang dimulai di `start`, atau None.
+    Anggota lain dilompati tanpa di-parse, jadi kunci yang sama di dalam nilai string
+    atau objek lain tidak ikut cocok.
+    """
+    if mm[start:start + 1] != b"{":
+        raise ValueError("objek JSON diharapkan")
+    pos = start + 1
+    while True:
+        pos = _JSON_SEPARATORS.match(mm, pos).end()
+        token = mm[pos:pos + 1]
+        if token == b"}":
+            return None
+        if token != b'"':
+            raise ValueError("kunci objek JSON tidak valid")
+        key_end = _json_string_end(mm, pos + 1)
+        colon = _JSON_COLON.match(mm, key_end)
+        if colon is None:
+            raise ValueError("':' tidak ditemukan setelah kunci objek JSON")
+        if json.loads(mm[pos:key_end]) == key:
+            return colon.end()
+        pos = _json_value_end(mm, colon.end())
+
+
+def _scan_har(path: str, mm, max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES):
+    """
+    Menemukan setiap objek di `log.entries` tanpa mem-parsing seluruh file HAR: path
+    `log` -> `entries` diikuti lewat struktur JSON, anggota lain hanya dilompati.
+    Setiap entri di-parse terpisah oleh worker; entri yang lebih besar dari
+    `max_record_bytes` dilewati.
+    """
+    root = _JSON_SEPARATORS.match(mm, 3 if mm[:3] == b"\xef\xbb\xbf" else 0).end()
+    log_start = _json_member_value(mm, root, "log")
+    entries = _json_member_value(mm, log_start, "entries") if log_start is not None else None
+    if entries is None or mm[entries:entries + 1] != b"[":
+        return
+    pos = entries + 1
+    while True:
+        start = _JSON_SEPARATORS.match(mm, pos).end()
+        if mm[start:start + 1] != b"{":
+            return  # Akhir array entries
+        end = _json_value_end(mm, start)
+        if end - start > max_record_bytes:
+            yield {"kind": "error", "source": path, "url": "",
+                   "error": f"entri HAR melebihi {max_record_bytes} byte, dilewati"}
+        else:
+            yield {"kind": "har", "source": path, "url": "", "offset": start, "length": end - start}
+        pos = end
+
+
+def _scan_saved_dir(path: str):
+    for root, _, names in os.walk(path):
+        for name in sorted(names):
+            file_path = os.path.join(root, name)
+            if os.path.isfile(file_path):
+                yield {"kind": "file", "source": file_path, "url": "", "offset": 0,
+                       "length": os.path.getsize(file_path)}
+
+
+def detect_format(path: str) -> str:
+    if os.path.isdir(path):
+        return "dir"
+    lower = path.lower()
+    if lower.endswith(".har"):
+        return "har"
+    if lower.endswith((".warc.gz", ".gz")):
+        return "warc.gz"
+    if lower.endswith(".warc"):
+        return "warc"
+    with open(path, "rb") as f:
+        head = f.read(16)
+    if head.startswith(b"WARC/"):
+        return "warc"
+    if head.startswith(b"\x1f\x8b"):
+        return "warc.gz"
+    if head.lstrip().startswith(b"{"):
+        return "har"
+    return "file"
+
+
+def iter_records(paths: list[str], stats: dict | None = None,
+                 max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES):
+    """Deskriptor rekaman dari semua input, berurutan per file."""
+    for path in paths:
+        input_format = detect_format(path)
+        if input_format == "dir":
+            yield from _scan_saved_dir(path)
+            continue
+        if input_format == "file":
+            yield {"kind": "file", "source": path, "url": "", "offset": 0, "length": os.path.getsize(path)}
+            continue
+        if os.path.getsize(path) == 0:
+            continue
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+            scanner = {"warc": _scan_warc, "warc.gz": _scan_warc_gz, "har": _scan_har}[input_format]
+            try:
+                yield from scanner(path, mm, max_record_bytes)
+            except ValueError as e:
+                yield {"kind": "error", "source": path, "url": "", "error": f"arsip rusak: {e}"}
+        if stats is not None:
+            stats["bytes_scanned"] = stats.get("bytes_scanned", 0) + os.path.getsize(path)
+
+
+# --- Pemrosesan rekaman (worker) ---
+
+_WORKER_MMAPS = {}
+
+
+def _archive_view(path: str, offset: int, length: int) -> memoryview:
+    # Setiap worker memetakan arsip sekali; halaman dibagi dengan page cache OS
+    mm = _WORKER_MMAPS.get(path)
+    if mm is None:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+        _WORKER_MMAPS[path] = mm
+    return memoryview(mm)[offset:offset + length]
+
+
+def _iter_chunks(data):
+    """Potongan body chunked transfer sebagai memoryview, tanpa menyalin body."""
+    view = memoryview(data)
+    pos = 0
+    while pos < len(view):
+        line_end = _CRLF.search(view, pos)
+        if line_end is None:
+            break
+        size = int(bytes(view[pos:line_end.start()]).split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            break
+        yield view[line_end.end():line_end.end() + size]
+        pos = line_end.end() + size + 2
+
+
+def _deflate_wbits(data) -> int:
+    # "deflate" di HTTP seharusnya zlib, tetapi sebagian server mengirim deflate mentah
+    head = bytes(data[:2])
+    return 15 if len(head) == 2 and head[0] & 0x0F == 8 and int.from_bytes(head, "big") % 31 == 0 else -15
+
+
+def _decode_body(record: dict, data, max_bytes: int = DEFAULT_MAX_RECORD_BYTES):
+    """
+    Mendekode chunked transfer dan Content-Encoding gzip/deflate secara bertahap.
+    Output dibatasi `max_bytes` (juga terhadap bom kompresi): jika lebih, ValueError.
+    """
+    chunked = record.get("transfer_encoding") == "chunked"
+    encoding = record.get("content_encoding")
+    if encoding in ("", "identity", None) and not chunked:
+        return data
+    if encoding in ("gzip", "x-gzip"):
+        decompressor = zlib.decompressobj(47)  # Header gzip atau zlib
+    elif encoding == "deflate":
+        decompressor = zlib.decompressobj(_deflate_wbits(next(_iter_chunks(data), b"") if chunked else data))
+    elif encoding in ("", "identity", None):
+        decompressor = None
+    else:
+        raise ValueError(f"Content-Encoding '{encoding}' tidak didukung")
+    body = bytearray()
+    for chunk in (_iter_chunks(data) if chunked else (data,)):
+        if decompressor is None:
+            body += chunk
+        else:
+            body += decompressor.decompress(chunk, max_bytes + 1 - len(body))
+            if decompressor.unconsumed_tail:
+                body += b"\0"  # Output terpotong karena batas: pasti melebihi max_bytes
+        if len(body) > max_bytes:
+            raise ValueError(f"body melebihi {max_bytes} byte setelah didekode, dilewati")
+    if decompressor is not None:
+        body += decompressor.flush()
+        if len(body) > max_bytes:
+            raise ValueError(f"body melebihi {max_bytes} byte setelah didekode, dilewati")
+    return bytes(body)
+
+
+def _load_har_entry(record: dict):
+    entry = json.loads(bytes(_archive_view(record["source"], record["offset"], record["length"])))
+    response = entry.get("response", {})
+    content = response.get("content", {})
+    text = content.get("text") or ""
+    data = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+    record.update(url=entry.get("request", {}).get("url", ""), status=response.get("status", 0),
+                  content_type=content.get("mimeType") or "")
+    return data
+
+
+def _load_body(record: dict, max_bytes: int = DEFAULT_MAX_RECORD_BYTES):
+    """Body rekaman: memoryview tanpa salinan untuk arsip tak terkompresi, bytes untuk lainnya."""
+    kind = record["kind"]
+    if kind == "har":
+        return _load_har_entry(record)
+    if kind == "inline":
+        return _decode_body(record, record.pop("data"), max_bytes)
+    if kind == "file":
+        if record["length"] > max_bytes:
+            raise ValueError(f"file melebihi {max_bytes} byte, dilewati")
+        # File halaman tersimpan kecil dan jumlahnya bisa sangat banyak: dibaca biasa, tidak dipetakan
+        with open(record["source"], "rb") as f:
+            return f.read()
+    return _decode_body(record, _archive_view(record["source"], record["offset"], record["length"]), max_bytes)
+
+
+def _is_html(record: dict, data) -> bool:
+    content_type = record.get("content_type", "").lower()
+    if "html" in content_type:
+        return True
+    if content_type:
+        return False
+    if urlparse(record.get("url", "")).path.lower().endswith(HTML_EXTENSIONS) \
+            or record["source"].lower().endswith(HTML_EXTENSIONS):
+        return True
+    return bytes(data[:512]).lstrip().lower().startswith((b"<!doctype html", b"<html"))
+
+
+def _decode_html(record: dict, data) -> str:
+    match = re.search(r"charset=([\w-]+)", record.get("content_type", ""), re.IGNORECASE)
+    try:
+        return bytes(data).decode(match.group(1) if match else "utf-8", errors="replace")
+    except LookupError:
+        return bytes(data).decode("utf-8", errors="replace")
+
+
+def _page_result(record: dict, data) -> dict:
+    url = record.get("url")
+    if not url:
+        # Halaman tersimpan: pakai URL asli dari penanda "saved from" jika ada
+        match = SAVED_FROM_PATTERN.search(bytes(data[:4096]))
+        url = match.group(1).decode("ascii", "replace") if match else "file://" + os.path.abspath(record["source"])
+    collector = extract_links(_decode_html(record, data))
+    result = {"type": "page", "source": record["source"], "url": url, "status": record.get("status", 200),
+              "external_domains": sorted(domains_from_urls(collector.external_urls()))}
+    if url.startswith(("http://", "https://")):
+        result["asset_urls"] = sorted(collector.asset_urls(url))
+    return result
+
+
+def _asset_result(record: dict, data) -> dict:
+    sha1, md5, sha256 = hashlib.sha1(), hashlib.md5(), hashlib.sha256()
+    view = memoryview(data)
+    for pos in range(0, len(view), HASH_CHUNK_SIZE):
+        chunk = view[pos:pos + HASH_CHUNK_SIZE]
+        sha1.update(chunk)
+        md5.update(chunk)
+        sha256.update(chunk)
+    url = record.get("url") or "file://" + os.path.abspath(record["source"])
+    favicon_hash = None
+    if mmh3 is not None and is_favicon_candidate(url, record.get("content_type", "")):
+        favicon_hash = mmh3.hash(base64.encodebytes(bytes(view)))
+    view.release()
+    return {"type": "asset", "source": record["source"], "asset_url": url, "status": record.get("status", 200),
+            "content_type": record.get("content_type", ""), "bytes_read": len(data), "hash_status": "full",
+            "sha1": sha1.hexdigest(), "md5": md5.hexdigest(), "sha256": sha256.hexdigest(),
+            "favicon_mmh3": favicon_hash}
+
+
+def process_record(record: dict, mode: str = "all", max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES) -> dict | None:
+    """
+    Mem-parsing (HTML) atau meng-hash (aset lain) satu rekaman; None jika tidak relevan
+    untuk `mode`. Aset tak terkompresi di-hash langsung dari mmap berapa pun ukurannya;
+    body yang harus disalin (didekode atau HTML) dibatasi `max_record_bytes`.
+    """
+    if record["kind"] == "error":
+        return {"type": "error", "source": record["source"], "url": record["url"], "error": record["error"]}
+    try:
+        data = _load_body(record, max_record_bytes)
+        if not 200 <= (record.get("status") or 200) < 300:
+            return None
+        if _is_html(record, data):
+            if mode == "assets":
+                return None
+            if len(data) > max_record_bytes:
+                raise ValueError(f"halaman melebihi {max_record_bytes} byte, dilewati")
+            return _page_result(record, data)
+        return _asset_result(record, data) if mode != "domains" else None
+    except Exception as e:
+        return {"type": "error", "source": record["source"], "url": record.get("url", ""),
+                "error": f"{type(e).__name__}: {e}"}
+
+
+def process_batch(records: list[dict], mode: str, max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES) -> list[dict]:
+    results = []
+    for record in records:
+        result = process_record(record, mode, max_record_bytes)
+        if result is not None:
+            results.append(result)
+    return results
+
+
+# --- Mesin streaming ---
+
+def _batches(records, batch_size: int, batch_bytes: int):
+    batch, inline_bytes = [], 0
+    for record in records:
+        batch.append(record)
+        inline_bytes += len(record.get("data") or b"")
+        if len(batch) >= batch_size or inline_bytes >= batch_bytes:
+            yield batch
+            batch, inline_bytes = [], 0
+    if batch:
+        yield batch
+
+
+def iter_offline_results(paths: list[str], mode: str = "all", workers: int | None = None,
+                         known_libs: KnownLibraryFilter | None = None, stats: dict | None = None,
+                         batch_size: int = DEFAULT_BATCH_SIZE, max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES):
+    """
+    Menghasilkan dict hasil (page/asset/error) dari arsip dan direktori di `paths`,
+    dalam urutan rekaman. `workers` = 0 memproses di proses utama. Aset pustaka umum
+    dibuang dengan `known_libs` (URL sebelum diproses jika sudah diketahui dari
+    header WARC, hash setelahnya). Body yang harus disalin ke memori dibatasi
+    `max_record_bytes`. Penghitung dikumpulkan di `stats`.
+    """
+    stats = stats if stats is not None else {}
+    for key in ("records", "pages", "assets", "errors", "bytes_hashed", "known_lib_skipped"):
+        stats.setdefault(key, 0)
+
+    def wanted(records):
+        for record in records:
+            stats["records"] += 1
+            if record["kind"] == "file":
+                stats["bytes_scanned"] = stats.get("bytes_scanned", 0) + record["length"]
+            # Rekaman WARC yang sudah pasti tidak relevan tidak perlu dikirim ke worker
+            status = record.get("status")
+            content_type = record.get("content_type", "").lower()
+            if status is not None and not 200 <= status < 300:
+                continue
+            if content_type and (mode == "domains") != ("html" in content_type) and mode != "all":
+                continue
+            if known_libs is not None and record.get("url") and known_libs.match_url(record["url"]):
+                stats["known_lib_skipped"] += 1
+                continue
+            yield record
+
+    def accepted(results):
+        for result in results:
+            if result["type"] == "asset":
+                if known_libs is not None and (known_libs.match_url(result["asset_url"])
+                                               or known_libs.match_hashes(result)):
+                    stats["known_lib_skipped"] += 1
+                    continue
+                stats["assets"] += 1
+                stats["bytes_hashed"] += result["bytes_read"]
+            elif result["type"] == "page":
+                stats["pages"] += 1
+            else:
+                stats["errors"] += 1
+            yield result
+
+    batches = _batches(wanted(iter_records(paths, stats, max_record_bytes)), batch_size, DEFAULT_BATCH_BYTES)
+    if workers == 0:
+        for batch in batches:
+            yield from accepted(process_batch(batch, mode, max_record_bytes))
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2  # Batas batch di antrean: memori tidak tumbuh dengan ukuran arsip
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(process_batch, batch, mode, max_record_bytes))
+            if len(pending) >= max_pending:
+                yield from accepted(pending.popleft().result())
+        while pending:
+            yield from accepted(pending.popleft().result())
+
+
+def write_jsonl(results, output, transform=None) -> int:
+    """Menulis setiap hasil sebagai satu baris JSON segera setelah tersedia."""
+    count = 0
+    for result in results:
+        if transform is not None:
+            result = transform(result)
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        count += 1
+    output.flush()
+    return count
+
+
+def run_offline(paths: list[str], mode: str, output_path: str | None = None, workers: int | None = None,
+                known_libs: KnownLibraryFilter | None = None, transform=None, log=None,
+                max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES) -> dict:
+    """
+    Menjalankan ekstraksi offline dan menulis JSONL ke `output_path` (atau stdout).
+    Pesan progres ditulis ke stderr agar stdout tetap berisi JSONL murni.
+    """
+    log = log or (lambda message: print(message, file=sys.stderr))
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        log(f"[!] Input tidak ditemukan: {', '.join(missing)}")
+        return {}
+    stats = {}
+    start = time.perf_counter()
+    log(f"[*] Mode offline ({mode}): {len(paths)} input, worker={workers if workers is not None else os.cpu_count()}")
+    output = open(output_path, "w") if output_path else sys.stdout
+    try:
+        results = iter_offline_results(paths, mode, workers, known_libs, stats, max_record_bytes=max_record_bytes)
+        written = write_jsonl(results, output, transform)
+    except BrokenPipeError:
+        # Pembaca pipeline (misalnya `head`) berhenti lebih awal: bukan kesalahan
+        sys.stdout = open(os.devnull, "w")
+        return stats
+    finally:
+        if output_path:
+            output.close()
+    elapsed = time.perf_counter() - start
+    scanned_mb = stats.get("bytes_scanned", 0) / (1024 * 1024)
+    log(f"[✓] {stats['records']} rekaman dalam {elapsed:.2f} detik ({scanned_mb / elapsed if elapsed else 0:.1f} MB/detik "
+        f"arsip): {stats['pages']} halaman, {stats['assets']} aset ({stats['bytes_hashed'] / (1024 * 1024):.1f} MB "
+        f"di-hash), {stats['known_lib_skipped']} pustaka umum dilewati, {stats['errors']} gagal.")
+    if output_path:
+        log(f"[*] {written} baris JSONL disimpan ke {output_path}")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekstraksi offline domain eksternal dan hash aset dari arsip "
+                                                 "WARC/HAR atau halaman tersimpan, output JSONL.")
+    parser.add_argument("paths", nargs="+", help="File WARC/HAR/HTML atau direktori halaman tersimpan.")
+    parser.add_argument("--mode", choices=MODES, default="all",
+                        help="domains = hanya halaman HTML, assets = hanya hash aset, all = keduanya.")
+    parser.add_argument("-o", "--output", help="File JSONL hasil (default: stdout).")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Jumlah proses worker (default: jumlah CPU, 0 = tanpa pool).")
+    parser.add_argument("--known-libs", action="append", metavar="DIR",
+                        help="Direktori daftar pustaka umum tambahan (lihat known_libs/README.md). hashes.txt "
+                             "bawaan kosong: tanpa digest tambahan hanya filter host/path yang aktif.")
+    parser.add_argument("--no-known-libs", action="store_true", help="Jangan lewati pustaka umum.")
+    parser.add_argument("--max-record-mb", type=float, default=DEFAULT_MAX_RECORD_BYTES / (1024 * 1024),
+                        help="Batas body yang didekode/disalin ke memori per rekaman, dalam MB (default: "
+                             f"{DEFAULT_MAX_RECORD_BYTES // (1024 * 1024)}); rekaman yang lebih besar dilewati.")
+    args = parser.parse_args(argv)
+    known_libs = None if args.no_known_libs else load_known_libs(args.known_libs)
+    run_offline(args.paths, args.mode, args.output, args.processes, known_libs,
+                max_record_bytes=int(args.max_record_mb * 1024 * 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+import argparse
+import asyncio
+import hashlib
+import re
+import ssl
+import sys
+import time
+
+# Verifikasi kandidat origin IP: untuk setiap pasangan IP x hostname, kirim
+# permintaan HTTPS/HTTP langsung ke IP dengan header Host dan SNI milik hostname,
+# lalu bandingkan responsnya dengan halaman yang dilayani CDN (baseline) memakai
+# hash body dan skor kemiripan murah (judul, sidik jari header, simhash).
+
+DEFAULT_SCHEMES = ("https", "http")
+DEFAULT_MAX_CONCURRENCY = 200
+DEFAULT_PER_IP_LIMIT = 4
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_BODY_BYTES = 1024 * 1024
+DEFAULT_MAX_IDLE_PER_KEY = 4
+USER_AGENT = "Mozilla/5.0 (compatible; PythonOriginVerifier/1.0)"
+SCHEME_PORTS = {"https": 443, "http": 80}
+
+# Header yang nilainya berubah per permintaan/edge, tidak dipakai untuk sidik jari
+VOLATILE_HEADERS = {
+    "date", "age", "expires", "set-cookie", "content-length", "etag", "last-modified",
+    "cf-ray", "x-request-id", "x-amz-cf-id", "x-served-by", "x-cache", "x-cache-hits",
+    "x-timer", "via", "report-to", "nel", "server-timing", "alt-svc", "connection",
+    "keep-alive", "transfer-encoding",
+}
+TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+WORD_PATTERN = re.compile(r"\w+")
+
+MATCH_THRESHOLD = 0.8
+SIMILAR_THRESHOLD = 0.6
+
+
+class HTTPProbeError(Exception):
+    """Raised when a probe request fails (connect, TLS, timeout or malformed response)."""
+
+
+# Setiap nilai byte disebar ke 8 field 32-bit (satu per bit), sehingga jumlah bit 1
+# per posisi untuk semua shingle dihitung dengan 8 penjumlahan int per shingle,
+# bukan 64 iterasi Python per bit.
+_BYTE_SPREAD = [sum(1 << (32 * bit) for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+_FIELD_MASK = 0xFFFFFFFF
+
+
+def simhash(text: str, max_tokens: int = 20000) -> int:
+    """Simhash 64-bit dari shingle 3 kata; teks yang mirip menghasilkan hash dengan jarak Hamming kecil."""
+    tokens = WORD_PATTERN.findall(text.lower())[:max_tokens]
+    if len(tokens) < 3:
+        tokens = tokens + [""] * (3 - len(tokens))
+    spread = _BYTE_SPREAD
+    c0 = c1 = c2 = c3 = c4 = c5 = c6 = c7 = 0
+    for i in range(len(tokens) - 2):
+        b0, b1, b2, b3, b4, b5, b6, b7 = hashlib.blake2b(
+            f"{tokens[i]} {tokens[i + 1]} {tokens[i + 2]}".encode(), digest_size=8).digest()
+        c0 += spread[b0]
+        c1 += spread[b1]
+        c2 += spread[b2]
+        c3 += spread[b3]
+        c4 += spread[b4]
+        c5 += spread[b5]
+        c6 += spread[b6]
+        c7 += spread[b7]
+    shingles = len(tokens) - 2
+    value = 0
+    # Byte pertama digest adalah byte paling signifikan (big-endian)
+    for byte_index, counts in enumerate((c7, c6, c5, c4, c3, c2, c1, c0)):
+        for bit in range(8):
+            if 2 * (counts >> (32 * bit) & _FIELD_MASK) > shingles:
+                value |= 1 << (8 * byte_index + bit)
+    return value
+
+
+def simhash_similarity(a: int, b: int) -> float:
+    return 1.0 - bin(a ^ b).count("1") / 64
+
+
+def fingerprint_response(status: int, headers: list[tuple[str, str]], body: bytes) -> dict:
+    """Meringkas respons menjadi hash body, judul, sidik jari header, dan simhash."""
+    text = body.decode("utf-8", errors="replace")
+    title_match = TITLE_PATTERN.search(text)
+    title = re.sub(r"\s+", " ", title_match.group(1)).strip() if title_match else ""
+    header_features = set()
+    for name, value in headers:
+        if name in VOLATILE_HEADERS:
+            continue
+        # Nama header selalu dipakai; nilai hanya untuk header yang stabil dan bermakna
+        header_features.add(f"{name}={value}" if name in ("server", "x-powered-by", "content-type") else name)
+    return {
+        "status": status,
+        "body_sha256": hashlib.sha256(body).hexdigest(),
+        "body_length": len(body),
+        "title": title,
+        "header_features": header_features,
+        "simhash": simhash(TAG_PATTERN.sub(" ", text)),
+    }
+
+
+def compare_fingerprints(candidate: dict, baseline: dict) -> tuple[float, str]:
+    """
+    Mengembalikan (skor 0..1, verdict). Hash body yang sama berarti "exact";
+    selain itu skor = 0.5 simhash + 0.3 judul + 0.2 Jaccard sidik jari header.
+    """
+    if candidate["body_sha256"] == baseline["body_sha256"] and candidate["body_length"] > 0:
+        return 1.0, "exact"
+    title_score = 1.0 if candidate["title"] and candidate["title"] == baseline["title"] else 0.0
+    union = candidate["header_features"] | baseline["header_features"]
+    header_score = len(candidate["header_features"] & baseline["header_features"]) / len(union) if union else 0.0
+    score = (0.5 * simhash_similarity(candidate["simhash"], baseline["simhash"])
+             + 0.3 * title_score + 0.2 * header_score)
+    if score >= MATCH_THRESHOLD:
+        return score, "match"
+    if score >= SIMILAR_THRESHOLD:
+        return score, "similar"
+    return score, "different"
+
+
+class _ConnectionPool:
+    """Pool koneksi keep-alive per (alamat, port, skema, SNI) untuk satu event loop."""
+
+    def __init__(self, ssl_context: ssl.SSLContext, timeout: float, max_idle_per_key: int):
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.max_idle_per_key = max_idle_per_key
+        self._idle = {}
+        self.stats = {"opened": 0, "reused": 0}
+
+    async def acquire(self, address: str, port: int, scheme: str, server_name: str):
+        # SNI hanya relevan untuk HTTPS; koneksi HTTP ke IP yang sama dipakai lintas hostname
+        key = (address, port, scheme, server_name if scheme == "https" else "")
+        idle = self._idle.get(key, [])
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self.stats["reused"] += 1
+                return key, reader, writer, True
+            writer.close()
+        ssl_args = {"ssl": self.ssl_context, "server_hostname": server_name} if scheme == "https" else {}
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(address, port, **ssl_args), self.timeout)
+        self.stats["opened"] += 1
+        return key, reader, writer, False
+
+    def release(self, key, reader, writer, reusable: bool):
+        idle = self._idle.setdefault(key, [])
+        if reusable and len(idle) < self.max_idle_per_key and not writer.is_closing():
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self):
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+
+async def _read_response(reader: asyncio.StreamReader, max_body: int) -> tuple[int, list, bytes, bool]:
+    status_line = await reader.readline()
+    parts = status_line.decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+        raise HTTPProbeError(f"Status line tidak valid: {status_line[:80]!r}")
+    status = int(parts[1])
+    headers = []
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers.append((name.strip().lower(), value.strip()))
+    header_map = dict(headers)
+    reusable = header_map.get("connection", "").lower() != "close" and parts[0] != "HTTP/1.0"
+
+    if status in (204, 304) or 100 <= status < 200:
+        return status, headers, b"", reusable
+    if "chunked" in header_map.get("transfer-encoding", "").lower():
+        body = bytearray()
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # Lewati trailer
+                break
+            chunk = await reader.readexactly(size + 2)
+            if len(body) < max_body:
+                body.extend(chunk[:-2][:max_body - len(body)])
+        return status, headers, bytes(body), reusable
+    if header_map.get("content-length", "").isdigit():
+        length = int(header_map["content-length"])
+        if length > max_body:
+            return status, headers, await reader.readexactly(max_body), False
+        return status, headers, await reader.readexactly(length), reusable
+    # Body dibatasi penutupan koneksi: satu read() hanya mengembalikan isi buffer saat ini
+    body = bytearray()
+    while len(body) < max_body:
+        chunk = await reader.read(max_body - len(body))
+        if not chunk:
+            break
+        body += chunk
+    return status, headers, bytes(body), False
+
+
+class OriginVerifier:
+    """
+    Memverifikasi pasangan (ip, hostname) secara asinkron.
+
+    Konkurensi dibatasi `max_concurrency` secara global dan `per_ip_limit` per IP.
+    Koneksi ke IP yang sama (dengan SNI yang sama) dipakai ulang lewat keep-alive.
+    Verifikasi sertifikat TLS dimatikan karena origin sering memakai sertifikat
+    yang tidak cocok dengan IP atau self-signed.
+    """
+
+    def __init__(self, schemes=DEFAULT_SCHEMES, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 per_ip_limit: int = DEFAULT_PER_IP_LIMIT, timeout: float = DEFAULT_TIMEOUT,
+                 max_body_bytes: int = DEFAULT_MAX_BODY_BYTES, path: str = "/",
+                 ports: dict[str, int] | None = None):
+        self.schemes = tuple(schemes)
+        self.max_concurrency = max_concurrency
+        self.per_ip_limit = per_ip_limit
+        self.timeout = timeout
+        self.max_body_bytes = max_body_bytes
+        self.path = path
+        self.ports = {**SCHEME_PORTS, **(ports or {})}
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.stats = {"requests": 0, "errors": 0, "connections_opened": 0, "connections_reused": 0}
+
+    async def _fetch(self, pool: _ConnectionPool, address: str, hostname: str,
+                     scheme: str) -> tuple[int, list, bytes]:
+        port = self.ports[scheme]
+        host_header = hostname if port == SCHEME_PORTS[scheme] else f"{hostname}:{port}"
+        request = (f"GET {self.path} HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+                   "Accept: */*\r\nAccept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n").encode()
+        for attempt in range(2):
+            key, reader, writer, reused = await pool.acquire(address, port, scheme, hostname)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, headers, body, reusable = await asyncio.wait_for(
+                    _read_response(reader, self.max_body_bytes), self.timeout)
+                pool.release(key, reader, writer, reusable)
+                return status, headers, body
+            except (ConnectionError, asyncio.IncompleteReadError, HTTPProbeError) as e:
+                writer.close()
+                # Koneksi idle yang sudah ditutup server: coba sekali lagi dengan koneksi baru
+                if reused and attempt == 0 and not isinstance(e, HTTPProbeError):
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+        raise HTTPProbeError("Koneksi ditutup sebelum respons diterima")
+
+    async def _probe(self, pool, address, hostname, scheme, global_slots, ip_slots) -> dict:
+        async with global_slots, ip_slots.setdefault(address, asyncio.Semaphore(self.per_ip_limit)):
+            self.stats["requests"] += 1
+            try:
+                response = await asyncio.wait_for(self._fetch(pool, address, hostname, scheme), self.timeout * 2)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HTTPProbeError, ValueError) as e:
+                self.stats["errors"] += 1
+                return {"error": f"{type(e).__name__}: {e}".rstrip(": ")}
+        # Simhash halaman besar memakan CPU; dijalankan di thread agar event loop (dan
+        # timeout probe lain yang sedang berjalan) tidak ikut tertahan
+        return await asyncio.get_running_loop().run_in_executor(None, fingerprint_response, *response)
+
+    async def verify(self, pairs) -> list[dict]:
+        """
+        Memverifikasi daftar (ip, hostname). Baseline untuk setiap hostname diambil
+        lewat DNS biasa (jalur CDN). Mengembalikan hasil per (ip, hostname, skema),
+        diurutkan dari skor tertinggi.
+        """
+        pairs = list(dict.fromkeys(pairs))
+        hostnames = sorted({hostname for _, hostname in pairs})
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+        ip_slots = {}
+        pool = _ConnectionPool(self.ssl_context, self.timeout, DEFAULT_MAX_IDLE_PER_KEY)
+        try:
+            baseline_jobs = [(hostname, scheme) for hostname in hostnames for scheme in self.schemes]
+            baselines = await asyncio.gather(*(
+                self._probe(pool, hostname, hostname, scheme, global_slots, ip_slots)
+                for hostname, scheme in baseline_jobs))
+            baseline_map = dict(zip(baseline_jobs, baselines))
+
+            probe_jobs = [(ip, hostname, scheme) for ip, hostname in pairs for scheme in self.schemes]
+            probes = await asyncio.gather(*(
+                self._probe(pool, ip, hostname, scheme, global_slots, ip_slots)
+                for ip, hostname, scheme in probe_jobs))
+        finally:
+            self.stats["connections_opened"] += pool.stats["opened"]
+            self.stats["connections_reused"] += pool.stats["reused"]
+            pool.close()
+
+        results = []
+        for (ip, hostname, scheme), probe in zip(probe_jobs, probes):
+            result = {"ip": ip, "hostname": hostname, "scheme": scheme, "score": 0.0, "verdict": "error"}
+            if "error" in probe:
+                result["error"] = probe["error"]
+                results.append(result)
+                continue
+            result.update(status=probe["status"], title=probe["title"], body_sha256=probe["body_sha256"])
+            # Pakai baseline dengan skema yang sama; jika gagal, coba skema lain
+            baseline = next((baseline_map[(hostname, s)] for s in (scheme,) + self.schemes
+                             if "error" not in baseline_map[(hostname, s)]), None)
+            if baseline is None:
+                result["verdict"] = "no-baseline"
+            else:
+                result["score"], result["verdict"] = compare_fingerprints(probe, baseline)
+                result["score"] = round(result["score"], 3)
+            results.append(result)
+        results.sort(key=lambda item: (-item["score"], item["ip"], item["hostname"], item["scheme"]))
+        return results
+
+    def verify_sync(self, pairs) -> list[dict]:
+        return asyncio.run(self.verify(pairs))
+
+
+def format_result(result: dict) -> str:
+    line = f"{result['ip']} <- {result['scheme']}://{result['hostname']}: {result['verdict']}"
+    if "error" in result:
+        return f"{line} ({result['error']})"
+    return f"{line} (skor {result['score']:.2f}, status {result['status']}, judul {result['title'][:60]!r})"
+
+
+def read_pairs(handle) -> list[tuple[str, str]]:
+    pairs = []
+    for line in handle:
+        parts = line.split("#", 1)[0].split()
+        if len(parts) >= 2:
+            pairs.append((parts[0], parts[1]))
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifikasi kandidat origin IP dengan header Host dan SNI target.")
+    parser.add_argument("pairs_file", nargs="?", default="-",
+                        help="File berisi baris 'ip hostname' ('-' untuk stdin, default).")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--per-ip", type=int, default=DEFAULT_PER_IP_LIMIT)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--scheme", action="append", choices=DEFAULT_SCHEMES, dest="schemes")
+    args = parser.parse_args(argv)
+
+    if args.pairs_file == "-":
+        pairs = read_pairs(sys.stdin)
+    else:
+        with open(args.pairs_file, "r") as f:
+            pairs = read_pairs(f)
+    if not pairs:
+        print("[!] Tidak ada pasangan 'ip hostname' yang valid. Keluar.")
+        return
+
+    verifier = OriginVerifier(args.schemes or DEFAULT_SCHEMES, max(1, args.concurrency),
+                              max(1, args.per_ip), args.timeout)
+    print(f"[*] Memverifikasi {len(pairs)} pasangan IP x hostname...")
+    start = time.perf_counter()
+    results = verifier.verify_sync(pairs)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        print(f"  - {format_result(result)}")
+    print(f"\n[✓] {verifier.stats['requests']} permintaan dalam {elapsed:.1f} detik "
+          f"({verifier.stats['requests'] / elapsed if elapsed else 0:.1f}/detik), "
+          f"{verifier.stats['errors']} gagal, koneksi baru {verifier.stats['connections_opened']}, "
+          f"dipakai ulang {verifier.stats['connections_reused']}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,29 @@
-from bs4 import BeautifulSoup
+import argparse
 import requests
 import re
-from urllib.parse import urlparse, urlunparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from findingsStore import DEFAULT_STORE_PATH, FindingsStore
+from htmlExtract import extract_links
+from httpClient import PooledSession, shared_session
+from tracing import enable_tracing, print_trace_summary, span
+
+# Batas default mode crawl
+DEFAULT_CRAWL_DEPTH = 2
+DEFAULT_CRAWL_MAX_PAGES = 500
+DEFAULT_CRAWL_WORKERS = 16
+DEFAULT_CRAWL_PER_HOST = 8
+DEFAULT_CRAWL_DELAY = 0.0
+
+# Ekstensi yang jelas bukan halaman HTML, tidak perlu diambil oleh crawler
+NON_HTML_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico", ".css", ".js",
+    ".pdf", ".zip", ".gz", ".tar", ".mp4", ".mp3", ".webm", ".woff", ".woff2",
+    ".ttf", ".eot", ".xml", ".json", ".txt", ".doc", ".docx", ".xls", ".xlsx",
+)
 
 def prepare_url_for_requests(url_input: str) -> str:
     # Prepares a URL by adding a scheme if missing.
@@ -14,12 +36,30 @@ def prepare_url_for_requests(url_input: str) -> str:
         url_input = "http://" + url_input
     return url_input
 
-def extract_external_domains(target_url: str):
+def domains_from_urls(urls) -> set[str]:
+    # Extracts unique hostnames (without port) from absolute or
+    # protocol-relative URLs.
+    domains = set()
+    for full_url in urls:
+        match = re.match(r"(?:https?:)?//([^/]+)", full_url)
+        if match:
+            domain_with_port = match.group(1)
+            domain_only = domain_with_port.split(':')[0]  # Hapus port jika ada
+            domains.add(domain_only)
+    return domains
+
+def extract_external_domains(target_url: str,
+                             session: PooledSession | None = None):
+    # Uses the process-wide shared session unless one is given, so repeated
+    # calls reuse pooled keep-alive connections.
+    session = session or shared_session()
     print(f"\n[*] Memulai ekstraksi domain eksternal dari: {target_url}")
     try:
         print(f"[*] Mencoba mengambil konten dari: {target_url}")
-        response = requests.get(target_url, timeout=10,
-                                 headers={'User-Agent': 'Mozilla/5.0'})
+        with span("page", target_url) as page_span:
+            response = session.get(target_url)
+            page_span.set(status=response.status_code,
+                          bytes=len(response.content))
         # Akan raise HTTPError untuk status 4xx/5xx
         response.raise_for_status()
         html = response.text
@@ -39,21 +79,9 @@ def extract_external_domains(target_url: str):
         return {"error": f"Gagal mengambil {target_url}: {e}"}
 
     print("[*] Mem-parsing konten HTML...")
-    soup = BeautifulSoup(html, "html.parser")
-    found_urls = set()
-
-    print("[*] Mencari URL di tag: iframe, script, img, link...")
-    for tag in soup.find_all(["iframe", "script", "img", "link"]):
-        src = tag.get("src") or tag.get("href")
-        if src and (src.startswith("http") or src.startswith("//")):
-            found_urls.add(src)
-
-    print("[*] Mencari URL redirect di tag meta refresh...")
-    for meta in soup.find_all("meta", attrs={"http-equiv": re.compile("^refresh$", re.I)}):
-        content = meta.get("content", "")
-        match = re.search(r'url=(.+)', content, re.IGNORECASE)
-        if match:
-            found_urls.add(match.group(1).strip())
+    print("[*] Mencari URL di tag iframe, script, img, link, meta refresh, "
+          "srcset, dan url() CSS...")
+    found_urls = extract_links(html).external_urls()
     
     if not found_urls:
         print("[-] Tidak ada URL potensial yang ditemukan di dalam tag HTML.")
@@ -63,13 +91,7 @@ def extract_external_domains(target_url: str):
 
     print("[*] Mengekstrak dan memfilter domain unik "
           "dari URL yang ditemukan...")
-    external_domains = set()
-    for full_url in found_urls:
-        match = re.match(r"(?:https?:)?//([^/]+)", full_url)
-        if match:
-            domain_with_port = match.group(1)
-            domain_only = domain_with_port.split(':')[0]  # Hapus port jika ada
-            external_domains.add(domain_only)
+    external_domains = domains_from_urls(found_urls)
     parsed_url = urlparse(target_url)
     # Construct the base URL without path, query, fragment
     structured_url = urlunparse((
@@ -84,8 +106,223 @@ def extract_external_domains(target_url: str):
         "total_found": len(external_domains)
     }
 
+def normalize_url(url: str) -> str:
+    # Normalizes a URL for crawl deduplication: lowercase scheme/host,
+    # default ports and fragments removed, empty path -> "/", query
+    # parameters sorted. Raises ValueError for malformed URLs (e.g. a
+    # non-numeric port), which the crawler skips per link.
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    port = parsed.port
+    netloc = host
+    if port and not ((scheme == "http" and port == 80) or
+                     (scheme == "https" and port == 443)):
+        netloc = f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, netloc, parsed.path or "/", "", query, ""))
+
+def site_of(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+def is_same_site(url: str, site: str) -> bool:
+    host = (urlparse(url).hostname or "").lower()
+    return host == site or host.endswith("." + site)
+
+class HostPoliteness:
+    # Per-host politeness: at most `per_host_limit` concurrent requests and
+    # at least `delay` seconds between request starts to the same host.
+
+    def __init__(self, per_host_limit: int, delay: float):
+        self.per_host_limit = per_host_limit
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
+
+    def semaphore(self, host: str):
+        with self._lock:
+            return self._semaphores.setdefault(
+                host, threading.BoundedSemaphore(self.per_host_limit))
+
+    def wait_turn(self, host: str):
+        if self.delay <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+def fetch_page_links(url: str, session: PooledSession,
+                     politeness: HostPoliteness):
+    # Fetches one page and returns (external URLs, same-page links) or None
+    # if the page could not be fetched or is not HTML.
+    host = (urlparse(url).hostname or "").lower()
+    try:
+        with politeness.semaphore(host):
+            politeness.wait_turn(host)
+            with span("page", url) as page_span:
+                response = session.get(url)
+                page_span.set(status=response.status_code,
+                              bytes=len(response.content))
+        response.raise_for_status()
+    except requests.exceptions.HTTPError as e:
+        print(f"    [!] Gagal mengambil {url}: "
+              f"Kesalahan HTTP {e.response.status_code}")
+        return None
+    except Exception as e:
+        print(f"    [!] Gagal mengambil {url}: {e}")
+        return None
+
+    if "html" not in response.headers.get("Content-Type", "text/html").lower():
+        return None
+    try:
+        links = extract_links(response.text)
+        # Gunakan URL akhir (setelah redirect) sebagai basis tautan relatif
+        return links.external_urls(), links.page_urls(response.url)
+    except Exception as e:
+        print(f"    [!] Gagal mengekstrak tautan dari {url}: {e}")
+        return None
+
+def crawl_external_domains(start_url: str,
+                           max_depth: int = DEFAULT_CRAWL_DEPTH,
+                           max_pages: int = DEFAULT_CRAWL_MAX_PAGES,
+                           max_workers: int = DEFAULT_CRAWL_WORKERS,
+                           per_host_limit: int = DEFAULT_CRAWL_PER_HOST,
+                           delay: float = DEFAULT_CRAWL_DELAY,
+                           session: PooledSession | None = None,
+                           on_domain=None):
+    # Crawls the same site breadth-first from `start_url` and aggregates the
+    # external domains referenced across all pages as
+    # domain -> {"first_seen": page, "count": pages referencing it}.
+    # Pages are fetched concurrently (up to `max_workers`, pooled connections
+    # on one session) level by level, bounded by `max_depth`, `max_pages`
+    # and per-host politeness limits. Results are processed in frontier
+    # order, so each domain's first-seen page is deterministic. The shared
+    # session's pool is grown to `max_workers` if needed, and it backs off
+    # on its own when a host answers 429/503. `on_domain(domain, page)` (if
+    # given) is called as soon as a domain is first seen.
+    session = session or shared_session()
+    session.ensure_pool_size(max_workers)
+    print(f"\n[*] Memulai crawl domain eksternal dari: {start_url} "
+          f"(kedalaman {max_depth}, maks {max_pages} halaman)")
+    site = site_of(start_url)
+    politeness = HostPoliteness(per_host_limit, delay)
+    seen_urls = {normalize_url(start_url)}
+    frontier = [normalize_url(start_url)]
+    domain_details = {}
+    pages_crawled = 0
+    pages_failed = 0
+    crawl_start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for depth in range(max_depth + 1):
+            if not frontier:
+                break
+            frontier = frontier[:max_pages - pages_crawled - pages_failed]
+            print(f"[*] Kedalaman {depth}: mengambil {len(frontier)} "
+                  "halaman...")
+            next_frontier = []
+            results = executor.map(
+                lambda url: fetch_page_links(url, session, politeness),
+                frontier)
+            for page_url, result in zip(frontier, results):
+                if result is None:
+                    pages_failed += 1
+                    continue
+                pages_crawled += 1
+                external_urls, page_links = result
+                for domain in sorted(domains_from_urls(external_urls)):
+                    if domain not in domain_details and on_domain:
+                        on_domain(domain, page_url)
+                    details = domain_details.setdefault(
+                        domain, {"first_seen": page_url, "count": 0})
+                    details["count"] += 1
+                for link in sorted(page_links):
+                    try:
+                        if urlparse(link).path.lower().endswith(
+                                NON_HTML_EXTENSIONS):
+                            continue
+                        normalized = normalize_url(link)
+                    except ValueError:
+                        continue  # Tautan rusak hanya melewatkan dirinya
+                    if (normalized not in seen_urls
+                            and is_same_site(normalized, site)):
+                        seen_urls.add(normalized)
+                        next_frontier.append(normalized)
+            frontier = next_frontier
+            if pages_crawled + pages_failed >= max_pages:
+                break
+
+    elapsed = time.perf_counter() - crawl_start
+    print(f"[+] Crawl selesai: {pages_crawled} halaman berhasil, "
+          f"{pages_failed} gagal/dilewati dalam {elapsed:.1f} detik "
+          f"({(pages_crawled + pages_failed) / elapsed if elapsed else 0:.1f} "
+          "halaman/detik).")
+
+    if pages_crawled == 0:
+        return {"error": f"Gagal mengambil halaman awal {start_url}"}
+
+    return {
+        "source_url": normalize_url(start_url),
+        "pages_crawled": pages_crawled,
+        "external_domains": sorted(domain_details),
+        "total_found": len(domain_details),
+        "domain_details": domain_details,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Ekstraksi domain eksternal dari satu halaman atau "
+                    "seluruh situs (mode crawl).")
+    parser.add_argument("url", nargs="?",
+                        help="URL target. Jika kosong, akan diminta secara "
+                             "interaktif.")
+    parser.add_argument("--crawl", action="store_true",
+                        help="Crawl halaman di situs yang sama (BFS).")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_CRAWL_DEPTH)
+    parser.add_argument("--max-pages", type=int,
+                        default=DEFAULT_CRAWL_MAX_PAGES)
+    parser.add_argument("--workers", type=int, default=DEFAULT_CRAWL_WORKERS)
+    parser.add_argument("--per-host", type=int,
+                        default=DEFAULT_CRAWL_PER_HOST,
+                        help="Maksimum permintaan bersamaan per host.")
+    parser.add_argument("--delay", type=float, default=DEFAULT_CRAWL_DELAY,
+                        help="Jeda minimum (detik) antar permintaan ke "
+                             "host yang sama.")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Tulis span per halaman ke FILE (JSONL) dan "
+                             "cetak ringkasan host terlambat.")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH,
+                        help="Database SQLite untuk menyimpan domain "
+                             "eksternal antar pemindaian.")
+    parser.add_argument("--no-store", action="store_true",
+                        help="Jangan simpan domain eksternal ke database.")
+    parser.add_argument("--offline", action="append", metavar="PATH",
+                        help="Baca halaman dari arsip WARC/HAR atau direktori "
+                             "halaman tersimpan, bukan dari URL live. Bisa "
+                             "diulang. Hasil ditulis sebagai JSONL.")
+    parser.add_argument("-o", "--output",
+                        help="File JSONL hasil mode --offline (default: "
+                             "stdout).")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Jumlah proses worker mode --offline (default: "
+                             "jumlah CPU, 0 = tanpa pool).")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    raw_url_input = input(
+    args = parse_args()
+    if args.offline:
+        # Imported here: offlineExtract itself imports this module
+        from offlineExtract import run_offline
+        run_offline(args.offline, "domains", args.output, args.processes)
+        raise SystemExit(0)
+    if args.trace:
+        enable_tracing(args.trace)
+    raw_url_input = args.url or input(
         "Masukkan URL untuk dianalisis (contoh: http://example.com): "
     )
     target_url = prepare_url_for_requests(raw_url_input)
@@ -93,7 +330,14 @@ if __name__ == "__main__":
     if not target_url:
         print("[!] URL input tidak valid atau kosong. Keluar.")
     else:
-        result = extract_external_domains(target_url)
+        if args.crawl:
+            result = crawl_external_domains(
+                target_url, max_depth=max(0, args.max_depth),
+                max_pages=max(1, args.max_pages),
+                max_workers=max(1, args.workers),
+                per_host_limit=max(1, args.per_host), delay=args.delay)
+        else:
+            result = extract_external_domains(target_url)
 
         if "error" in result:
             print(f"\n[!] Proses ekstraksi gagal: {result['error']}")
@@ -104,7 +348,26 @@ if __name__ == "__main__":
 
             if total_found > 0:
                 print(f"[+] Ditemukan {total_found} domain eksternal unik:")
+                details = result.get("domain_details", {})
                 for domain in external_domains:
-                    print(f"  - {domain}")
+                    if domain in details:
+                        print(f"  - {domain} ({details[domain]['count']} "
+                              f"halaman, pertama di "
+                              f"{details[domain]['first_seen']})")
+                    else:
+                        print(f"  - {domain}")
             else:
                 print("[-] Tidak ada domain eksternal yang ditemukan.")
+
+            if not args.no_store:
+                # Target dicatat per hostname, sama seperti hashLookup
+                with FindingsStore(args.store) as store:
+                    store.record_external_domains(
+                        urlparse(result['source_url']).hostname,
+                        external_domains, result.get("domain_details"))
+                print(f"[*] Domain eksternal disimpan ke {args.store}.")
+
+        print("[*] Statistik per host:")
+        for line in shared_session().format_host_stats():
+            print(f"  - {line}")
+        print_trace_summary()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Modul alat berada di akar repo dan server pengganti lokal di benchmarks/;
+# keduanya diimpor langsung seperti pada benchmarks/bench_suite.py.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
@@ -0,0 +1,54 @@
+import pytest
+
+from htmlExtract import absolute_http_url, extract_links
+from httpClient import PooledSession
+from parsing import crawl_external_domains, normalize_url
+from standins import _BackgroundServer, _QuietHandler
+
+BAD_LINKS_PAGE = b"""<html><body>
+<a href="http://127.0.0.1:abc/">port bukan angka</a>
+<a href="http://[bad/">IPv6 rusak</a>
+<a href="/next.html">berikutnya</a>
+<img src="http://[bad/x.png"><img src="/ok.png">
+<script src="https://cdn.example.net/lib.js"></script>
+</body></html>"""
+
+NEXT_PAGE = b'<a href="/">kembali</a><img src="https://img.example.org/i.png">'
+
+
+class _BadLinksHandler(_QuietHandler):
+    def do_GET(self):
+        if self.path == "/":
+            self.send_body(200, BAD_LINKS_PAGE, "text/html")
+        elif self.path == "/next.html":
+            self.send_body(200, NEXT_PAGE, "text/html")
+        else:
+            self.send_body(404, b"not found", "text/plain")
+
+
+def test_absolute_http_url_skips_malformed_links():
+    assert absolute_http_url("http://a.example/", "http://a.example:abc/") is None
+    assert absolute_http_url("http://a.example/", "http://[bad/") is None
+    assert absolute_http_url("http://a.example/", "mailto:x@a.example") is None
+    assert absolute_http_url("http://a.example/dir/", " page.html ") == "http://a.example/dir/page.html"
+
+
+def test_link_collector_drops_only_bad_links():
+    links = extract_links(BAD_LINKS_PAGE.decode())
+    assert links.page_urls("http://site.example/") == {"http://site.example/next.html"}
+    assert links.asset_urls("http://site.example/") == {"http://site.example/ok.png",
+                                                         "https://cdn.example.net/lib.js"}
+
+
+def test_normalize_url():
+    assert normalize_url("HTTP://Example.COM:80/?b=2&a=1#frag") == "http://example.com/?a=1&b=2"
+    assert normalize_url("https://example.com:8443") == "https://example.com:8443/"
+    with pytest.raises(ValueError):
+        normalize_url("http://example.com:abc/")
+
+
+def test_crawl_survives_malformed_hrefs():
+    with _BackgroundServer(_BadLinksHandler) as server, PooledSession() as session:
+        result = crawl_external_domains(server.base_url + "/", max_depth=2, session=session)
+    assert result["pages_crawled"] == 2
+    assert {"cdn.example.net", "img.example.org"} <= set(result["external_domains"])
@@ -0,0 +1,145 @@
+import socket
+import socketserver
+import struct
+import threading
+
+import pytest
+
+import dnsResolver
+from dnsResolver import DNSError, DNSResolver, QTYPES, build_query, encode_name, parse_response
+from standins import StubDNS
+
+
+def _answer(question: bytes, query_id: int, answers: list[bytes], flags: int = 0x8180) -> bytes:
+    header = struct.pack("!HHHHHH", query_id, flags, 1, len(answers), 0, 0)
+    return header + question + b"".join(answers)
+
+
+def _a_record(ip: str, ttl: int = 300) -> bytes:
+    return struct.pack("!HHHIH", 0xC00C, 1, 1, ttl, 4) + socket.inet_aton(ip)
+
+
+def _question(query: bytes) -> bytes:
+    end = query.index(b"\x00", 12) + 5
+    return query[12:end]
+
+
+def test_encode_name():
+    assert encode_name("www.example.com.") == b"\x03www\x07example\x03com\x00"
+    assert encode_name("bücher.example") == b"\x0dxn--bcher-kva\x07example\x00"
+
+
+@pytest.mark.parametrize("name", ["a" * 64 + ".example.com", "a..b", ".example.com", "a." * 128 + "com"])
+def test_encode_name_rejects_invalid_names(name):
+    with pytest.raises(DNSError):
+        encode_name(name)
+
+
+def test_build_query_layout():
+    query = build_query("example.com", QTYPES["MX"], 0x1234)
+    query_id, flags, qdcount, ancount, nscount, arcount = struct.unpack("!HHHHHH", query[:12])
+    assert (query_id, flags, qdcount, ancount, nscount, arcount) == (0x1234, 0x0100, 1, 0, 0, 1)
+    assert query[12:25] == b"\x07example\x03com\x00"
+    assert struct.unpack("!HH", query[25:29]) == (QTYPES["MX"], 1)
+
+
+def test_parse_response_follows_compression_pointers():
+    query = build_query("example.com", QTYPES["MX"], 7)
+    question = _question(query)
+    # Nama MX: label "mail" lalu pointer ke "example.com" di bagian pertanyaan (offset 12)
+    rdata = struct.pack("!H", 10) + b"\x04mail\xc0\x0c"
+    cname_rdata = b"\x03www\xc0\x0c"
+    answers = [struct.pack("!HHHIH", 0xC00C, 15, 1, 120, len(rdata)) + rdata,
+               struct.pack("!HHHIH", 0xC00C, 5, 1, 60, len(cname_rdata)) + cname_rdata]
+    response = parse_response(_answer(question, 7, answers))
+    assert response["id"] == 7 and response["rcode"] == 0 and not response["truncated"]
+    assert response["answers"] == [("example.com", 15, 120, "10 mail.example.com"),
+                                   ("example.com", 5, 60, "www.example.com")]
+
+
+def test_parse_response_rejects_malformed_data():
+    question = _question(build_query("example.com", 1, 1))
+    with pytest.raises(DNSError):
+        parse_response(b"\x00\x01")
+    with pytest.raises(DNSError):  # Pointer nama yang menunjuk dirinya sendiri
+        loop_offset = 12 + len(question)
+        pointer = struct.pack("!H", 0xC000 | loop_offset)
+        parse_response(_answer(question, 1, [pointer + struct.pack("!HHIH", 1, 1, 60, 4) + b"\x01\x02\x03\x04"]))
+    with pytest.raises(DNSError):  # RDATA MX terpotong
+        parse_response(_answer(question, 1, [struct.pack("!HHHIH", 0xC00C, 15, 1, 60, 1) + b"\x00"]))
+
+
+def test_resolve_against_stub_and_cache_ttl(monkeypatch):
+    with StubDNS() as stub:
+        resolver = DNSResolver([stub.address], timeout=1.0, retries=0)
+        first = resolver.resolve("example.com")
+        assert len(first) == 1 and first[0].startswith("198.")
+        assert resolver.resolve("example.com") == first
+        assert resolver.stats == {"queries": 1, "cache_hits": 1, "failures": 0}
+        assert resolver.resolve("example.com", "MX") == ["10 mail.example.com"]
+
+        # Setelah TTL (300 detik) lewat, entri cache kedaluwarsa dan kueri dikirim ulang
+        now = dnsResolver.time.monotonic()
+        monkeypatch.setattr(dnsResolver.time, "monotonic", lambda: now + 301)
+        assert resolver.resolve("example.com") == first
+        assert resolver.stats["queries"] == 3
+
+
+def test_resolve_many_isolates_bad_names():
+    with StubDNS() as stub:
+        resolver = DNSResolver([stub.address], timeout=1.0, retries=0)
+        results = resolver.resolve_many_sync([("ok.example.com", "A"), ("a" * 64 + ".example.com", "A"),
+                                              ("a..b", "A")])
+    assert isinstance(results[("ok.example.com", "A")], list)
+    assert isinstance(results[("a" * 64 + ".example.com", "A")], DNSError)
+    assert isinstance(results[("a..b", "A")], DNSError)
+    assert resolver.stats["queries"] == 1  # Nama yang tidak valid tidak pernah dikirim
+
+
+class _TruncatingDNS:
+    """UDP selalu menjawab TC=1 tanpa record; jawaban lengkap hanya lewat TCP di port yang sama."""
+
+    def __init__(self):
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind(("127.0.0.1", 0))
+        port = self.udp.getsockname()[1]
+        owner = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                length, = struct.unpack("!H", self.request.recv(2))
+                query = b""
+                while len(query) < length:
+                    query += self.request.recv(length - len(query))
+                owner.tcp_queries += 1
+                response = _answer(_question(query), struct.unpack("!H", query[:2])[0], [_a_record("203.0.113.9")])
+                self.request.sendall(struct.pack("!H", len(response)) + response)
+
+        self.tcp = socketserver.ThreadingTCPServer(("127.0.0.1", port), Handler)
+        self.tcp_queries = 0
+        self.address = f"127.0.0.1:{port}"
+
+    def _serve_udp(self):
+        while True:
+            try:
+                query, addr = self.udp.recvfrom(4096)
+            except OSError:
+                return
+            self.udp.sendto(_answer(_question(query), struct.unpack("!H", query[:2])[0], [], flags=0x8380), addr)
+
+    def __enter__(self):
+        threading.Thread(target=self._serve_udp, daemon=True).start()
+        threading.Thread(target=self.tcp.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.udp.close()
+        self.tcp.shutdown()
+        self.tcp.server_close()
+
+
+def test_truncated_udp_falls_back_to_tcp():
+    with _TruncatingDNS() as server:
+        resolver = DNSResolver([server.address], timeout=1.0, retries=0)
+        assert resolver.resolve("big.example.com") == ["203.0.113.9"]
+    assert server.tcp_queries == 1
@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from assetCache import AssetHashCache
+from hashLookup import extract_assets_from_url, fetch_and_hash_asset, map_with_host_limit
+from httpClient import PooledSession
+from standins import SyntheticSite, _BackgroundServer, _QuietHandler
+from tracing import enable_tracing, print_trace_summary
+
+
+class _ConditionalHandler(_QuietHandler):
+    def do_GET(self):
+        if self.path != "/app.js":
+            self.send_body(404, b"not found", "text/plain")
+        elif self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_body(200, b"x" * 5000, "application/javascript", {"ETag": '"v1"'})
+
+
+def test_map_with_host_limit_keeps_order_and_limits():
+    urls = [f"https://host{i // 10}.example/{i}.js" for i in range(40)]  # 4 host, berkelompok
+    lock = threading.Lock()
+    active = {}
+    peaks = {"total": 0, "host": 0}
+
+    def fetch(url):
+        host = url.split("/")[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peaks["host"] = max(peaks["host"], active[host])
+            peaks["total"] = max(peaks["total"], sum(active.values()))
+        time.sleep(0.01)
+        with lock:
+            active[host] -= 1
+        return url
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(map_with_host_limit(executor, fetch, urls, 8, 2)) == urls
+    assert peaks["host"] <= 2
+    # Host berikutnya dijadwalkan selagi host pertama penuh (tanpa head-of-line blocking)
+    assert peaks["total"] > 2
+
+
+def test_extract_assets_across_hosts():
+    with SyntheticSite(n_assets=24, asset_size=4096, n_external=0, asset_hosts=3) as site, PooledSession() as session:
+        assets = extract_assets_from_url(site.base_url + "/", session, max_workers=8, per_host_limit=2)
+    assert len(assets) == 24
+    assert len({asset["asset_url"].split("/")[2] for asset in assets}) == 3
+    assert [asset["asset_url"] for asset in assets] == sorted(asset["asset_url"] for asset in assets)
+
+
+def test_asset_spans_count_no_bytes_for_cache_hits_and_mark_http_errors(tmp_path):
+    trace_path = tmp_path / "trace.jsonl"
+    cache = AssetHashCache(str(tmp_path / "cache.sqlite"))
+    enable_tracing(str(trace_path))
+    try:
+        with _BackgroundServer(_ConditionalHandler) as server, PooledSession() as session:
+            for path in ("/app.js", "/app.js", "/missing.js"):
+                fetch_and_hash_asset(server.base_url + path, session, cache=cache)
+    finally:
+        print_trace_summary(log=lambda line: None)
+        cache.close()
+    spans = [entry for entry in map(json.loads, trace_path.read_text().splitlines()) if entry["stage"] == "asset"]
+    assert [(entry["status"], entry["bytes"]) for entry in spans[:2]] == [(200, 5000), (304, 0)]
+    assert spans[1]["from_cache"] is True
+    assert spans[2]["status"] == 404 and spans[2]["error"] == "HTTPError"
+
+
+def test_page_http_error_returns_no_assets():
+    with _BackgroundServer(_ConditionalHandler) as server, PooledSession() as session:
+        assert extract_assets_from_url(server.base_url + "/missing.html", session) == []
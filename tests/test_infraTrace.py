@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from findingsStore import FindingsStore
+from infraTrace import main
+from standins import StubDNS, _BackgroundServer, _QuietHandler
+
+
+class _LibraryOnlyHandler(_QuietHandler):
+    def do_GET(self):
+        if self.path == "/":
+            self.send_body(200, b'<html><script src="/js/jquery.min.js"></script></html>', "text/html")
+        else:
+            self.send_body(404, b"not found", "text/plain")
+
+
+def _records(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_dns_only_records_findings_and_spans(tmp_path, capsys):
+    store_path, trace_path = str(tmp_path / "findings.sqlite"), tmp_path / "trace.jsonl"
+    with StubDNS() as dns:
+        assert main(["ip-find", "--dns-only", "--nameserver", dns.address, "--store", store_path,
+                     "--trace", str(trace_path), "example.com"]) == 0
+    records = _records(capsys)
+    ip = next(record for record in records if record["type"] == "dns" and record["qtype"] == "A")["answers"][0]
+    store = FindingsStore(store_path)
+    try:
+        assert store.host_ips("example.com", sources=("dns",)) == {"example.com": {ip}}
+        assert set(store.host_ips("example.com", sources=("mx",))) == {"mail.example.com"}
+    finally:
+        store.close()
+    assert [json.loads(line)["stage"] for line in trace_path.read_text().splitlines()] == ["dns", "dns"]
+
+
+@pytest.mark.parametrize("flag", ["--incremental", "--verify-origins"])
+def test_dns_only_rejects_flags_it_would_ignore(flag, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["ip-find", "--dns-only", flag, "example.com"])
+    assert exc.value.code == 2
+    assert "--dns-only" in capsys.readouterr().err
+
+
+def test_hash_lookup_fails_only_when_the_page_fails(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)  # Cache hash aset ditulis di direktori kerja
+    with _BackgroundServer(_LibraryOnlyHandler) as server:
+        assert main(["hash-lookup", "--no-store", server.base_url + "/"]) == 0
+        assert [record["type"] for record in _records(capsys)] == ["target_done"]
+        assert main(["hash-lookup", "--no-store", server.base_url + "/missing"]) == 1
+        assert [record["type"] for record in _records(capsys)] == ["error"]
@@ -0,0 +1,88 @@
+import os
+import time
+
+import pytest
+
+from cdnIndex import load_cdn_index
+from dnsResolver import DNSResolver
+from ipFinder import run_domains
+from standins import StubCDX, StubDNS, install_fake_tools
+from waybackScanner import WaybackScanner
+
+# subfinder palsu yang juga mengeluarkan subdomain dengan label 64 karakter (tidak valid)
+SUBFINDER_WITH_BAD_LABEL = """#!/bin/sh
+while [ "$1" != "-d" ] && [ $# -gt 0 ]; do shift; done
+echo "sub0.$2"
+echo "{bad_label}.$2"
+echo "sub1.$2"
+"""
+
+# subfinder palsu yang lambat: setiap enumerasi menahan slot subfinder selama 0,4 detik
+SLOW_SUBFINDER = """#!/bin/sh
+while [ "$1" != "-d" ] && [ $# -gt 0 ]; do shift; done
+sleep 0.4
+echo "sub0.$2"
+"""
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    bin_dir = str(tmp_path / "bin")
+    monkeypatch.setenv("PATH", install_fake_tools(bin_dir, subdomains_per_domain=3))
+    with open(os.path.join(bin_dir, "subfinder"), "w") as f:
+        f.write(SUBFINDER_WITH_BAD_LABEL.format(bad_label="a" * 64))
+    monkeypatch.chdir(tmp_path)
+    with StubDNS() as dns, StubCDX(rows_per_path=2) as cdx:
+        yield {"resolver": DNSResolver([dns.address], timeout=1.0, retries=0),
+               "wayback": WaybackScanner(cdx.base_url + "/cdx", cache_dir=None),
+               "cdn_index": load_cdn_index()}
+
+
+def test_invalid_subdomain_only_loses_its_own_result(pipeline):
+    finished = {}
+    stats = run_domains(["example.com"], on_domain=lambda domain, data, ranking: finished.update({domain: data}),
+                        log=lambda line: None, **pipeline)
+    assert stats["stage_failures"] == 0
+    data = finished["example.com"]
+    assert set(data["probed_ips"]["dns"]) == {"sub0.example.com", "sub1.example.com"}
+    assert {"sub0.example.com", "sub1.example.com"} <= set(data["host_ips"])
+
+
+def test_failing_post_processing_does_not_abort_other_domains(pipeline):
+    finished = []
+    lines = []
+
+    def on_domain(domain, data, ranking):
+        if domain == "broken.example":
+            raise RuntimeError("callback rusak")
+        finished.append(domain)
+
+    domains = ["broken.example", "one.example", "two.example"]
+    stats = run_domains(domains, tool_limits={"subfinder": 1, "httpx": 1}, on_domain=on_domain,
+                        log=lines.append, **pipeline)
+    assert sorted(finished) == ["one.example", "two.example"]
+    assert stats["stage_failures"] == 1
+    assert any("gagal untuk broken.example: callback rusak" in line for line in lines)
+
+
+def test_mx_stages_do_not_queue_behind_subfinder_slots(pipeline):
+    with open(os.path.join(os.environ["PATH"].split(os.pathsep)[0], "subfinder"), "w") as f:
+        f.write(SLOW_SUBFINDER)
+    resolver = pipeline["resolver"]
+    resolve_many_sync = resolver.resolve_many_sync
+    mx_times = []
+
+    def timed_resolve_many_sync(queries):
+        queries = list(queries)
+        if any(rtype == "MX" for _, rtype in queries):
+            mx_times.append(time.perf_counter())
+        return resolve_many_sync(queries)
+
+    resolver.resolve_many_sync = timed_resolve_many_sync
+    domains = [f"d{i}.example" for i in range(6)]
+    start = time.perf_counter()
+    stats = run_domains(domains, tool_limits={"subfinder": 1, "httpx": 1}, log=lambda line: None, **pipeline)
+    assert stats["stage_failures"] == 0
+    assert stats["elapsed"] >= 6 * 0.4  # subfinder tetap berjalan satu per satu
+    assert len(mx_times) == len(domains)
+    assert max(mx_times) - start < 0.4
@@ -0,0 +1,51 @@
+import hashlib
+
+import pytest
+
+from knownLibs import KnownLibraryFilter, load_known_libs
+
+
+@pytest.fixture(scope="module")
+def known_libs():
+    return load_known_libs()
+
+
+@pytest.mark.parametrize("path", [
+    "/static/vue-admin-dashboard.css",
+    "/js/require-config.js",
+    "/js/aos-custom-widget.js",
+    "/analytics.js",
+    "/js/moment-locale-id-custom.js",
+    "/css/all.min.css",
+    "/js/app.js",
+])
+def test_site_specific_files_are_downloaded(known_libs, path):
+    assert known_libs.match_url("https://target.example" + path) is None
+
+
+@pytest.mark.parametrize("path", [
+    "/js/jquery.min.js",
+    "/js/jquery-3.7.1.min.js",
+    "/css/bootstrap.min.css",
+    "/js/bootstrap.bundle.min.js",
+    "/vendor/vue.min.js",
+    "/js/moment.min.js",
+    "/webfonts/fa-solid-900.woff2",
+    "/wp-includes/js/jquery/ui/core.min.js",
+])
+def test_library_filenames_are_skipped(known_libs, path):
+    assert known_libs.match_url("https://target.example" + path).startswith("path:")
+
+
+def test_third_party_hosts_and_digests():
+    known_libs = KnownLibraryFilter()
+    known_libs.add_host("cdnjs.cloudflare.com")
+    assert known_libs.match_url("https://cdnjs.cloudflare.com/ajax/libs/x/app.js") == "host:cdnjs.cloudflare.com"
+    assert known_libs.match_url("https://cloudflare.com/app.js") is None
+    asset = {"asset_url": "https://t.example/js/vendor.js", "sha1": hashlib.sha1(b"lib").hexdigest(),
+             "md5": hashlib.md5(b"lib").hexdigest(), "sha256": hashlib.sha256(b"lib").hexdigest()}
+    assert not known_libs.match_hashes(asset)
+    assert "pencocokan hash nonaktif" in known_libs.summary()
+    known_libs.add_hash(hashlib.sha256(b"lib").hexdigest())
+    assert known_libs.match_hashes(asset)
+    assert not known_libs.match_hashes({**asset, "hash_status": "partial"})
@@ -0,0 +1,108 @@
+import base64
+import gzip
+import hashlib
+import json
+import tracemalloc
+import zlib
+
+from offlineExtract import iter_offline_results
+
+
+def _warc_response(url: str, body: bytes, http_headers: list[str]) -> bytes:
+    http = ("HTTP/1.1 200 OK\r\n" + "".join(f"{header}\r\n" for header in http_headers) + "\r\n").encode() + body
+    return (f"WARC/1.0\r\nWARC-Type: response\r\nWARC-Target-URI: {url}\r\n"
+            f"Content-Type: application/http; msgtype=response\r\nContent-Length: {len(http)}\r\n\r\n").encode() \
+        + http + b"\r\n\r\n"
+
+
+def _chunked(data: bytes, size: int = 1000) -> bytes:
+    parts = [b"%x\r\n%s\r\n" % (len(data[i:i + size]), data[i:i + size]) for i in range(0, len(data), size)]
+    return b"".join(parts) + b"0\r\n\r\n"
+
+
+def _results(path, **kwargs):
+    return list(iter_offline_results([str(path)], "all", 0, **kwargs))
+
+
+def test_warc_bodies_are_decoded_before_hashing(tmp_path):
+    original = bytes(range(256)) * 400
+    raw_deflate = zlib.compressobj(wbits=-15)
+    raw_body = raw_deflate.compress(original) + raw_deflate.flush()
+    archive = tmp_path / "crawl.warc"
+    archive.write_bytes(
+        _warc_response("https://a.example/plain.bin", original, ["Content-Type: application/octet-stream"])
+        + _warc_response("https://a.example/gzip-chunked.bin", _chunked(gzip.compress(original)),
+                         ["Content-Type: application/octet-stream", "Transfer-Encoding: chunked",
+                          "Content-Encoding: gzip"])
+        + _warc_response("https://a.example/zlib.bin", zlib.compress(original),
+                         ["Content-Type: application/octet-stream", "Content-Encoding: deflate"])
+        + _warc_response("https://a.example/raw.bin", raw_body,
+                         ["Content-Type: application/octet-stream", "Content-Encoding: deflate"]))
+    results = _results(archive)
+    assert [result["type"] for result in results] == ["asset"] * 4
+    assert {result["sha256"] for result in results} == {hashlib.sha256(original).hexdigest()}
+
+
+def test_compression_bomb_is_skipped(tmp_path):
+    bomb = gzip.compress(b"\0" * (8 * 1024 * 1024))  # ~8 KB terkompresi, 8 MB setelah didekode
+    archive = tmp_path / "bomb.warc"
+    archive.write_bytes(
+        _warc_response("https://a.example/bomb.bin", _chunked(bomb),
+                       ["Content-Type: application/octet-stream", "Transfer-Encoding: chunked",
+                        "Content-Encoding: gzip"])
+        + _warc_response("https://a.example/ok.bin", b"ok", ["Content-Type: application/octet-stream"]))
+    results = _results(archive, max_record_bytes=1024 * 1024)
+    assert results[0]["type"] == "error" and "melebihi" in results[0]["error"]
+    assert results[1]["type"] == "asset" and results[1]["sha1"] == hashlib.sha1(b"ok").hexdigest()
+
+
+
+def test_outer_gzip_bomb_is_expanded_in_bounded_pieces(tmp_path):
+    # Satu member gzip ~64 KB yang mengembang menjadi rekaman WARC 64 MB.
+    size = 64 * 1024 * 1024
+    http_head = b"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\n\r\n"
+    warc_head = (f"WARC/1.0\r\nWARC-Type: response\r\nWARC-Target-URI: https://a.example/bomb.bin\r\n"
+                 f"Content-Type: application/http; msgtype=response\r\n"
+                 f"Content-Length: {len(http_head) + size}\r\n\r\n").encode()
+    member = zlib.compressobj(wbits=31)
+    parts = [member.compress(warc_head + http_head)]
+    zeros = b"\0" * (1024 * 1024)
+    parts += [member.compress(zeros) for _ in range(size // len(zeros))]
+    parts.append(member.compress(b"\r\n\r\n") + member.flush())
+    archive = tmp_path / "bomb.warc.gz"
+    archive.write_bytes(b"".join(parts) + gzip.compress(
+        _warc_response("https://a.example/ok.bin", b"ok", ["Content-Type: application/octet-stream"])))
+    del parts, zeros
+
+    tracemalloc.start()
+    try:
+        results = _results(archive, max_record_bytes=1024 * 1024)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert results[0]["type"] == "error" and "melebihi" in results[0]["error"]
+    assert results[1]["type"] == "asset" and results[1]["sha1"] == hashlib.sha1(b"ok").hexdigest()
+    assert peak < 16 * 1024 * 1024
+
+def test_har_entries_are_found_through_the_log_structure(tmp_path):
+    decoy = '"entries": [{"request": {"url": "https://decoy.example/"}}]'
+    har = {
+        "comment": decoy,
+        "extra": {"entries": [{"request": {"url": "https://nested.example/"}}]},
+        "log": {
+            "creator": {"name": "test", "comment": decoy},
+            "entries": [
+                {"request": {"url": "https://a.example/app.js"},
+                 "response": {"status": 200, "content": {"mimeType": "application/javascript",
+                                                         "text": "console.log(1)"}}},
+                {"request": {"url": "https://a.example/logo.png"},
+                 "response": {"status": 200, "content": {"mimeType": "image/png", "encoding": "base64",
+                                                         "text": base64.b64encode(b"\x89PNG").decode()}}},
+            ],
+        },
+    }
+    path = tmp_path / "session.har"
+    path.write_text(json.dumps(har, indent=1))
+    results = _results(path)
+    assert [result["asset_url"] for result in results] == ["https://a.example/app.js", "https://a.example/logo.png"]
+    assert results[1]["sha1"] == hashlib.sha1(b"\x89PNG").hexdigest()
@@ -0,0 +1,112 @@
+import hashlib
+import random
+import threading
+from http.server import ThreadingHTTPServer
+
+from originVerifier import (OriginVerifier, compare_fingerprints, fingerprint_response, simhash,
+                            simhash_similarity)
+from standins import _QuietHandler
+
+
+def _page(title: str, words: list[str]) -> bytes:
+    return f"<html><head><title>{title}</title></head><body><p>{' '.join(words)}</p></body></html>".encode()
+
+
+def _words(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = [f"kata{i}" for i in range(500)]
+    return [rng.choice(vocabulary) for _ in range(count)]
+
+
+HEADERS = [("server", "nginx"), ("content-type", "text/html"), ("date", "x"), ("x-frame-options", "DENY")]
+
+
+def test_simhash_matches_reference_bit_loop():
+    words = _words(5000)
+    text = " ".join(words)
+    weights = [0] * 64
+    for i in range(len(words) - 2):
+        value = int.from_bytes(hashlib.blake2b(" ".join(words[i:i + 3]).encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    assert simhash(text) == sum(1 << bit for bit in range(64) if weights[bit] > 0)
+    assert simhash("") == simhash("   ")
+
+
+def test_simhash_similarity_tracks_edits():
+    words = _words(2000)
+    edited = list(words)
+    edited[1000:1010] = ["berubah"] * 10
+    near = simhash_similarity(simhash(" ".join(words)), simhash(" ".join(edited)))
+    far = simhash_similarity(simhash(" ".join(words)), simhash(" ".join(_words(2000, seed=99))))
+    assert near > 0.85 > far
+
+
+def test_compare_fingerprints_verdicts():
+    words = _words(1500)
+    baseline = fingerprint_response(200, HEADERS, _page("Toko", words))
+    assert compare_fingerprints(fingerprint_response(200, HEADERS, _page("Toko", words)), baseline) == (1.0, "exact")
+
+    edited = list(words)
+    edited[:5] = ["token", "csrf", "acak", "per", "permintaan"]
+    score, verdict = compare_fingerprints(fingerprint_response(200, HEADERS, _page("Toko", edited)), baseline)
+    assert verdict == "match" and score < 1.0
+
+    other = fingerprint_response(404, [("server", "apache")], _page("Default page", _words(300, seed=3)))
+    assert compare_fingerprints(other, baseline)[1] == "different"
+    assert fingerprint_response(200, HEADERS, _page("Toko", words))["header_features"] == {
+        "server=nginx", "content-type=text/html", "x-frame-options"}
+
+
+class _VhostHandler(_QuietHandler):
+    # 127.0.0.1 melayani situs asli (origin), alamat loopback lain halaman default
+    def do_GET(self):
+        if self.connection.getsockname()[0] == "127.0.0.1":
+            self.send_body(200, _page("Toko", _words(1500)), "text/html", {"Server": "nginx"})
+        else:
+            self.send_body(200, _page("Welcome to nginx", _words(50, seed=5)), "text/html", {"Server": "nginx"})
+
+
+def test_verify_against_local_origin():
+    server = ThreadingHTTPServer(("0.0.0.0", 0), _VhostHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        verifier = OriginVerifier(schemes=("http",), ports={"http": server.server_address[1]}, timeout=2.0)
+        results = verifier.verify_sync([("127.0.0.1", "localhost"), ("127.0.0.2", "localhost"),
+                                        ("127.0.0.1", "localhost")])
+    finally:
+        server.shutdown()
+        server.server_close()
+    verdicts = {result["ip"]: result["verdict"] for result in results}
+    assert verdicts == {"127.0.0.1": "exact", "127.0.0.2": "different"}
+    assert verifier.stats["errors"] == 0
+
+
+class _CloseDelimitedHandler(_QuietHandler):
+    # HTTP/1.0 tanpa Content-Length: body diakhiri penutupan koneksi, dikirim bertahap
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.end_headers()
+        body = _page("Toko", _words(40000))
+        for pos in range(0, len(body), 4096):
+            self.wfile.write(body[pos:pos + 4096])
+            self.wfile.flush()
+
+
+def test_close_delimited_body_is_read_completely():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CloseDelimitedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        verifier = OriginVerifier(schemes=("http",), ports={"http": server.server_address[1]}, timeout=5.0)
+        results = verifier.verify_sync([("127.0.0.1", "localhost")])
+    finally:
+        server.shutdown()
+        server.server_close()
+    expected = hashlib.sha256(_page("Toko", _words(40000))).hexdigest()
+    assert len(_page("Toko", _words(40000))) > 200 * 1024
+    assert results[0]["verdict"] == "exact" and results[0]["body_sha256"] == expected
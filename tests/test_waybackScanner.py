@@ -0,0 +1,45 @@
+import os
+import time
+
+from standins import StubCDX
+from waybackScanner import WaybackScanner
+
+PATHS = [".env", "backup", ".git/config"]
+
+
+def test_resume_key_paging():
+    with StubCDX(rows_per_path=25) as cdx:
+        scanner = WaybackScanner(cdx.base_url + "/cdx", paths=PATHS, page_size=10, cache_dir=None)
+        results = scanner.scan("example.com")
+    assert list(results) == PATHS
+    assert len(results[".env"]) == 25 and len(results[".git/config"]) == 25 and results["backup"] == []
+    # Tidak ada baris ganda atau terlewat di batas halaman
+    assert [row["original"] for row in results[".env"]] == [f"http://example.com/.env.{i}" for i in range(25)]
+    assert results[".env"][0].keys() == {"timestamp", "original", "mimetype", "statuscode", "digest", "length"}
+    # 3 halaman untuk masing-masing path yang "bocor", 1 untuk path kosong
+    assert scanner.stats["pages"] == 7 and scanner.stats["requests"] == 7
+
+
+def test_page_cache_and_ttl(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    with StubCDX(rows_per_path=15) as cdx:
+        first = WaybackScanner(cdx.base_url + "/cdx", paths=PATHS, page_size=10, cache_dir=cache_dir)
+        expected = first.scan("example.com")
+
+        cached = WaybackScanner(cdx.base_url + "/cdx", paths=PATHS, page_size=10, cache_dir=cache_dir)
+        assert cached.scan("example.com") == expected
+        assert cached.stats["requests"] == 0 and cached.stats["cache_hits"] == first.stats["pages"] == 5
+
+        # Halaman yang lebih tua dari TTL diambil ulang dan cache-nya diperbarui
+        old = time.time() - 120
+        for name in os.listdir(cache_dir):
+            os.utime(os.path.join(cache_dir, name), (old, old))
+        expired = WaybackScanner(cdx.base_url + "/cdx", paths=PATHS, page_size=10, cache_dir=cache_dir,
+                                 cache_ttl=60)
+        assert expired.scan("example.com") == expected
+        assert expired.stats["requests"] == 5 and expired.stats["cache_hits"] == 0
+
+
+def test_unreachable_endpoint_is_reported_per_path():
+    scanner = WaybackScanner("http://127.0.0.1:9/cdx", paths=[".env"], cache_dir=None, max_retries=0, timeout=1)
+    assert isinstance(scanner.scan("example.com")[".env"], Exception)
@@ -0,0 +1,204 @@
+import heapq
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+# Tracing per tahap untuk ketiga alat. Setiap operasi yang diinstrumentasi (proses
+# eksternal, kueri DNS, halaman CDX, halaman/aset HTTP) menghasilkan span dengan
+# waktu mulai/selesai, durasi, byte, status HTTP atau exit code, dan target. Span
+# ditulis sebagai JSONL dan diringkas per tahap dan per host di akhir proses.
+#
+# Saat tracing tidak aktif, `span()` mengembalikan objek no-op bersama sehingga
+# biayanya hanya satu pengecekan atribut dan satu pemanggilan fungsi.
+
+DEFAULT_SLOWEST_SPANS = 10
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def finish(self, error: str | None = None):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """
+    Satu operasi yang diukur. Dipakai sebagai context manager, atau dimulai dengan
+    `Tracer.span` lalu diakhiri dengan `finish()` untuk operasi yang tidak
+    terbungkus satu blok (misalnya proses yang berjalan di latar belakang).
+    """
+
+    __slots__ = ("tracer", "stage", "target", "attrs", "start_time", "_start", "_finished")
+
+    def __init__(self, tracer: "Tracer", stage: str, target: str, attrs: dict):
+        self.tracer = tracer
+        self.stage = stage
+        self.target = target
+        self.attrs = attrs
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self._finished = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(exc_type.__name__ if exc_type is not None else None)
+        return False
+
+    def set(self, **attrs):
+        """Menambahkan atribut seperti bytes, status, exit_code, atau error."""
+        self.attrs.update(attrs)
+
+    def finish(self, error: str | None = None):
+        if self._finished:
+            return
+        self._finished = True
+        if error and "error" not in self.attrs:
+            self.attrs["error"] = error
+        duration = time.perf_counter() - self._start
+        self.tracer._record(self, duration)
+
+
+class Tracer:
+    """
+    Penulis span ke file JSONL (opsional) dan agregator ringkasan per tahap/host.
+
+    Memori tetap kecil berapa pun jumlah span: yang disimpan hanya agregat (jumlah,
+    total dan maksimum durasi, byte, error) dan `keep_slowest` span terlambat.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._keep_slowest = DEFAULT_SLOWEST_SPANS
+        self.reset()
+
+    def reset(self):
+        self._stages = {}
+        self._hosts = {}
+        self._slowest = []
+        self._sequence = 0
+
+    def enable(self, path: str | None = None, keep_slowest: int = DEFAULT_SLOWEST_SPANS):
+        """Mengaktifkan tracing; span ditulis ke `path` (JSONL) jika diberikan."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self.path = path
+            self._file = open(path, "a", buffering=1) if path else None
+            self._keep_slowest = keep_slowest
+            self.reset()
+            self.enabled = True
+
+    def close(self):
+        with self._lock:
+            self.enabled = False
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def span(self, stage: str, target: str = "", **attrs):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, stage, target, attrs)
+
+    def _record(self, span: Span, duration: float):
+        host = urlparse(span.target).hostname if "://" in span.target else None
+        failed = "error" in span.attrs or span.attrs.get("exit_code") not in (None, 0) \
+            or (span.attrs.get("status") or 0) >= 400
+        entry = {
+            "stage": span.stage,
+            "target": span.target,
+            "start": round(span.start_time, 6),
+            "end": round(span.start_time + duration, 6),
+            "duration_ms": round(duration * 1000, 3),
+            "thread": threading.current_thread().name,
+            **span.attrs,
+        }
+        with self._lock:
+            for key, table in ((span.stage, self._stages), (host, self._hosts)):
+                if key is None:
+                    continue
+                aggregate = table.setdefault(key, {"count": 0, "total": 0.0, "max": 0.0, "bytes": 0, "errors": 0})
+                aggregate["count"] += 1
+                aggregate["total"] += duration
+                aggregate["max"] = max(aggregate["max"], duration)
+                aggregate["bytes"] += span.attrs.get("bytes") or 0
+                aggregate["errors"] += failed
+            self._sequence += 1
+            item = (duration, self._sequence, entry)
+            if len(self._slowest) < self._keep_slowest:
+                heapq.heappush(self._slowest, item)
+            elif duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+            if self._file is not None:
+                self._file.write(json.dumps(entry, default=str) + "\n")
+
+    @staticmethod
+    def _table(title: str, rows: dict, limit: int) -> list[str]:
+        lines = [f"{title:<32}{'jumlah':>8}{'total (s)':>11}{'rata2 (ms)':>12}{'maks (ms)':>11}{'KB':>10}{'gagal':>7}"]
+        for name, aggregate in sorted(rows.items(), key=lambda item: -item[1]["total"])[:limit]:
+            lines.append(f"{name[:31]:<32}{aggregate['count']:>8}{aggregate['total']:>11.2f}"
+                         f"{aggregate['total'] / aggregate['count'] * 1000:>12.1f}{aggregate['max'] * 1000:>11.1f}"
+                         f"{aggregate['bytes'] / 1024:>10.1f}{aggregate['errors']:>7}")
+        return lines
+
+    def summary_lines(self, limit: int = 10) -> list[str]:
+        """Tabel tahap dan host terlambat (diurutkan berdasarkan total durasi), lalu span terlambat."""
+        with self._lock:
+            stages = {name: dict(value) for name, value in self._stages.items()}
+            hosts = {name: dict(value) for name, value in self._hosts.items()}
+            slowest = sorted(self._slowest, reverse=True)
+        if not stages:
+            return ["Tidak ada span yang tercatat."]
+        lines = self._table("Tahap", stages, limit)
+        if hosts:
+            lines += [""] + self._table("Host", hosts, limit)
+        if slowest:
+            lines += ["", "Span terlambat:"]
+            for duration, _, entry in slowest:
+                status = entry.get("status", entry.get("exit_code", entry.get("error", "")))
+                lines.append(f"  {duration * 1000:>9.1f} ms  {entry['stage']:<10} {entry['target'][:90]} {status}")
+        return lines
+
+
+TRACER = Tracer()
+
+
+def span(stage: str, target: str = "", **attrs):
+    """Memulai span pada tracer global (no-op jika tracing tidak aktif)."""
+    if not TRACER.enabled:
+        return _NOOP_SPAN
+    return Span(TRACER, stage, target, attrs)
+
+
+def enable_tracing(path: str | None = None, keep_slowest: int = DEFAULT_SLOWEST_SPANS):
+    TRACER.enable(path, keep_slowest)
+
+
+def print_trace_summary(log=print, limit: int = 10):
+    """Mencetak ringkasan tracing (jika aktif) dan menutup file trace."""
+    if not TRACER.enabled:
+        return
+    log("\n[*] Ringkasan tracing (tahap dan host terlambat):")
+    for line in TRACER.summary_lines(limit):
+        log(line)
+    if TRACER.path:
+        log(f"[*] Trace lengkap disimpan ke {TRACER.path}")
+    TRACER.close()
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import requests
+
+from httpClient import PooledSession
+from tracing import span
+
+# Scanner Wayback Machine CDX untuk banyak path sensitif per domain. Setiap path
+# dikueri dengan matchType=prefix, hasil besar dibaca per halaman memakai
+# showResumeKey/resumeKey, dan respons dibaca baris per baris (output teks CDX)
+# sehingga memori hanya sebesar satu halaman.
+
+DEFAULT_CDX_ENDPOINT = "http://web.archive.org/cdx/search/cdx"
+DEFAULT_SENSITIVE_PATHS = [
+    ".env",
+    ".git/config",
+    ".svn/entries",
+    "backup",
+    "wp-config.php",
+    "config.php.bak",
+    "database.sql",
+    "phpinfo",
+    "info.php",
+    ".DS_Store",
+]
+CDX_FIELDS = ["timestamp", "original", "mimetype", "statuscode", "digest", "length"]
+DEFAULT_PAGE_SIZE = 5000
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE = 2.0
+DEFAULT_BACKOFF_CAP = 60.0
+DEFAULT_CACHE_DIR = ".wayback_cache"
+DEFAULT_CACHE_TTL = 24 * 3600
+
+
+class WaybackScanner:
+    """
+    Mengkueri CDX API untuk daftar path sensitif secara konkuren.
+
+    Jumlah permintaan bersamaan ke CDX dibatasi `max_concurrent_requests` untuk
+    semua thread yang memakai scanner ini. Percobaan ulang respons 429/5xx (backoff
+    eksponensial + jitter, menghormati Retry-After) dan pelambatan laju saat CDX
+    melakukan throttling ditangani oleh PooledSession. Setiap halaman respons
+    disimpan di `cache_dir` dan dipakai ulang selama `cache_ttl` detik.
+    """
+
+    def __init__(self, endpoint: str = DEFAULT_CDX_ENDPOINT, paths: list[str] | None = None,
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+                 max_retries: int = DEFAULT_MAX_RETRIES, cache_dir: str | None = DEFAULT_CACHE_DIR,
+                 cache_ttl: float = DEFAULT_CACHE_TTL, timeout: float = 30,
+                 session: PooledSession | None = None):
+        self.endpoint = endpoint
+        self.paths = list(paths or DEFAULT_SENSITIVE_PATHS)
+        self.page_size = page_size
+        self.max_retries = max_retries
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        if session is None:
+            session = PooledSession(pool_maxsize=max_concurrent_requests, max_retries=max_retries,
+                                    backoff_base=DEFAULT_BACKOFF_BASE, backoff_cap=DEFAULT_BACKOFF_CAP)
+        self.session = session
+        self._stats = {"requests": 0, "cache_hits": 0, "pages": 0}
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        self._stats_lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def stats(self) -> dict:
+        # Percobaan ulang dihitung oleh session (yang dibuat khusus untuk scanner ini secara default)
+        with self._stats_lock:
+            return {**self._stats, "retries": self.session.totals["retries"]}
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[stat] += amount
+
+    def _cache_file(self, query_url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(query_url.encode()).hexdigest() + ".json")
+
+    def _cache_load(self, query_url: str) -> dict | None:
+        if not self.cache_dir:
+            return None
+        cache_file = self._cache_file(query_url)
+        try:
+            if time.time() - os.path.getmtime(cache_file) > self.cache_ttl:
+                return None
+            with open(cache_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _cache_store(self, query_url: str, page: dict):
+        if not self.cache_dir:
+            return
+        cache_file = self._cache_file(query_url)
+        temp_file = f"{cache_file}.{threading.get_ident()}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(page, f)
+        os.replace(temp_file, cache_file)  # Atomik agar thread/proses lain tidak membaca file setengah jadi
+
+    def _query_url(self, domain: str, path: str, resume_key: str | None) -> str:
+        params = {
+            "url": f"{domain}/{path.lstrip('/')}",
+            "matchType": "prefix",
+            "fl": ",".join(CDX_FIELDS),
+            "collapse": "digest",
+            "limit": self.page_size,
+            "showResumeKey": "true",
+        }
+        if resume_key:
+            params["resumeKey"] = resume_key
+        return f"{self.endpoint}?{urlencode(params)}"
+
+    def _fetch_page(self, query_url: str) -> dict:
+        """
+        Mengambil satu halaman CDX (dari cache atau jaringan) sebagai
+        {"rows": [...], "resume_key": str | None}. Baris dibaca secara streaming.
+        """
+        cached = self._cache_load(query_url)
+        if cached is not None:
+            self._count("cache_hits")
+            return cached
+
+        with self._request_slots, span("wayback", query_url) as page_span:
+            self._count("requests")
+            with self.session.get(query_url, timeout=self.timeout, stream=True) as response:
+                page_span.set(status=response.status_code)
+                response.raise_for_status()
+                rows = []
+                resume_key = None
+                after_blank = False
+                received = 0
+                for raw_line in response.iter_lines(decode_unicode=True):
+                    if isinstance(raw_line, bytes):
+                        raw_line = raw_line.decode("utf-8", errors="replace")
+                    received += len(raw_line) + 1 if raw_line else 1
+                    line = raw_line.strip() if raw_line else ""
+                    if not line:
+                        after_blank = True  # Baris kosong memisahkan data dari resumeKey
+                        continue
+                    if after_blank:
+                        resume_key = line
+                        break
+                    values = line.split(" ")
+                    if len(values) == len(CDX_FIELDS):
+                        rows.append(dict(zip(CDX_FIELDS, values)))
+                page_span.set(bytes=received, rows=len(rows))
+        page = {"rows": rows, "resume_key": resume_key}
+        self._count("pages")
+        self._cache_store(query_url, page)
+        return page
+
+    def iter_path(self, domain: str, path: str):
+        """Menghasilkan entri CDX untuk `domain/path*` halaman demi halaman."""
+        resume_key = None
+        seen_keys = set()
+        while True:
+            page = self._fetch_page(self._query_url(domain, path, resume_key))
+            yield from page["rows"]
+            resume_key = page["resume_key"]
+            if not resume_key or resume_key in seen_keys:
+                return
+            seen_keys.add(resume_key)
+
+    def scan_path(self, domain: str, path: str) -> list[dict] | Exception:
+        try:
+            return list(self.iter_path(domain, path))
+        except (requests.exceptions.RequestException, OSError) as e:
+            return e
+
+    def scan(self, domain: str) -> dict:
+        """
+        Memindai semua path untuk `domain` secara konkuren. Mengembalikan
+        {path: daftar entri atau Exception}, dalam urutan `self.paths`.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, len(self.paths))) as executor:
+            results = executor.map(lambda path: self.scan_path(domain, path), self.paths)
+            return dict(zip(self.paths, results))